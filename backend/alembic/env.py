@@ -9,6 +9,7 @@ from alembic import context
 from app.core.database import Base
 from app.models import *
 from app.core.config import get_settings
+from app.models.search import is_search_object
 
 # this is the Alembic Config object
 config = context.config
@@ -25,12 +26,18 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave the full-text search tables, columns and indexes out of autogenerate."""
+    return not is_search_object(name, type_)
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -49,7 +56,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
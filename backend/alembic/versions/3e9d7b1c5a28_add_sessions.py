@@ -0,0 +1,44 @@
+"""add sessions for refresh tokens
+
+Revision ID: 3e9d7b1c5a28
+Revises: a8e4b2f79d15
+Create Date: 2026-10-17 21:40:16.527903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e9d7b1c5a28'
+down_revision = 'a8e4b2f79d15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('previous_token_hash', sa.String(length=64), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sessions_id', 'sessions', ['id'], unique=False)
+    op.create_index('ix_sessions_user_id', 'sessions', ['user_id'], unique=False)
+    op.create_index('ix_sessions_token_hash', 'sessions', ['token_hash'], unique=True)
+    op.create_index('ix_sessions_previous_token_hash', 'sessions', ['previous_token_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sessions_previous_token_hash', table_name='sessions')
+    op.drop_index('ix_sessions_token_hash', table_name='sessions')
+    op.drop_index('ix_sessions_user_id', table_name='sessions')
+    op.drop_index('ix_sessions_id', table_name='sessions')
+    op.drop_table('sessions')
@@ -0,0 +1,30 @@
+"""add issue keyset pagination indexes
+
+Revision ID: 5c1d7e9a2b40
+Revises: 18f2e6b8d296
+Create Date: 2026-10-17 09:12:41.208315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1d7e9a2b40'
+down_revision = '18f2e6b8d296'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_issues_project_created_at', 'issues', ['project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_issues_project_updated_at', 'issues', ['project_id', 'updated_at', 'id'], unique=False)
+    op.create_index('ix_issues_project_status', 'issues', ['project_id', 'status', 'id'], unique=False)
+    op.create_index('ix_issues_project_priority', 'issues', ['project_id', 'priority', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_issues_project_priority', table_name='issues')
+    op.drop_index('ix_issues_project_status', table_name='issues')
+    op.drop_index('ix_issues_project_updated_at', table_name='issues')
+    op.drop_index('ix_issues_project_created_at', table_name='issues')
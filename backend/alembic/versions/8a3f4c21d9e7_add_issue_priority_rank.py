@@ -0,0 +1,37 @@
+"""add issue priority_rank
+
+Revision ID: 8a3f4c21d9e7
+Revises: 5c1d7e9a2b40
+Create Date: 2026-10-17 10:03:27.550914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a3f4c21d9e7'
+down_revision = '5c1d7e9a2b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('issues', sa.Column('priority_rank', sa.SmallInteger(), nullable=True))
+    # Enum columns store member names
+    op.execute(
+        "UPDATE issues SET priority_rank = CASE priority "
+        "WHEN 'CRITICAL' THEN 0 WHEN 'HIGH' THEN 1 WHEN 'MEDIUM' THEN 2 ELSE 3 END"
+    )
+    with op.batch_alter_table('issues') as batch_op:
+        batch_op.alter_column('priority_rank', existing_type=sa.SmallInteger(), nullable=False)
+    op.create_index('ix_issues_project_priority_rank', 'issues', ['project_id', 'priority_rank', 'id'], unique=False)
+    # Superseded: priority sorting and filtering both go through the rank
+    op.drop_index('ix_issues_project_priority', table_name='issues')
+
+
+def downgrade() -> None:
+    op.create_index('ix_issues_project_priority', 'issues', ['project_id', 'priority', 'id'], unique=False)
+    op.drop_index('ix_issues_project_priority_rank', table_name='issues')
+    with op.batch_alter_table('issues') as batch_op:
+        batch_op.drop_column('priority_rank')
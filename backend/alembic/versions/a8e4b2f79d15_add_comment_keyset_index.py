@@ -0,0 +1,24 @@
+"""add comment keyset pagination index
+
+Revision ID: a8e4b2f79d15
+Revises: f1a6d3c8b902
+Create Date: 2026-10-17 19:12:05.318842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8e4b2f79d15'
+down_revision = 'f1a6d3c8b902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_comments_issue_created_at', 'comments', ['issue_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_issue_created_at', table_name='comments')
@@ -0,0 +1,93 @@
+"""add full-text search indexes
+
+Revision ID: b7e2d5f08c13
+Revises: 8a3f4c21d9e7
+Create Date: 2026-10-17 11:26:02.714388
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d5f08c13'
+down_revision = '8a3f4c21d9e7'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5("
+    "title, description, content='issues', content_rowid='id', "
+    "tokenize='porter unicode61', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_ai AFTER INSERT ON issues BEGIN "
+    "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_ad AFTER DELETE ON issues BEGIN "
+    "INSERT INTO issues_fts(issues_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_au AFTER UPDATE OF title, description ON issues BEGIN "
+    "INSERT INTO issues_fts(issues_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5("
+    "body, content='comments', content_rowid='id', "
+    "tokenize='porter unicode61', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS comments_fts_ai AFTER INSERT ON comments BEGIN "
+    "INSERT INTO comments_fts(rowid, body) VALUES (new.id, new.body); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS comments_fts_ad AFTER DELETE ON comments BEGIN "
+    "INSERT INTO comments_fts(comments_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS comments_fts_au AFTER UPDATE OF body ON comments BEGIN "
+    "INSERT INTO comments_fts(comments_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+    "INSERT INTO comments_fts(rowid, body) VALUES (new.id, new.body); "
+    "END",
+    # Index rows that existed before the tables
+    "INSERT INTO issues_fts(issues_fts) VALUES ('rebuild')",
+    "INSERT INTO comments_fts(comments_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS comments_fts_au",
+    "DROP TRIGGER IF EXISTS comments_fts_ad",
+    "DROP TRIGGER IF EXISTS comments_fts_ai",
+    "DROP TABLE IF EXISTS comments_fts",
+    "DROP TRIGGER IF EXISTS issues_fts_au",
+    "DROP TRIGGER IF EXISTS issues_fts_ad",
+    "DROP TRIGGER IF EXISTS issues_fts_ai",
+    "DROP TABLE IF EXISTS issues_fts",
+]
+
+POSTGRES_UPGRADE = [
+    "ALTER TABLE issues ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX ix_issues_search_vector ON issues USING GIN (search_vector)",
+    "ALTER TABLE comments ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "to_tsvector('english', body)) STORED",
+    "CREATE INDEX ix_comments_search_vector ON comments USING GIN (search_vector)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_comments_search_vector",
+    "ALTER TABLE comments DROP COLUMN IF EXISTS search_vector",
+    "DROP INDEX IF EXISTS ix_issues_search_vector",
+    "ALTER TABLE issues DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements_by_dialect) -> None:
+    dialect = op.get_bind().dialect.name
+    for statement in statements_by_dialect.get(dialect, []):
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _run({"sqlite": SQLITE_UPGRADE, "postgresql": POSTGRES_UPGRADE})
+
+
+def downgrade() -> None:
+    _run({"sqlite": SQLITE_DOWNGRADE, "postgresql": POSTGRES_DOWNGRADE})
@@ -0,0 +1,30 @@
+"""add change counters for etags
+
+Revision ID: c4a9e1f7b352
+Revises: b7e2d5f08c13
+Create Date: 2026-10-17 13:20:08.417263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a9e1f7b352'
+down_revision = 'b7e2d5f08c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('issues_version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('issues', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('issues', sa.Column('comments_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('issues') as batch_op:
+        batch_op.drop_column('comments_version')
+        batch_op.drop_column('version')
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_column('issues_version')
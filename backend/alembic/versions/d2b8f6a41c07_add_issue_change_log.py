@@ -0,0 +1,42 @@
+"""add issue change_seq and tombstones
+
+Revision ID: d2b8f6a41c07
+Revises: c4a9e1f7b352
+Create Date: 2026-10-17 15:02:44.903158
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b8f6a41c07'
+down_revision = 'c4a9e1f7b352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('issues', sa.Column('change_seq', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_issues_project_change_seq', 'issues', ['project_id', 'change_seq', 'id'], unique=False)
+    op.create_table(
+        'issue_tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('issue_id', sa.Integer(), nullable=False),
+        sa.Column('change_seq', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_issue_tombstones_project_change_seq', 'issue_tombstones', ['project_id', 'change_seq', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_issue_tombstones_project_change_seq', table_name='issue_tombstones')
+    op.drop_table('issue_tombstones')
+    op.drop_index('ix_issues_project_change_seq', table_name='issues')
+    with op.batch_alter_table('issues') as batch_op:
+        batch_op.drop_column('change_seq')
@@ -0,0 +1,42 @@
+"""add project issue stats
+
+Revision ID: e7c3a9d51f24
+Revises: d2b8f6a41c07
+Create Date: 2026-10-17 17:41:09.215806
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c3a9d51f24'
+down_revision = 'd2b8f6a41c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'project_issue_stats',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('dimension', sa.String(), nullable=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.PrimaryKeyConstraint('project_id', 'dimension', 'value')
+    )
+    # Backfill from existing issues; enums are stored by name, counters by value
+    for dimension, value in (
+        ('status', 'lower(CAST(status AS VARCHAR))'),
+        ('priority', 'lower(CAST(priority AS VARCHAR))'),
+        ('assignee_id', "COALESCE(CAST(assignee_id AS VARCHAR), '')"),
+    ):
+        op.execute(
+            f"INSERT INTO project_issue_stats (project_id, dimension, value, count) "
+            f"SELECT project_id, '{dimension}', {value}, COUNT(*) FROM issues GROUP BY project_id, {value}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('project_issue_stats')
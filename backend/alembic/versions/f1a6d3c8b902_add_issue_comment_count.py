@@ -0,0 +1,42 @@
+"""add issue comment_count and last_activity_at
+
+Revision ID: f1a6d3c8b902
+Revises: e7c3a9d51f24
+Create Date: 2026-10-17 18:26:37.540113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a6d3c8b902'
+down_revision = 'e7c3a9d51f24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('issues', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('issues', sa.Column('last_activity_at', sa.DateTime(timezone=True), nullable=True))
+    # Backfill: the comment count, and the later of the last update and the newest comment
+    op.execute(
+        "UPDATE issues SET "
+        "comment_count = (SELECT COUNT(*) FROM comments WHERE comments.issue_id = issues.id), "
+        "last_activity_at = COALESCE("
+        "(SELECT MAX(comments.created_at) FROM comments "
+        "WHERE comments.issue_id = issues.id AND comments.created_at > issues.updated_at), "
+        "issues.updated_at, issues.created_at)"
+    )
+    op.create_index('ix_issues_project_comment_count', 'issues', ['project_id', 'comment_count', 'id'], unique=False)
+    op.create_index(
+        'ix_issues_project_last_activity_at', 'issues', ['project_id', 'last_activity_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_issues_project_last_activity_at', table_name='issues')
+    op.drop_index('ix_issues_project_comment_count', table_name='issues')
+    with op.batch_alter_table('issues') as batch_op:
+        batch_op.drop_column('last_activity_at')
+        batch_op.drop_column('comment_count')
@@ -0,0 +1,76 @@
+"""
+Async mode for the database-backed routers.
+
+asyncify_router() rebuilds a router so each endpoint is an ``async def`` that
+receives an AsyncSession and runs the unchanged handler body through
+``AsyncSession.run_sync``. The handler's queries then go through the asyncio
+driver on the event loop instead of occupying a thread-pool slot, and the
+sync and async modes share one implementation of every route.
+"""
+import functools
+import inspect
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.deps import get_current_user, get_current_user_async
+
+
+def _asyncify_endpoint(endpoint):
+    signature = inspect.signature(endpoint)
+    parameters = []
+    for parameter in signature.parameters.values():
+        if parameter.name == "db":
+            parameter = parameter.replace(annotation=AsyncSession, default=Depends(get_async_db))
+        elif getattr(parameter.default, "dependency", None) is get_current_user:
+            parameter = parameter.replace(default=Depends(get_current_user_async))
+        parameters.append(parameter)
+
+    @functools.wraps(endpoint)
+    async def endpoint_async(**kwargs):
+        db: AsyncSession = kwargs.pop("db")
+        return await db.run_sync(lambda session: endpoint(db=session, **kwargs))
+
+    endpoint_async.__signature__ = signature.replace(parameters=parameters)
+    return endpoint_async
+
+
+def asyncify_router(router: APIRouter) -> APIRouter:
+    """Copy of router whose sync, session-using endpoints run on the async engine."""
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            async_router.routes.append(route)
+            continue
+
+        endpoint = route.endpoint
+        if not inspect.iscoroutinefunction(endpoint) and "db" in inspect.signature(endpoint).parameters:
+            endpoint = _asyncify_endpoint(endpoint)
+
+        async_router.add_api_route(
+            route.path,
+            endpoint,
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            methods=route.methods,
+            operation_id=route.operation_id,
+            response_model_include=route.response_model_include,
+            response_model_exclude=route.response_model_exclude,
+            response_model_by_alias=route.response_model_by_alias,
+            response_model_exclude_unset=route.response_model_exclude_unset,
+            response_model_exclude_defaults=route.response_model_exclude_defaults,
+            response_model_exclude_none=route.response_model_exclude_none,
+            include_in_schema=route.include_in_schema,
+            response_class=route.response_class,
+            name=route.name,
+            callbacks=route.callbacks,
+            openapi_extra=route.openapi_extra,
+        )
+    return async_router
@@ -1,68 +1,140 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, Tuple
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import (
+    verify_password_async,
+    get_password_hash_async,
+    password_needs_rehash,
+    create_access_token,
+)
 from app.core.deps import get_current_user
 from app.models.user import User
-from app.schemas.auth import SignupRequest, LoginRequest, TokenResponse, UserResponse
+from app.schemas.auth import SignupRequest, LoginRequest, RefreshRequest, TokenResponse, UserResponse
+from app.services.sessions import revoke_session, rotate_session, start_session
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# signup and login are async so that bcrypt runs on the password hashing pool
+# without holding a request thread; their database work is sent to the thread
+# pool explicitly. Their lookups end the read transaction before returning, so
+# the pooled connection is not held through the hash. Both open a session
+# whose refresh token keeps the user signed in through /auth/refresh without
+# sending the password again.
+
+
+def _email_registered(db: Session, email: str) -> bool:
+    registered = db.query(User.id).filter(User.email == email).first() is not None
+    db.rollback()
+    return registered
+
+
+def _get_credentials(db: Session, email: str) -> Optional[Tuple[int, str]]:
+    credentials = db.query(User.id, User.password_hash).filter(User.email == email).first()
+    db.rollback()
+    return tuple(credentials) if credentials else None
+
+
+def _create_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def _update_password_hash(db: Session, user_id: int, password_hash: str) -> None:
+    db.query(User).filter(User.id == user_id).update({User.password_hash: password_hash})
+    db.commit()
+
 
 @router.post("/signup", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def signup(request: SignupRequest, db: Session = Depends(get_db)):
+async def signup(request: SignupRequest, db: Session = Depends(get_db)):
     """
     Register a new user.
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == request.email).first()
-    if existing_user:
+    if await run_in_threadpool(_email_registered, db, request.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
     # Create new user
-    hashed_password = get_password_hash(request.password)
+    hashed_password = await get_password_hash_async(request.password)
     new_user = User(
         name=request.name,
         email=request.email,
         password_hash=hashed_password
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    new_user = await run_in_threadpool(_create_user, db, new_user)
 
-    # Generate access token
+    # Generate access and refresh tokens
     access_token = create_access_token(data={"sub": new_user.id})
+    refresh_token = await run_in_threadpool(start_session, db, new_user.id)
 
-    return TokenResponse(access_token=access_token)
+    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: Session = Depends(get_db)):
     """
     Authenticate a user and return an access token.
     """
     # Find user
-    user = db.query(User).filter(User.email == request.email).first()
-    if not user:
+    credentials = await run_in_threadpool(_get_credentials, db, request.email)
+    if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
+    user_id, password_hash = credentials
 
     # Verify password
-    if not verify_password(request.password, user.password_hash):
+    if not await verify_password_async(request.password, password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
 
-    # Generate access token
-    access_token = create_access_token(data={"sub": user.id})
+    # Upgrade hashes made with an old cost factor while the plain password is at hand
+    if password_needs_rehash(password_hash):
+        password_hash = await get_password_hash_async(request.password)
+        await run_in_threadpool(_update_password_hash, db, user_id, password_hash)
+
+    # Generate access and refresh tokens
+    access_token = create_access_token(data={"sub": user_id})
+    refresh_token = await run_in_threadpool(start_session, db, user_id)
+
+    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
+
+
+@router.post("/refresh", response_model=TokenResponse)
+def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access token and refresh token.
+
+    Each refresh token works once; the one returned replaces it.
+    """
+    session = rotate_session(db, request.refresh_token)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+
+    user_id, refresh_token = session
+    return TokenResponse(access_token=create_access_token(data={"sub": user_id}), refresh_token=refresh_token)
 
-    return TokenResponse(access_token=access_token)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(request: RefreshRequest, db: Session = Depends(get_db)):
+    """
+    End the session of a refresh token. Access tokens already issued stay
+    valid until they expire.
+    """
+    revoke_session(db, request.refresh_token)
+    return None
 
 
 @router.get("/me", response_model=UserResponse)
@@ -1,27 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from app.core.database import get_db, streaming_session
 from app.core.deps import get_current_user
+from app.core.etag import make_etag, etag_matches, not_modified, set_etag
+from app.core.pagination import encode_cursor, decode_cursor, keyset_condition
+from app.core.responses import FastJSONResponse, json_dumps, row_dicts, schema_columns
 from app.models.user import User
-from app.models.project import ProjectMember
 from app.models.issue import Issue
 from app.models.comment import Comment
-from app.schemas.comment import CommentCreate, CommentResponse
+from app.schemas.comment import CommentCreate, CommentResponse, CommentPage
+from app.services.authorization import require_project_member
+from app.services.events import publish_event
 
 router = APIRouter(tags=["Comments"])
 
 
-@router.get("/issues/{issue_id}/comments", response_model=List[CommentResponse])
+# Comments read per query while streaming NDJSON
+STREAM_BATCH_SIZE = 500
+
+# Columns read by the list endpoint, in CommentResponse field order
+COMMENT_COLUMNS = schema_columns(Comment, CommentResponse)
+
+
+def _comments_after(
+    db: Session, issue_id: int, descending: bool, position: Optional[Tuple[datetime, int]], limit: int
+) -> List[tuple]:
+    """Up to limit comment rows of the issue after the keyset position, in (created_at, id) order."""
+    query = db.query(*COMMENT_COLUMNS).filter(Comment.issue_id == issue_id)
+    if position is not None:
+        query = query.filter(keyset_condition(Comment.created_at, Comment.id, *position, descending))
+    if descending:
+        query = query.order_by(Comment.created_at.desc(), Comment.id.desc())
+    else:
+        query = query.order_by(Comment.created_at, Comment.id)
+    return query.limit(limit).all()
+
+
+def _stream_comments(
+    session: Session, issue_id: int, descending: bool, position: Optional[Tuple[datetime, int]]
+) -> Iterator[bytes]:
+    """NDJSON lines for every comment after the position, read one batch at a time."""
+    with session:
+        while True:
+            comments = _comments_after(session, issue_id, descending, position, STREAM_BATCH_SIZE)
+            if not comments:
+                return
+            lines = (json_dumps(comment) + b"\n" for comment in row_dicts(comments, CommentResponse.model_fields))
+            chunk = b"".join(lines)
+            position = (comments[-1].created_at, comments[-1].id)
+            # Hand the connection back while the client reads the batch
+            session.close()
+            yield chunk
+            if len(comments) < STREAM_BATCH_SIZE:
+                return
+
+
+@router.get("/issues/{issue_id}/comments", response_model=CommentPage)
 def list_comments(
     issue_id: int,
+    order: str = Query("asc", pattern="^(asc|desc)$", description="asc for oldest first, desc for newest first"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all comments for an issue.
+    Get the comments of an issue, a page at a time.
+
+    Pages are keyset-paginated on (created_at, id): pass the returned
+    next_cursor back, with the same order, to fetch the following page.
+
+    format=ndjson instead streams every comment after the cursor as one JSON
+    object per line, ignoring limit, with memory use independent of the
+    thread's length.
+
+    Answers a matching If-None-Match with 304 from an indexed version lookup.
     """
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    issue = db.query(Issue.project_id, Issue.comments_version).filter(Issue.id == issue_id).first()
     if not issue:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -29,19 +89,34 @@ def list_comments(
         )
 
     # Check if user is a project member
-    membership = db.query(ProjectMember).filter(
-        ProjectMember.project_id == issue.project_id,
-        ProjectMember.user_id == current_user.id
-    ).first()
+    require_project_member(db, issue.project_id, current_user.id)
 
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this project"
+    etag = make_etag("comments", issue_id, issue.comments_version, order, limit, cursor, format)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    descending = order == "desc"
+    cursor_key = f"comments_{order}"
+    position = decode_cursor(cursor, cursor_key, datetime.fromisoformat) if cursor else None
+
+    if format == "ndjson":
+        stream = StreamingResponse(
+            _stream_comments(streaming_session(db), issue_id, descending, position),
+            media_type="application/x-ndjson"
         )
+        set_etag(stream, etag)
+        return stream
+
+    # Fetch one extra row to learn whether another page exists
+    comments = _comments_after(db, issue_id, descending, position, limit + 1)
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = encode_cursor(cursor_key, comments[-1].created_at, comments[-1].id)
 
-    comments = db.query(Comment).filter(Comment.issue_id == issue_id).order_by(Comment.created_at).all()
-    return comments
+    page = FastJSONResponse({"items": row_dicts(comments, CommentResponse.model_fields), "next_cursor": next_cursor})
+    set_etag(page, etag)
+    return page
 
 
 @router.post("/issues/{issue_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
@@ -62,16 +137,7 @@ def create_comment(
         )
 
     # Check if user is a project member
-    membership = db.query(ProjectMember).filter(
-        ProjectMember.project_id == issue.project_id,
-        ProjectMember.user_id == current_user.id
-    ).first()
-
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this project"
-        )
+    require_project_member(db, issue.project_id, current_user.id)
 
     # Create comment
     new_comment = Comment(
@@ -80,6 +146,10 @@ def create_comment(
         body=request.body
     )
     db.add(new_comment)
+    db.flush()
+    publish_event(
+        db, issue.project_id, "comment.created", CommentResponse.model_validate(new_comment).model_dump(mode="json")
+    )
     db.commit()
     db.refresh(new_comment)
 
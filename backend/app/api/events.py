@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from app.core.database import get_db
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.services.authorization import require_project_member
+from app.services.events import broadcaster, get_issues_version, resume_events, stream_events
+
+router = APIRouter(tags=["Events"])
+
+
+# async so the stream is served on the event loop rather than holding a
+# thread (and asyncify_router leaves it alone); database work goes to the
+# thread pool explicitly
+@router.get("/projects/{project_id}/events", response_class=StreamingResponse)
+async def project_events(
+    project_id: int,
+    last_event_id: Optional[int] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream issue and comment changes in the project as server-sent events.
+
+    Each event's id is the project's version after the change. Reconnect
+    with Last-Event-ID to receive the events missed in between, or a reset
+    event when they are no longer available and the client should refetch.
+    """
+    # Check membership
+    await run_in_threadpool(require_project_member, db, project_id, current_user.id)
+
+    # Subscribe before reading the backlog so no event falls in between
+    subscription = broadcaster.subscribe(project_id)
+    try:
+        current_version = await run_in_threadpool(get_issues_version, db, project_id)
+        backlog = resume_events(project_id, last_event_id, current_version)
+    except BaseException:
+        broadcaster.unsubscribe(subscription)
+        raise
+
+    return StreamingResponse(
+        stream_events(subscription, backlog),
+        media_type="text/event-stream",
+        # Keep proxies from buffering or caching the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
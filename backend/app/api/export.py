@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Iterator
+from app.core.database import get_db, streaming_session
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.services.authorization import require_project_member
+from app.services.export import EXPORT_MEDIA_TYPES, export_project
+
+router = APIRouter(tags=["Export"])
+
+
+def _stream_export(session: Session, project_id: int, export_format: str, gzip: bool) -> Iterator[bytes]:
+    with session:
+        yield from export_project(session, project_id, export_format, gzip)
+
+
+@router.get("/projects/{project_id}/export", response_class=StreamingResponse)
+def export_project_issues(
+    project_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = Query(False, description="Compress the export as it is streamed"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download every issue in the project with its comments embedded.
+
+    NDJSON has one issue per line with a comments array; CSV has one row per
+    issue with the comments as a JSON array in the last column. The export
+    is read through server-side cursors and streamed as it is produced.
+    """
+    # Check membership
+    require_project_member(db, project_id, current_user.id)
+
+    filename = f"project-{project_id}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        _stream_export(streaming_session(db), project_id, format, gzip),
+        media_type="application/gzip" if gzip else EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
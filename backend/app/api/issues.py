@@ -1,79 +1,209 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from collections import Counter
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from datetime import datetime
+from typing import Optional, Tuple
 from app.core.database import get_db
 from app.core.deps import get_current_user
+from app.core.etag import make_etag, etag_matches, not_modified, set_etag
+from app.core.pagination import encode_cursor, decode_cursor, keyset_condition
+from app.core.responses import FastJSONResponse, row_dicts, schema_columns
 from app.models.user import User
-from app.models.project import ProjectMember, ProjectRole
-from app.models.issue import Issue, IssueStatus, IssuePriority
-from app.schemas.issue import IssueCreate, IssueUpdate, IssueResponse
+from app.models.project import Project, ProjectRole
+from app.models.issue import Issue, IssueStatus, IssuePriority, IssueTombstone, PRIORITY_RANK
+from app.schemas.issue import (
+    IssueCreate,
+    IssueUpdate,
+    IssueResponse,
+    IssuePage,
+    IssueChanges,
+    IssueBulkCreate,
+    IssueBulkUpdate,
+    IssueBulkResult,
+    BulkItemError,
+    MAX_BULK_ITEMS,
+)
+from app.dao.issues import insert_issues, update_issues, get_issues
+from app.dao.projects import project_member_pairs
+from app.models.versions import bump_versions
+from app.models.stats import apply_stat_deltas, issue_stat_deltas, issue_stat_values
+from app.services.authorization import get_project_role, get_project_roles, require_project_member
+from app.services.events import publish_event
+from app.services.search import matching_issue_filter
 
 router = APIRouter(tags=["Issues"])
 
 
-def check_project_membership(db: Session, project_id: int, user_id: int) -> ProjectMember:
-    """Helper to check if user is a project member."""
-    membership = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == user_id
-    ).first()
-    if not membership:
+# sort key -> (sort column, descending, cursor value parser)
+SORT_KEYS = {
+    "created_at": (Issue.created_at, True, datetime.fromisoformat),
+    "updated_at": (Issue.updated_at, True, datetime.fromisoformat),
+    "status": (Issue.status, False, IssueStatus),
+    "priority": (Issue.priority_rank, False, int),
+    "comment_count": (Issue.comment_count, True, int),
+    "last_activity_at": (Issue.last_activity_at, True, datetime.fromisoformat),
+}
+
+# Columns read by the list endpoints, in IssueResponse field order
+ISSUE_COLUMNS = schema_columns(Issue, IssueResponse)
+ISSUE_FIELD_COLUMNS = dict(zip(IssueResponse.model_fields, ISSUE_COLUMNS))
+
+# Issue fields a partial update may not set to null
+REQUIRED_FIELDS = {"title", "status", "priority"}
+
+
+def _selected_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """The requested IssueResponse fields in schema order, always with id, which cursors need."""
+    if not fields:
+        return tuple(ISSUE_FIELD_COLUMNS)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - ISSUE_FIELD_COLUMNS.keys()
+    if unknown:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this project"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
         )
-    return membership
+    requested.add("id")
+    return tuple(name for name in ISSUE_FIELD_COLUMNS if name in requested)
 
 
-@router.get("/projects/{project_id}/issues", response_model=List[IssueResponse])
+@router.get("/projects/{project_id}/issues", response_model=IssuePage)
 def list_issues(
     project_id: int,
-    q: Optional[str] = Query(None, description="Search in title"),
+    q: Optional[str] = Query(None, description="Full-text search in title, description and comments"),
     status_filter: Optional[IssueStatus] = Query(None, alias="status"),
     priority: Optional[IssuePriority] = None,
     assignee: Optional[int] = None,
-    sort: Optional[str] = Query("created_at", regex="^(created_at|priority|status|updated_at)$"),
+    sort: Optional[str] = Query("created_at", pattern="^(created_at|priority|status|updated_at|comment_count|last_activity_at)$"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated issue fields to return; id is always included"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     List issues in a project with filtering, search, and sorting.
+
+    Results are paginated with an opaque keyset cursor: pass the returned
+    next_cursor back to fetch the following page.
+
+    fields limits each item, and the SELECT behind it, to the named fields,
+    so board views need not read every description.
+
+    The ETag changes whenever an issue or comment in the project changes, so
+    If-None-Match is answered with 304 after a single version lookup.
     """
+    selected = _selected_fields(fields)
+
     # Check membership
-    check_project_membership(db, project_id, current_user.id)
+    require_project_member(db, project_id, current_user.id)
+
+    # Read the version before the rows, so the ETag is never newer than the page
+    issues_version = db.query(Project.issues_version).filter(Project.id == project_id).scalar()
+    etag = make_etag(
+        "issues", project_id, issues_version, q, status_filter, priority, assignee, sort, limit, cursor,
+        ",".join(selected)
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
 
-    # Build query
-    query = db.query(Issue).filter(Issue.project_id == project_id)
+    # Build query: the selected fields as row tuples, plus the sort key if it is not one
+    sort_column, descending, parse = SORT_KEYS[sort]
+    extra_columns = [] if sort_column.key in selected else [sort_column]
+    query = db.query(*(ISSUE_FIELD_COLUMNS[name] for name in selected), *extra_columns) \
+        .filter(Issue.project_id == project_id)
 
     # Apply filters
     if q:
-        query = query.filter(Issue.title.ilike(f"%{q}%"))
+        query = query.filter(matching_issue_filter(db, project_id, q))
     if status_filter:
         query = query.filter(Issue.status == status_filter)
     if priority:
-        query = query.filter(Issue.priority == priority)
+        # The rank mirrors the priority, and is what ix_issues_project_priority_rank covers
+        query = query.filter(Issue.priority_rank == PRIORITY_RANK[priority])
     if assignee:
         query = query.filter(Issue.assignee_id == assignee)
 
-    # Apply sorting
-    if sort == "created_at":
-        query = query.order_by(Issue.created_at.desc())
-    elif sort == "updated_at":
-        query = query.order_by(Issue.updated_at.desc())
-    elif sort == "priority":
-        priority_order = {
-            IssuePriority.CRITICAL: 0,
-            IssuePriority.HIGH: 1,
-            IssuePriority.MEDIUM: 2,
-            IssuePriority.LOW: 3
-        }
-        issues = query.all()
-        issues.sort(key=lambda x: priority_order.get(x.priority, 4))
-        return issues
-    elif sort == "status":
-        query = query.order_by(Issue.status)
-
-    return query.all()
+    # Apply keyset position and sorting; id breaks ties so the order is total
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort, parse)
+        query = query.filter(keyset_condition(sort_column, Issue.id, value, last_id, descending))
+    if descending:
+        query = query.order_by(sort_column.desc(), Issue.id.desc())
+    else:
+        query = query.order_by(sort_column, Issue.id)
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, getattr(last, sort_column.key), last.id)
+
+    page = FastJSONResponse({"items": row_dicts(rows, selected), "next_cursor": next_cursor})
+    set_etag(page, etag)
+    return page
+
+
+@router.get("/projects/{project_id}/issues/changes", response_model=IssueChanges)
+def list_issue_changes(
+    project_id: int,
+    since: Optional[str] = Query(None, description="next_token from the previous sync; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=MAX_BULK_ITEMS),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Incremental sync: issues created or updated since the token, and the ids
+    of issues deleted since.
+
+    Changes are ordered by change_seq, the project version they were made
+    at, so the token is exact even for changes committed late or within the
+    same second. Keep requesting with next_token while has_more is true.
+    """
+    # Check membership
+    require_project_member(db, project_id, current_user.id)
+
+    # Read the watermark first: anything committed later gets a higher
+    # change_seq and is left for the next sync
+    watermark = db.query(Project.issues_version).filter(Project.id == project_id).scalar() or 0
+
+    # last_id 0 marks a token that covers all changes at its change_seq
+    seq, last_id = decode_cursor(since, "changes", int) if since else (-1, 0)
+
+    query = db.query(*ISSUE_COLUMNS, Issue.change_seq).filter(
+        Issue.project_id == project_id, Issue.change_seq <= watermark
+    )
+    if last_id:
+        query = query.filter(keyset_condition(Issue.change_seq, Issue.id, seq, last_id, False))
+    else:
+        query = query.filter(Issue.change_seq > seq)
+    issues = query.order_by(Issue.change_seq, Issue.id).limit(limit + 1).all()
+
+    has_more = len(issues) > limit
+    if has_more:
+        issues = issues[:limit]
+        upper = issues[-1].change_seq
+        next_token = encode_cursor("changes", upper, issues[-1].id)
+    else:
+        upper = watermark
+        next_token = encode_cursor("changes", watermark, 0)
+
+    # Deletions up to and including the last change_seq this page reaches
+    deleted = db.query(IssueTombstone.issue_id).filter(
+        IssueTombstone.project_id == project_id,
+        IssueTombstone.change_seq > seq,
+        IssueTombstone.change_seq <= upper
+    ).order_by(IssueTombstone.change_seq, IssueTombstone.id).all()
+
+    return FastJSONResponse({
+        "issues": row_dicts(issues, IssueResponse.model_fields),
+        "deleted": [issue_id for issue_id, in deleted],
+        "next_token": next_token,
+        "has_more": has_more,
+    })
 
 
 @router.post("/projects/{project_id}/issues", response_model=IssueResponse, status_code=status.HTTP_201_CREATED)
@@ -87,15 +217,11 @@ def create_issue(
     Create a new issue in the project.
     """
     # Check membership
-    check_project_membership(db, project_id, current_user.id)
+    require_project_member(db, project_id, current_user.id)
 
     # Verify assignee is a project member if provided
     if request.assignee_id:
-        assignee_membership = db.query(ProjectMember).filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == request.assignee_id
-        ).first()
-        if not assignee_membership:
+        if get_project_role(db, project_id, request.assignee_id) is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Assignee is not a member of this project"
@@ -111,30 +237,174 @@ def create_issue(
         assignee_id=request.assignee_id
     )
     db.add(new_issue)
+    db.flush()
+    publish_event(db, project_id, "issue.created", IssueResponse.model_validate(new_issue).model_dump(mode="json"))
     db.commit()
     db.refresh(new_issue)
 
     return new_issue
 
 
+@router.post("/projects/{project_id}/issues/bulk", response_model=IssueBulkResult)
+def bulk_create_issues(
+    project_id: int,
+    request: IssueBulkCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many issues in the project in one transaction.
+
+    Items whose assignee is not a project member are reported in errors by
+    their index; the rest are created.
+    """
+    # Check membership
+    require_project_member(db, project_id, current_user.id)
+
+    # Validate all assignees with one query
+    assignee_ids = {item.assignee_id for item in request.items if item.assignee_id}
+    members = project_member_pairs(db, [project_id], assignee_ids) if assignee_ids else set()
+
+    rows = []
+    errors = []
+    for index, item in enumerate(request.items):
+        if item.assignee_id and (project_id, item.assignee_id) not in members:
+            errors.append(BulkItemError(index=index, detail="Assignee is not a member of this project"))
+            continue
+        rows.append({
+            "project_id": project_id,
+            "title": item.title,
+            "description": item.description,
+            "priority": item.priority,
+            "reporter_id": current_user.id,
+            "assignee_id": item.assignee_id,
+        })
+
+    # Serialize before the commit expires the returned issues
+    items = [IssueResponse.model_validate(issue) for issue in insert_issues(db, rows)]
+    if items:
+        bump_versions(db, project_ids=[project_id], changed_issue_ids=[item.id for item in items])
+        deltas = Counter()
+        for item in items:
+            deltas.update(issue_stat_deltas(project_id, after=issue_stat_values(item)))
+        apply_stat_deltas(db, deltas)
+        publish_event(db, project_id, "issues.bulk_created", {"ids": [item.id for item in items]})
+    db.commit()
+
+    return IssueBulkResult(items=items, errors=errors)
+
+
+# Declared before /issues/{issue_id} so "bulk" is not parsed as an issue id
+@router.patch("/issues/bulk", response_model=IssueBulkResult)
+def bulk_update_issues(
+    request: IssueBulkUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply partial updates to many issues in one transaction.
+
+    Each item follows the rules of PATCH /issues/{id}; items that break them
+    are reported in errors by their index and the rest are applied.
+    """
+    ids = [item.id for item in request.items]
+    issues = {issue.id: issue for issue in get_issues(db, ids)}
+    roles = get_project_roles(db, {issue.project_id for issue in issues.values()}, current_user.id)
+
+    # Validate all assignees with one query
+    assignee_ids = {item.assignee_id for item in request.items if item.assignee_id}
+    members = project_member_pairs(db, roles, assignee_ids) if assignee_ids and roles else set()
+
+    rows = []
+    errors = []
+    seen = set()
+    for index, item in enumerate(request.items):
+        issue = issues.get(item.id)
+        role = roles.get(issue.project_id) if issue else None
+        is_maintainer = role == ProjectRole.MAINTAINER
+
+        if issue is None or role is None:
+            # Do not reveal issues in projects the user cannot see
+            detail = "Issue not found"
+        elif item.id in seen:
+            detail = "Issue appears more than once in this request"
+        elif not (is_maintainer or issue.reporter_id == current_user.id):
+            detail = "You can only update issues you reported or be a maintainer"
+        elif not is_maintainer and (item.status is not None or item.assignee_id is not None):
+            detail = "Only maintainers can change status and assignee"
+        elif item.assignee_id and (issue.project_id, item.assignee_id) not in members:
+            detail = "Assignee is not a member of this project"
+        elif any(getattr(item, field) is None for field in REQUIRED_FIELDS & item.model_fields_set):
+            detail = "title, status and priority cannot be null"
+        else:
+            detail = None
+
+        if detail:
+            errors.append(BulkItemError(index=index, detail=detail))
+            continue
+
+        seen.add(item.id)
+        row = item.model_dump(exclude_unset=True)
+        row["id"] = item.id
+        if row.get("priority") is not None:
+            # Bulk UPDATE bypasses the ORM validator that keeps the rank in step
+            row["priority_rank"] = PRIORITY_RANK[row["priority"]]
+        rows.append(row)
+
+    # Counter values before the update; the re-fetch below overwrites the loaded issues
+    before = {issue_id: issue_stat_values(issues[issue_id]) for issue_id in seen}
+    update_issues(db, rows)
+    if seen:
+        bump_versions(db, project_ids={issues[issue_id].project_id for issue_id in seen}, updated_issue_ids=seen)
+    updated = {issue.id: issue for issue in get_issues(db, seen)} if seen else {}
+    items = [IssueResponse.model_validate(updated[row["id"]]) for row in rows]
+    deltas = Counter()
+    for item in items:
+        deltas.update(issue_stat_deltas(item.project_id, before=before[item.id], after=issue_stat_values(item)))
+    apply_stat_deltas(db, deltas)
+    for project_id in sorted({item.project_id for item in items}):
+        ids = [item.id for item in items if item.project_id == project_id]
+        publish_event(db, project_id, "issues.bulk_updated", {"ids": ids})
+    db.commit()
+
+    return IssueBulkResult(items=items, errors=errors)
+
+
 @router.get("/issues/{issue_id}", response_model=IssueResponse)
 def get_issue(
     issue_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get issue details.
+
+    Answers a matching If-None-Match with 304 from an indexed version lookup.
     """
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
-    if not issue:
+    found = db.query(Issue.project_id, Issue.version, Issue.updated_at).filter(Issue.id == issue_id).first()
+    if not found:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Issue not found"
         )
 
     # Check membership
-    check_project_membership(db, issue.project_id, current_user.id)
+    require_project_member(db, found.project_id, current_user.id)
+
+    etag = make_etag("issue", issue_id, found.version, found.updated_at)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    if not issue:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Issue not found"
+        )
+    # Tag the row actually returned, which may be newer than the lookup
+    set_etag(response, make_etag("issue", issue_id, issue.version, issue.updated_at))
 
     return issue
 
@@ -157,10 +427,10 @@ def update_issue(
         )
 
     # Check membership
-    membership = check_project_membership(db, issue.project_id, current_user.id)
+    role = require_project_member(db, issue.project_id, current_user.id)
 
     # Check permissions
-    is_maintainer = membership.role == ProjectRole.MAINTAINER
+    is_maintainer = role == ProjectRole.MAINTAINER
     is_reporter = issue.reporter_id == current_user.id
 
     if not (is_maintainer or is_reporter):
@@ -182,6 +452,8 @@ def update_issue(
     for field, value in update_data.items():
         setattr(issue, field, value)
 
+    db.flush()
+    publish_event(db, issue.project_id, "issue.updated", IssueResponse.model_validate(issue).model_dump(mode="json"))
     db.commit()
     db.refresh(issue)
 
@@ -205,10 +477,10 @@ def delete_issue(
         )
 
     # Check membership
-    membership = check_project_membership(db, issue.project_id, current_user.id)
+    role = require_project_member(db, issue.project_id, current_user.id)
 
     # Check permissions
-    is_maintainer = membership.role == ProjectRole.MAINTAINER
+    is_maintainer = role == ProjectRole.MAINTAINER
     is_reporter = issue.reporter_id == current_user.id
 
     if not (is_maintainer or is_reporter):
@@ -218,6 +490,8 @@ def delete_issue(
         )
 
     db.delete(issue)
+    db.flush()
+    publish_event(db, issue.project_id, "issue.deleted", {"id": issue_id})
     db.commit()
 
     return None
@@ -3,9 +3,13 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
 from app.core.deps import get_current_user
+from app.dao.projects import list_projects_for_user, list_project_members
 from app.models.user import User
 from app.models.project import Project, ProjectMember, ProjectRole
 from app.schemas.project import ProjectCreate, ProjectResponse, ProjectMemberAdd, ProjectMemberResponse
+from app.schemas.stats import ProjectStats
+from app.services.authorization import get_project_role, require_project_member, require_maintainer
+from app.services.stats import get_project_stats
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
@@ -58,12 +62,7 @@ def list_projects(
     """
     Get all projects the current user belongs to.
     """
-    project_members = db.query(ProjectMember).filter(
-        ProjectMember.user_id == current_user.id
-    ).all()
-
-    projects = [db.query(Project).filter(Project.id == pm.project_id).first() for pm in project_members]
-    return projects
+    return list_projects_for_user(db, current_user.id)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
@@ -76,16 +75,7 @@ def get_project(
     Get project details.
     """
     # Check if user is a member
-    membership = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id
-    ).first()
-
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this project"
-        )
+    require_project_member(db, project_id, current_user.id)
 
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
@@ -97,6 +87,22 @@ def get_project(
     return project
 
 
+@router.get("/{project_id}/stats", response_model=ProjectStats)
+def get_stats(
+    project_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Issue counts by status, priority and assignee, read from counters kept
+    up to date on every issue change.
+    """
+    # Check if user is a member
+    require_project_member(db, project_id, current_user.id)
+
+    return get_project_stats(db, project_id)
+
+
 @router.get("/{project_id}/members")
 def get_project_members(
     project_id: int,
@@ -107,34 +113,18 @@ def get_project_members(
     Get all members of a project.
     """
     # Check if user is a member
-    membership = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id
-    ).first()
-
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this project"
-        )
+    require_project_member(db, project_id, current_user.id)
 
     # Get all project members with user info
-    members = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id
-    ).all()
-
-    result = []
-    for member in members:
-        user = db.query(User).filter(User.id == member.user_id).first()
-        if user:
-            result.append({
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "role": member.role
-            })
-
-    return result
+    return [
+        {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "role": role
+        }
+        for user, role in list_project_members(db, project_id)
+    ]
 
 
 @router.post("/{project_id}/members", response_model=ProjectMemberResponse, status_code=status.HTTP_201_CREATED)
@@ -148,17 +138,7 @@ def add_project_member(
     Add a member to the project. Only maintainers can do this.
     """
     # Check if current user is a maintainer
-    membership = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id,
-        ProjectMember.role == ProjectRole.MAINTAINER
-    ).first()
-
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only maintainers can add members"
-        )
+    require_maintainer(db, project_id, current_user.id, detail="Only maintainers can add members")
 
     # Find user by email
     user = db.query(User).filter(User.email == request.email).first()
@@ -169,18 +149,13 @@ def add_project_member(
         )
 
     # Check if already a member
-    existing_member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == user.id
-    ).first()
-
-    if existing_member:
+    if get_project_role(db, project_id, user.id) is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is already a member"
         )
 
-    # Add member
+    # Add member (the ProjectMember insert evicts any cached role)
     new_member = ProjectMember(
         project_id=project_id,
         user_id=user.id,
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List
+from app.core.database import get_db
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.models.issue import Issue
+from app.schemas.issue import IssueResponse
+from app.schemas.search import IssueSearchResult
+from app.services.authorization import require_project_member
+from app.services.search import search_issues
+
+router = APIRouter(tags=["Search"])
+
+
+@router.get("/projects/{project_id}/search", response_model=List[IssueSearchResult])
+def search_project(
+    project_id: int,
+    q: str = Query(..., min_length=1, description="Words to match in titles, descriptions and comments"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search over a project's issues and their comments, best matches first.
+    """
+    # Check membership
+    require_project_member(db, project_id, current_user.id)
+
+    hits = search_issues(db, project_id, q, limit)
+    if not hits:
+        return []
+
+    issues = {issue.id: issue for issue in db.query(Issue).filter(Issue.id.in_([issue_id for issue_id, _ in hits]))}
+    return [
+        IssueSearchResult(**IssueResponse.model_validate(issues[issue_id]).model_dump(), score=score)
+        for issue_id, score in hits
+        if issue_id in issues
+    ]
@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+PENDING_EVICTIONS_KEY = "pending_cache_evictions"
+
+
+class TTLCache:
+    """
+    Bounded, thread-safe LRU cache whose entries expire after a time-to-live.
+
+    A maxsize or ttl of zero disables the cache: set() becomes a no-op.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def evict_on_commit(session: Session, cache: TTLCache, key: Hashable) -> None:
+    """
+    Drop the cached copy of a row the session is writing: now, and again when
+    its transaction ends. Between the flush and the commit, a concurrent
+    request still reads the old committed row and may cache it again.
+    """
+    cache.pop(key)
+    session.info.setdefault(PENDING_EVICTIONS_KEY, []).append((cache, key))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _evict_pending(session):
+    for cache, key in session.info.pop(PENDING_EVICTIONS_KEY, []):
+        cache.pop(key)
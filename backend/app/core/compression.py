@@ -0,0 +1,194 @@
+"""
+Negotiated response compression: zstd, brotli or gzip, by Accept-Encoding.
+
+zstd and brotli come from the zstandard and brotli packages in
+requirements.txt; an install without them falls back to gzip, which is
+always available.
+
+Responses sent in one piece are compressed when they reach the size
+threshold. Streamed responses (more_body) are compressed as they go, with
+each chunk flushed so a client sees it as soon as the app sends it.
+Event streams, responses the app already encoded (Content-Encoding, or a
+compressed media type such as the gzip export) and bodiless statuses pass
+through untouched.
+
+The ETag of a compressed response is marked weak, since the bytes differ
+from the identity encoding; etag_matches() compares weakly, so conditional
+requests keep working either way.
+"""
+import zlib
+from typing import Callable, Dict, Optional, Sequence
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import note_uncompressed_bytes
+
+try:
+    import brotli
+except ImportError:  # falls back to gzip
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # falls back to gzip
+    zstandard = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# Media types that are already compressed or must reach the client unbuffered
+SKIPPED_MEDIA_TYPES = ("text/event-stream", "application/gzip", "application/zstd", "application/zip", "image/")
+
+
+class _Gzip:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+# Content-coding -> compressor, for the codings whose libraries are installed
+COMPRESSORS: Dict[str, Callable] = {"gzip": _Gzip}
+if brotli is not None:
+    COMPRESSORS["br"] = _Brotli
+if zstandard is not None:
+    COMPRESSORS["zstd"] = _Zstd
+
+
+def negotiate_encoding(accept_encoding: Optional[str], preference: Sequence[str]) -> Optional[str]:
+    """
+    The coding to respond with: the one the client weights highest, ties going
+    to the earliest in preference, or None for identity.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for coding in preference:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware, so streamed bodies are compressed chunk by chunk."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, encodings: Sequence[str] = ("zstd", "br", "gzip")):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = [encoding for encoding in encodings if encoding in COMPRESSORS]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    """The send callable for one response: holds the start message until the first body decides."""
+
+    def __init__(self, send: Send, encoding: Optional[str], minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+        self.uncompressed_bytes = 0
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            status_code = message["status"]
+            media_type = headers.get("content-type", "")
+            self.passthrough = (
+                status_code < 200 or status_code in (204, 304)
+                or "content-encoding" in headers
+                or media_type.startswith(SKIPPED_MEDIA_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        self.uncompressed_bytes += len(body)
+        if not more_body:
+            note_uncompressed_bytes(self.uncompressed_bytes)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if self.encoding is None or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(scope=start)
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            self.compressor = COMPRESSORS[self.encoding]()
+            if not more_body:
+                body = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            # The length of a stream is not known up front
+            del headers["Content-Length"]
+            await self.send(start)
+
+        if more_body and not body:
+            return
+        body = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -1,15 +1,73 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./issuehub.db"
+    # Serve the project, issue and comment routers on an asyncio driver
+    # (aiosqlite / asyncpg) instead of the thread pool
+    DATABASE_ASYNC: bool = False
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Sessions (refresh tokens) end after this many days without a refresh
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # A replaced refresh token presented this soon after its refresh is taken for
+    # a concurrent refresh by another tab and refused, rather than revoking the session
+    REFRESH_REUSE_GRACE_SECONDS: int = 10
+    # Key id (kid header) of SECRET_KEY, which signs new tokens, and earlier
+    # keys by id (JSON object) whose tokens are still accepted, for rotation
+    JWT_KEY_ID: str = "default"
+    JWT_PREVIOUS_KEYS: Dict[str, str] = {}
+    # bcrypt cost factor; stored hashes with a different cost are upgraded on login
+    BCRYPT_ROUNDS: int = 12
+    # Processes reserved for password hashing (0 hashes in the request thread pool)
+    PASSWORD_HASH_WORKERS: int = 2
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:3001,http://localhost:5173"
 
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 keeps connections forever
+    DB_POOL_PRE_PING: bool = True
+    # PostgreSQL session settings (0 disables the statement timeout)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_APPLICATION_NAME: str = "issuehub-api"
+
+    # In-process cache of verified access tokens' claims, kept no longer than
+    # the token is valid (0 disables)
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    # In-process cache of authenticated users (0 disables)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    # In-process cache of project roles (0 disables)
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 60
+    MEMBERSHIP_CACHE_MAX_SIZE: int = 50000
+
+    # Project event streams: "local" delivers within this process only,
+    # "postgres" fans out to every worker through LISTEN/NOTIFY
+    EVENTS_BACKEND: str = "local"
+    # Recent events kept per project for Last-Event-ID resume
+    EVENTS_BUFFER_SIZE: int = 1000
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+
+    # Response compression, in server preference order (br and zstd need the
+    # brotli and zstandard packages; empty disables), for bodies of at least
+    # COMPRESSION_MIN_SIZE bytes; streamed bodies are always compressed
+    COMPRESSION_ENCODINGS: str = "zstd,br,gzip"
+    COMPRESSION_MIN_SIZE: int = 1024
+
+    # Per-request query counts and timings: Server-Timing headers, JSON logs
+    # on the issuehub.requests logger and per-route histograms at /metrics
+    REQUEST_METRICS: bool = False
+    # Only log requests at least this slow (0 logs every request)
+    REQUEST_LOG_MIN_MS: int = 0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,23 +1,137 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, DateTime
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from functools import lru_cache
 from app.core.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+
+def engine_options(database_url: str) -> dict:
+    """create_engine keyword arguments for the configured pool and session settings."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection; keep the default pool
+            return options
+    else:
+        options = {"connect_args": {}}
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if url.get_backend_name() == "postgresql":
+        options["connect_args"]["application_name"] = settings.DB_APPLICATION_NAME
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            options["connect_args"]["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    return options
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# SQLite stores CURRENT_TIMESTAMP server defaults as "YYYY-MM-DD HH:MM:SS" text,
+# while bound datetimes are written with microseconds. Use the server-default
+# shape for bound values too, so equal timestamps compare equal in keyset queries.
+TZDateTime = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
+
+def streaming_session(db: Session) -> Session:
+    """
+    A new session on the same database as db, for response bodies generated
+    after the request's session is closed.
+
+    In async mode db runs on the asyncio driver, which can only be used from
+    the event loop; streams are iterated on worker threads, so they use the
+    sync engine instead.
+    """
+    bind = db.get_bind()
+    if bind.dialect.is_async:
+        bind = engine
+    return Session(bind=bind, autoflush=False)
+
+
+async def get_db():
+    """
+    Dependency for getting database session.
 
-def get_db():
-    """Dependency for getting database session."""
+    Declared async so opening and closing the session never waits for a
+    thread-pool slot: with a sync generator, a burst of requests could fill the
+    thread pool with handlers waiting for pooled connections while the
+    sessions holding those connections waited for a thread to close them.
+    """
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# asyncio drivers used when DATABASE_ASYNC is enabled
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_engine_options(database_url: str) -> dict:
+    """engine_options translated for the asyncio driver of the same backend."""
+    options = engine_options(database_url)
+    if make_url(database_url).get_backend_name() == "sqlite":
+        # aiosqlite opens a connection per checkout (NullPool); there is no pool to size
+        for option in ("pool_size", "max_overflow", "pool_timeout"):
+            options.pop(option, None)
+    elif make_url(database_url).get_backend_name() == "postgresql":
+        # asyncpg takes session settings as server_settings rather than libpq options
+        connect_args = options.pop("connect_args")
+        server_settings = {"application_name": connect_args["application_name"]}
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        options["connect_args"] = {"server_settings": server_settings}
+    return options
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Session factory on the asyncio driver; created on first use so the driver stays optional."""
+    url = make_url(settings.DATABASE_URL)
+    async_url = url.set(drivername=f"{url.get_backend_name()}+{ASYNC_DRIVERS[url.get_backend_name()]}")
+    async_engine = create_async_engine(async_url, **async_engine_options(settings.DATABASE_URL))
+    # Responses are serialized after the session work finishes, so keep loaded
+    # attributes readable instead of expiring them on commit
+    return async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+async def get_async_db():
+    """Dependency for getting an asyncio database session."""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def get_pool_stats() -> dict:
+    """Snapshot of the connection pool, for sizing it against the worker count."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return stats
@@ -1,21 +1,38 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from typing import Optional
+from app.core.cache import TTLCache, evict_on_commit
+from app.core.config import get_settings
+from app.core.database import get_db, get_async_db
 from app.core.security import decode_access_token
 from app.models.user import User
 
+settings = get_settings()
+
 security = HTTPBearer()
 
+# user id -> column snapshot of the authenticated user
+user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Get the current authenticated user from the JWT token.
-    """
-    token = credentials.credentials
+CACHED_USER_FIELDS = ("id", "name", "email", "created_at")
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a cached user identity. Call whenever a user is changed or deleted."""
+    user_cache.pop(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_on_write(mapper, connection, target):
+    evict_on_commit(object_session(target), user_cache, target.id)
+
+
+def get_user_id_from_token(token: str) -> int:
+    """Validate a bearer token and return the user id it was issued for."""
     payload = decode_access_token(token)
 
     if payload is None:
@@ -35,7 +52,7 @@ async def get_current_user(
 
     # Convert string user_id back to integer
     try:
-        user_id = int(user_id_str)
+        return int(user_id_str)
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,7 +60,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+
+def _authenticated(user_id: int, user: Optional[User]) -> dict:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,4 +69,50 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user
+    snapshot = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+    user_cache.set(user_id, snapshot)
+    return snapshot
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Get the current authenticated user from the JWT token.
+
+    A plain def, so FastAPI runs the blocking users lookup in the thread pool
+    rather than on the event loop.
+    """
+    user_id = get_user_id_from_token(credentials.credentials)
+
+    # Serve a detached copy from the cache to skip the users lookup
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return User(**snapshot)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    snapshot = _authenticated(user_id, user)
+
+    # End the read transaction so the pooled connection is returned while the
+    # endpoint waits for a thread; holding it there lets a burst of requests
+    # fill the thread pool with handlers blocked on pool checkout
+    db.rollback()
+    return User(**snapshot)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    get_current_user for routes running on an asyncio database session.
+    """
+    user_id = get_user_id_from_token(credentials.credentials)
+
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return User(**snapshot)
+
+    user = await db.get(User, user_id)
+    return User(**_authenticated(user_id, user))
@@ -0,0 +1,270 @@
+"""
+Opt-in per-request instrumentation (REQUEST_METRICS).
+
+RequestMetricsMiddleware gives each request a RequestMetrics record through
+a context variable, which is copied into the thread pool and the async
+driver's greenlets, so the engine hooks installed by instrument_engine() can
+attribute every statement to the request that ran it. instrument_routes()
+marks when each endpoint returns, so the time from there to the response
+start is the response model validation and JSON encoding.
+
+Each request then gets a Server-Timing header, a JSON log line on the
+issuehub.requests logger, and observations in per-route histograms that
+/metrics renders in the Prometheus text format. Response sizes are recorded
+both as sent and, through note_uncompressed_bytes() from the compression
+middleware, before compression. Work after the response
+starts (streamed bodies) is in the logs and histograms but not the header.
+"""
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("issuehub.requests")
+
+# Longest statement text kept for the slowest query of a request
+MAX_STATEMENT_LENGTH = 500
+
+
+class RequestMetrics:
+    """What one request spent, filled in as it runs."""
+
+    __slots__ = (
+        "started", "queries", "db_seconds", "slowest_seconds", "slowest_statement",
+        "endpoint_returned", "response_started", "wire_bytes", "uncompressed_bytes",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.endpoint_returned: Optional[float] = None
+        self.response_started: Optional[float] = None
+        self.wire_bytes = 0
+        self.uncompressed_bytes: Optional[int] = None
+
+    @property
+    def serialization_seconds(self) -> Optional[float]:
+        if self.endpoint_returned is None or self.response_started is None:
+            return None
+        return max(self.response_started - self.endpoint_returned, 0.0)
+
+    def server_timing(self) -> str:
+        """Server-Timing header value; durations are in milliseconds."""
+        entries = [
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries"',
+            f"db-slowest;dur={self.slowest_seconds * 1000:.2f}",
+        ]
+        if self.serialization_seconds is not None:
+            entries.append(f"serialize;dur={self.serialization_seconds * 1000:.2f}")
+        entries.append(f"app;dur={(self.response_started - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+class Histogram:
+    """Thread-safe cumulative histogram per route, in the Prometheus data model."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (count per bucket, sum, count)
+        self._series: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, str], value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, (list(counts), total, count)) for labels, (counts, total, count) in self._series.items())
+        for (method, route), (counts, total, count) in series:
+            labels = f'method="{method}",route="{_escape_label(route)}"'
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound:g}"}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total:g}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_SECONDS = Histogram("issuehub_request_duration_seconds", "Request duration.", SECONDS_BUCKETS)
+DB_SECONDS = Histogram("issuehub_request_db_seconds", "Time spent executing SQL per request.", SECONDS_BUCKETS)
+QUERIES = Histogram("issuehub_request_queries", "SQL statements per request.", (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89))
+SERIALIZATION_SECONDS = Histogram(
+    "issuehub_request_serialization_seconds", "Response validation and encoding time per request.", SECONDS_BUCKETS
+)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+RESPONSE_BYTES = Histogram("issuehub_response_bytes", "Response body size before compression.", BYTES_BUCKETS)
+WIRE_BYTES = Histogram("issuehub_response_wire_bytes", "Response body size as sent.", BYTES_BUCKETS)
+HISTOGRAMS = (REQUEST_SECONDS, DB_SECONDS, QUERIES, SERIALIZATION_SECONDS, RESPONSE_BYTES, WIRE_BYTES)
+
+
+def render_metrics() -> str:
+    """Every histogram in the Prometheus text exposition format."""
+    return "".join(histogram.render() for histogram in HISTOGRAMS)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_request.get() is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current_request.get()
+    started = getattr(context, "_metrics_started", None)
+    if metrics is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    metrics.queries += 1
+    metrics.db_seconds += elapsed
+    if elapsed >= metrics.slowest_seconds:
+        metrics.slowest_seconds = elapsed
+        metrics.slowest_statement = statement[:MAX_STATEMENT_LENGTH]
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute the engine's statements to the current request (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _mark_return(call):
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def marked_async(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _note_endpoint_returned()
+        return marked_async
+
+    @functools.wraps(call)
+    def marked(*args, **kwargs):
+        try:
+            return call(*args, **kwargs)
+        finally:
+            _note_endpoint_returned()
+    return marked
+
+
+def note_uncompressed_bytes(size: int) -> None:
+    """Record the current response's body size before compression."""
+    metrics = _current_request.get()
+    if metrics is not None:
+        metrics.uncompressed_bytes = size
+
+
+def _note_endpoint_returned() -> None:
+    metrics = _current_request.get()
+    if metrics is not None:
+        metrics.endpoint_returned = time.perf_counter()
+
+
+def instrument_routes(app: FastAPI) -> None:
+    """Mark when each endpoint returns, to time serialization. Call after including every router."""
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not getattr(route.dependant.call, "_marks_return", False):
+            route.dependant.call = _mark_return(route.dependant.call)
+            route.dependant.call._marks_return = True
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware, so the context variable is set in the request's own task."""
+
+    def __init__(self, app: ASGIApp, log_min_ms: float = 0):
+        self.app = app
+        self.log_min_ms = log_min_ms
+        # Without any logging configured (uvicorn only configures its own loggers), print the lines
+        if not logger.handlers and not logging.getLogger().handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+        if logger.level == logging.NOTSET:
+            logger.setLevel(logging.INFO)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current_request.set(metrics)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                metrics.response_started = time.perf_counter()
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", metrics.server_timing())
+            elif message["type"] == "http.response.body":
+                metrics.wire_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_request.reset(token)
+            self._record(scope, metrics, status_code)
+
+    def _record(self, scope: Scope, metrics: RequestMetrics, status_code: int) -> None:
+        duration = time.perf_counter() - metrics.started
+        route = scope.get("route")
+        labels = (scope["method"], getattr(route, "path", "<unmatched>"))
+        REQUEST_SECONDS.observe(labels, duration)
+        DB_SECONDS.observe(labels, metrics.db_seconds)
+        QUERIES.observe(labels, metrics.queries)
+        serialization = metrics.serialization_seconds
+        if serialization is not None:
+            SERIALIZATION_SECONDS.observe(labels, serialization)
+        uncompressed_bytes = metrics.wire_bytes if metrics.uncompressed_bytes is None else metrics.uncompressed_bytes
+        RESPONSE_BYTES.observe(labels, uncompressed_bytes)
+        WIRE_BYTES.observe(labels, metrics.wire_bytes)
+
+        if duration * 1000 >= self.log_min_ms:
+            logger.info(json.dumps({
+                "method": labels[0],
+                "route": labels[1],
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "queries": metrics.queries,
+                "db_ms": round(metrics.db_seconds * 1000, 2),
+                "slowest_query_ms": round(metrics.slowest_seconds * 1000, 2),
+                "slowest_query": metrics.slowest_statement,
+                "serialize_ms": None if serialization is None else round(serialization * 1000, 2),
+                "bytes": uncompressed_bytes,
+                "wire_bytes": metrics.wire_bytes,
+            }))
@@ -0,0 +1,42 @@
+import base64
+import enum
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import literal, tuple_
+
+
+def encode_cursor(sort: str, value: Any, last_id: int) -> str:
+    """Encode the position after a row as an opaque, URL-safe cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, enum.Enum):
+        value = value.value
+    payload = json.dumps([sort, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, parse: Optional[Callable[[Any], Any]] = None) -> Tuple[Any, int]:
+    """Decode a cursor produced by encode_cursor for the given sort key."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, last_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if cursor_sort != sort or not isinstance(last_id, int):
+            raise ValueError("cursor does not match sort")
+        if parse is not None:
+            value = parse(value)
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return value, last_id
+
+
+def keyset_condition(sort_column, id_column, value: Any, last_id: int, descending: bool):
+    """Filter selecting rows strictly after (value, last_id) in (sort_column, id) order."""
+    position = tuple_(literal(value, sort_column.type), literal(last_id, id_column.type))
+    if descending:
+        return tuple_(sort_column, id_column) < position
+    return tuple_(sort_column, id_column) > position
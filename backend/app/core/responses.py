@@ -0,0 +1,46 @@
+"""
+Fast path for list responses.
+
+List endpoints select the columns of their response schema as row tuples
+and encode plain dicts with orjson, instead of loading ORM objects,
+validating each one through the schema (from_attributes) and running the
+result through jsonable_encoder and the standard encoder. json_dumps()
+encodes str enums and datetimes as pydantic does (UTC as Z, which orjson
+only does with OPT_UTC_Z), so the body is the same bytes.
+
+Routes keep their response_model for the OpenAPI schema; returning a
+Response skips FastAPI's validation of it. benchmarks/bench_serialization.py
+compares both paths.
+"""
+from typing import Any, Iterable, List, Type
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def json_dumps(content: Any) -> bytes:
+    """orjson.dumps, writing UTC offsets as Z like pydantic."""
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> list:
+    """The model's columns named after the schema's fields, in field order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def row_dicts(rows: Iterable[tuple], fields: Iterable[str]) -> List[dict]:
+    """
+    Rows as dicts keyed by fields, the names of their leading columns in order
+    (a schema's model_fields for rows selected with schema_columns()).
+
+    Columns selected after those (say a sort key for the cursor) are dropped.
+    """
+    names = tuple(fields)
+    return [dict(zip(names, row)) for row in rows]
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
@@ -1,11 +1,32 @@
+import asyncio
+import hashlib
+import multiprocessing
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import JWTError, jwt
+from jose import ExpiredSignatureError, JWTError, jwt
+from starlette.concurrency import run_in_threadpool
 import bcrypt
+from app.core.cache import TTLCache
 from app.core.config import get_settings
 
 settings = get_settings()
 
+# kid -> secret of every key whose tokens are accepted; new tokens are signed
+# with SECRET_KEY under JWT_KEY_ID
+VERIFICATION_KEYS = {settings.JWT_KEY_ID: settings.SECRET_KEY}
+for _kid, _secret in settings.JWT_PREVIOUS_KEYS.items():
+    VERIFICATION_KEYS.setdefault(_kid, _secret)
+
+# access token -> its verified claims, until the token expires
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
+
+_password_hasher: Optional[ProcessPoolExecutor] = None
+_password_hasher_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
@@ -14,11 +35,69 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if a stored hash was made with a cost factor other than BCRYPT_ROUNDS."""
+    # bcrypt hashes look like $2b$<cost>$<salt + digest>
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+def get_password_hasher() -> Optional[ProcessPoolExecutor]:
+    """
+    Process pool reserved for bcrypt, created on first use.
+
+    Returns None when PASSWORD_HASH_WORKERS is 0.
+    """
+    global _password_hasher
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    with _password_hasher_lock:
+        if _password_hasher is None:
+            # spawn: forking a process that is already running threads is unsafe
+            _password_hasher = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _password_hasher
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the password hashing processes; the next hash starts a new pool."""
+    global _password_hasher
+    with _password_hasher_lock:
+        if _password_hasher is not None:
+            _password_hasher.shutdown()
+            _password_hasher = None
+
+
+async def _run_password_hasher(func, *args):
+    pool = get_password_hasher()
+    if pool is None:
+        return await run_in_threadpool(func, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password hashing pool, off the request thread pool."""
+    return await _run_password_hasher(
+        bcrypt.checkpw, plain_password.encode('utf-8'), hashed_password.encode('utf-8')
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password hashing pool, off the request thread pool."""
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    hashed = await _run_password_hasher(bcrypt.hashpw, password.encode('utf-8'), salt)
+    return hashed.decode('utf-8')
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -31,14 +110,66 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(
+        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM, headers={"kid": settings.JWT_KEY_ID}
+    )
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[dict]:
-    """Decode a JWT access token."""
+def create_refresh_token() -> str:
+    """A random refresh token; only its hash_refresh_token() digest is stored."""
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    SHA-256 hex digest of a refresh token.
+
+    Refresh tokens are 256 random bits rather than user-chosen passwords, so a
+    fast hash is enough and refreshing never pays for bcrypt.
+    """
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _verify_access_token(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        kid = jwt.get_unverified_header(token).get("kid")
     except JWTError:
         return None
+    if kid is None:
+        # Issued before tokens carried a key id: signed by one of the keys
+        keys = list(VERIFICATION_KEYS.values())
+    elif kid in VERIFICATION_KEYS:
+        keys = [VERIFICATION_KEYS[kid]]
+    else:
+        return None
+
+    for key in keys:
+        try:
+            return jwt.decode(token, key, algorithms=[settings.ALGORITHM])
+        except ExpiredSignatureError:
+            # The signature matched, so no other key will do better
+            return None
+        except JWTError:
+            continue
+    return None
+
+
+def decode_access_token(token: str) -> Optional[dict]:
+    """
+    Verify a JWT access token and return its claims, or None if it is invalid or expired.
+
+    Claims are cached by token until it expires, so repeat requests with the
+    same token skip parsing and signature verification. The returned dict
+    is shared between requests: do not modify it.
+    """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
+    payload = _verify_access_token(token)
+    if payload is None:
+        return None
+    exp = payload.get("exp")
+    token_cache.set(token, payload, exp - time.time() if isinstance(exp, (int, float)) else None)
+    return payload
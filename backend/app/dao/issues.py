@@ -0,0 +1,26 @@
+from typing import Iterable, List
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+from app.models.issue import Issue
+
+
+def insert_issues(db: Session, rows: List[dict]) -> List[Issue]:
+    """Insert issue rows as batched multi-row INSERT ... RETURNING; issues come back in row order."""
+    if not rows:
+        return []
+    # RETURNING order is unspecified, and asking SQLAlchemy to sort by parameter
+    # order makes SQLite fall back to one INSERT per row. Ids are assigned in
+    # VALUES order, so ordering by id restores the row order.
+    issues = db.scalars(insert(Issue).returning(Issue), rows).all()
+    return sorted(issues, key=lambda issue: issue.id)
+
+
+def update_issues(db: Session, rows: List[dict]) -> None:
+    """Apply partial updates keyed by "id", batched into executemany UPDATEs by primary key."""
+    if rows:
+        db.execute(update(Issue), rows)
+
+
+def get_issues(db: Session, issue_ids: Iterable[int]) -> List[Issue]:
+    """Issues with the given ids, in one query; missing ids are skipped."""
+    return db.query(Issue).filter(Issue.id.in_(set(issue_ids))).populate_existing().all()
@@ -0,0 +1,31 @@
+from typing import Iterable, List, Set, Tuple
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.project import Project, ProjectMember, ProjectRole
+
+
+def list_projects_for_user(db: Session, user_id: int) -> List[Project]:
+    """All projects the user belongs to, in the order they joined, in one query."""
+    return db.query(Project).join(
+        ProjectMember, ProjectMember.project_id == Project.id
+    ).filter(
+        ProjectMember.user_id == user_id
+    ).order_by(ProjectMember.id).all()
+
+
+def list_project_members(db: Session, project_id: int) -> List[Tuple[User, ProjectRole]]:
+    """(user, role) for every member of the project, in the order they joined, in one query."""
+    return db.query(User, ProjectMember.role).join(
+        ProjectMember, ProjectMember.user_id == User.id
+    ).filter(
+        ProjectMember.project_id == project_id
+    ).order_by(ProjectMember.id).all()
+
+
+def project_member_pairs(db: Session, project_ids: Iterable[int], user_ids: Iterable[int]) -> Set[Tuple[int, int]]:
+    """The (project_id, user_id) memberships among the given projects and users, in one query."""
+    rows = db.query(ProjectMember.project_id, ProjectMember.user_id).filter(
+        ProjectMember.project_id.in_(set(project_ids)),
+        ProjectMember.user_id.in_(set(user_ids))
+    ).all()
+    return {(project_id, user_id) for project_id, user_id in rows}
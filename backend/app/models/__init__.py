@@ -1,7 +1,11 @@
 from app.models.user import User
 from app.models.project import Project, ProjectMember, ProjectRole
-from app.models.issue import Issue, IssueStatus, IssuePriority
+from app.models.issue import Issue, IssueStatus, IssuePriority, IssueTombstone
 from app.models.comment import Comment
+from app.models.stats import ProjectIssueStat
+from app.models.session import UserSession
+from app.models import search  # noqa: F401  registers full-text search DDL
+from app.models import versions  # noqa: F401  registers change counter bumps
 
 __all__ = [
     "User",
@@ -11,5 +15,8 @@ __all__ = [
     "Issue",
     "IssueStatus",
     "IssuePriority",
+    "IssueTombstone",
     "Comment",
+    "ProjectIssueStat",
+    "UserSession",
 ]
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.core.database import Base
+from app.core.database import Base, TZDateTime
 
 
 class Comment(Base):
@@ -11,8 +11,13 @@ class Comment(Base):
     issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     body = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(TZDateTime, server_default=func.now())
 
     # Relationships
     issue = relationship("Issue", back_populates="comments")
     author = relationship("User")
+
+    # Keyset pagination of an issue's comments, in either direction
+    __table_args__ = (
+        Index("ix_comments_issue_created_at", "issue_id", "created_at", "id"),
+    )
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, SmallInteger, String, ForeignKey, Enum, Text, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 import enum
-from app.core.database import Base
+from app.core.database import Base, TZDateTime
 
 
 class IssueStatus(str, enum.Enum):
@@ -19,6 +19,21 @@ class IssuePriority(str, enum.Enum):
     CRITICAL = "critical"
 
 
+# Sort rank of each priority, most urgent first
+PRIORITY_RANK = {
+    IssuePriority.CRITICAL: 0,
+    IssuePriority.HIGH: 1,
+    IssuePriority.MEDIUM: 2,
+    IssuePriority.LOW: 3,
+}
+
+
+def priority_rank_default(context) -> int:
+    """Column default deriving priority_rank from the inserted priority (ORM and Core inserts)."""
+    priority = context.get_current_parameters().get("priority") or IssuePriority.MEDIUM
+    return PRIORITY_RANK[IssuePriority(priority)]
+
+
 class Issue(Base):
     __tablename__ = "issues"
 
@@ -28,13 +43,56 @@ class Issue(Base):
     description = Column(Text)
     status = Column(Enum(IssueStatus), nullable=False, default=IssueStatus.OPEN)
     priority = Column(Enum(IssuePriority), nullable=False, default=IssuePriority.MEDIUM)
+    # Stored ordinal of priority so priority sorting is an index scan
+    priority_rank = Column(SmallInteger, nullable=False, default=priority_rank_default)
     reporter_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    created_at = Column(TZDateTime, server_default=func.now())
+    updated_at = Column(TZDateTime, server_default=func.now(), onupdate=func.now())
+    # Change counters behind the issue and comment list ETags (see app.models.versions)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Project issues_version at the issue's last change, for incremental sync
+    change_seq = Column(Integer, nullable=False, default=0, server_default="0")
+    # Maintained with the comment counters in app.models.versions; last_activity_at
+    # is the latest change to the issue or its comments
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_activity_at = Column(TZDateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
     project = relationship("Project", back_populates="issues")
     reporter = relationship("User", foreign_keys=[reporter_id])
     assignee = relationship("User", foreign_keys=[assignee_id])
     comments = relationship("Comment", back_populates="issue")
+
+    # Keyset pagination indexes: one per supported sort key of list_issues
+    __table_args__ = (
+        Index("ix_issues_project_created_at", "project_id", "created_at", "id"),
+        Index("ix_issues_project_updated_at", "project_id", "updated_at", "id"),
+        Index("ix_issues_project_status", "project_id", "status", "id"),
+        Index("ix_issues_project_priority_rank", "project_id", "priority_rank", "id"),
+        Index("ix_issues_project_change_seq", "project_id", "change_seq", "id"),
+        Index("ix_issues_project_comment_count", "project_id", "comment_count", "id"),
+        Index("ix_issues_project_last_activity_at", "project_id", "last_activity_at", "id"),
+    )
+
+    @validates("priority")
+    def _sync_priority_rank(self, key, priority):
+        self.priority_rank = PRIORITY_RANK[IssuePriority(priority)]
+        return priority
+
+
+class IssueTombstone(Base):
+    """Deletion log, so incremental sync can report issues that no longer exist."""
+    __tablename__ = "issue_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    # Not a foreign key: the issue is gone
+    issue_id = Column(Integer, nullable=False)
+    change_seq = Column(Integer, nullable=False)
+    deleted_at = Column(TZDateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_issue_tombstones_project_change_seq", "project_id", "change_seq", "id"),
+    )
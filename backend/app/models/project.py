@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
-from app.core.database import Base
+from app.core.database import Base, TZDateTime
 
 
 class ProjectRole(str, enum.Enum):
@@ -18,7 +18,9 @@ class Project(Base):
     key = Column(String, unique=True, index=True, nullable=False)
     description = Column(String)
     start_date = Column(Date, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(TZDateTime, server_default=func.now())
+    # Bumped whenever an issue or comment in the project changes (issue list ETags)
+    issues_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     members = relationship("ProjectMember", back_populates="project")
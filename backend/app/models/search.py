@@ -0,0 +1,130 @@
+"""
+Full-text search indexes for issues and comments.
+
+SQLite uses external-content FTS5 tables kept in sync by triggers; PostgreSQL
+uses generated tsvector columns with GIN indexes. Both are attached to the base
+tables' create/drop events so create_all builds the same schema as the migrations.
+"""
+from sqlalchemy import DDL, event
+from app.models.issue import Issue
+from app.models.comment import Comment
+
+SEARCH_LANGUAGE = "english"
+
+# Created by the DDL below rather than declared on the models
+FTS_TABLES = ("issues_fts", "comments_fts")
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_VECTOR_INDEXES = ("ix_issues_search_vector", "ix_comments_search_vector")
+
+SQLITE_ISSUE_INSERT_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_ai AFTER INSERT ON issues BEGIN "
+    "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END"
+)
+
+SQLITE_COMMENT_INSERT_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS comments_fts_ai AFTER INSERT ON comments BEGIN "
+    "INSERT INTO comments_fts(rowid, body) VALUES (new.id, new.body); "
+    "END"
+)
+
+SQLITE_ISSUE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5("
+    "title, description, content='issues', content_rowid='id', "
+    "tokenize='porter unicode61', prefix='2 3')",
+    SQLITE_ISSUE_INSERT_TRIGGER,
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_ad AFTER DELETE ON issues BEGIN "
+    "INSERT INTO issues_fts(issues_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS issues_fts_au AFTER UPDATE OF title, description ON issues BEGIN "
+    "INSERT INTO issues_fts(issues_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO issues_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+]
+
+SQLITE_COMMENT_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5("
+    "body, content='comments', content_rowid='id', "
+    "tokenize='porter unicode61', prefix='2 3')",
+    SQLITE_COMMENT_INSERT_TRIGGER,
+    "CREATE TRIGGER IF NOT EXISTS comments_fts_ad AFTER DELETE ON comments BEGIN "
+    "INSERT INTO comments_fts(comments_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS comments_fts_au AFTER UPDATE OF body ON comments BEGIN "
+    "INSERT INTO comments_fts(comments_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+    "INSERT INTO comments_fts(rowid, body) VALUES (new.id, new.body); "
+    "END",
+]
+
+POSTGRES_ISSUE_INDEX = "CREATE INDEX IF NOT EXISTS ix_issues_search_vector ON issues USING GIN (search_vector)"
+
+POSTGRES_COMMENT_INDEX = "CREATE INDEX IF NOT EXISTS ix_comments_search_vector ON comments USING GIN (search_vector)"
+
+POSTGRES_ISSUE_DDL = [
+    "ALTER TABLE issues ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(description, '')), 'B')) STORED",
+    POSTGRES_ISSUE_INDEX,
+]
+
+POSTGRES_COMMENT_DDL = [
+    "ALTER TABLE comments ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    f"to_tsvector('{SEARCH_LANGUAGE}', body)) STORED",
+    POSTGRES_COMMENT_INDEX,
+]
+
+
+def _attach(table, dialect: str, create_statements, drop_statements=()):
+    for statement in create_statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect=dialect))
+    for statement in drop_statements:
+        event.listen(table, "before_drop", DDL(statement).execute_if(dialect=dialect))
+
+
+# Triggers go away with their table; the FTS5 tables have to be dropped explicitly
+_attach(Issue.__table__, "sqlite", SQLITE_ISSUE_DDL, ["DROP TABLE IF EXISTS issues_fts"])
+_attach(Comment.__table__, "sqlite", SQLITE_COMMENT_DDL, ["DROP TABLE IF EXISTS comments_fts"])
+_attach(Issue.__table__, "postgresql", POSTGRES_ISSUE_DDL)
+_attach(Comment.__table__, "postgresql", POSTGRES_COMMENT_DDL)
+
+
+def is_search_object(name: str, type_: str) -> bool:
+    """
+    True for a schema object of the search indexes: an FTS5 table or one of
+    its shadow tables (issues_fts_data, ...), a tsvector column or its index.
+    Alembic's autogenerate skips these, as the models do not declare them.
+    """
+    if type_ == "table":
+        return any(name == table or name.startswith(f"{table}_") for table in FTS_TABLES)
+    if type_ == "column":
+        return name == SEARCH_VECTOR_COLUMN
+    if type_ == "index":
+        return name in SEARCH_VECTOR_INDEXES
+    return False
+
+
+def suspend_search_indexing(connection) -> None:
+    """
+    Stop indexing inserted issues and comments, for bulk loads; call
+    resume_search_indexing afterwards to index everything at once.
+    """
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TRIGGER IF EXISTS issues_fts_ai")
+        connection.exec_driver_sql("DROP TRIGGER IF EXISTS comments_fts_ai")
+    elif connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("DROP INDEX IF EXISTS ix_issues_search_vector")
+        connection.exec_driver_sql("DROP INDEX IF EXISTS ix_comments_search_vector")
+
+
+def resume_search_indexing(connection) -> None:
+    """Rebuild the search indexes from the base tables and resume indexing inserts."""
+    if connection.dialect.name == "sqlite":
+        for fts_table in ("issues_fts", "comments_fts"):
+            connection.exec_driver_sql(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        connection.exec_driver_sql(SQLITE_ISSUE_INSERT_TRIGGER)
+        connection.exec_driver_sql(SQLITE_COMMENT_INSERT_TRIGGER)
+    elif connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(POSTGRES_ISSUE_INDEX)
+        connection.exec_driver_sql(POSTGRES_COMMENT_INDEX)
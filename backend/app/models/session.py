@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base, TZDateTime
+
+
+class UserSession(Base):
+    """
+    A signed-in device: one per login, kept alive by its rotating refresh token.
+
+    Only SHA-256 digests of refresh tokens are stored. previous_token_hash is
+    the token the current one replaced; presenting it again means the token
+    was copied, and revokes the session.
+    """
+    __tablename__ = "sessions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    previous_token_hash = Column(String(64), index=True)
+    created_at = Column(TZDateTime, server_default=func.now())
+    last_used_at = Column(TZDateTime)
+    expires_at = Column(TZDateTime, nullable=False)
+    revoked_at = Column(TZDateTime)
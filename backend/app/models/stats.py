@@ -0,0 +1,115 @@
+"""
+Per-project issue counters by status, priority and assignee.
+
+Counters are adjusted in the same transaction as the issue change: flushes of
+Issue objects through maintain_issue_stats, which the versions flush hook calls
+once the project row is bumped, and statements that bypass the unit of work
+(the bulk issue endpoints) through apply_stat_deltas. Either way the project
+row is locked before its counter rows, the order rebuild_project_stats takes
+them in too, so concurrent writers cannot deadlock on them. The
+rebuild_stats.py script recomputes them from the issues table if they drift.
+"""
+from collections import Counter
+from typing import Optional
+from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+from app.core.database import Base
+from app.models.issue import Issue, IssuePriority, IssueStatus
+
+# Stat dimensions, each named after the Issue attribute it counts
+STAT_DIMENSIONS = ("status", "priority", "assignee_id")
+
+
+class ProjectIssueStat(Base):
+    __tablename__ = "project_issue_stats"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    dimension = Column(String, primary_key=True)
+    # Enum value, assignee id, or "" for unassigned
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+def stat_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (IssueStatus, IssuePriority)):
+        return value.value
+    return str(value)
+
+
+def issue_stat_deltas(
+    project_id: int,
+    before: Optional[dict] = None,
+    after: Optional[dict] = None,
+) -> Counter:
+    """
+    Counter changes, keyed by (project_id, dimension, value), for one issue
+    going from before to after.
+
+    before and after are dicts of the STAT_DIMENSIONS attributes, or None when
+    the issue did not exist before (create) or does not exist after (delete).
+    Combine deltas with Counter.update, which unlike + keeps negative changes.
+    """
+    deltas = Counter()
+    for dimension in STAT_DIMENSIONS:
+        if before is not None:
+            deltas[(project_id, dimension, stat_value(before[dimension]))] -= 1
+        if after is not None:
+            deltas[(project_id, dimension, stat_value(after[dimension]))] += 1
+    return deltas
+
+
+def apply_stat_deltas(session: Session, deltas: Counter) -> None:
+    """Add the deltas to the counters with one upsert statement."""
+    rows = [
+        {"project_id": project_id, "dimension": dimension, "value": value, "count": delta}
+        # Sorted so concurrent transactions lock counter rows in the same order
+        for (project_id, dimension, value), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+
+    connection = session.connection()
+    dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(ProjectIssueStat)
+    statement = statement.on_conflict_do_update(
+        index_elements=["project_id", "dimension", "value"],
+        set_={"count": ProjectIssueStat.count + statement.excluded["count"]}
+    )
+    connection.execute(statement, rows)
+
+
+def issue_stat_values(issue) -> dict:
+    """The STAT_DIMENSIONS attributes of an issue (or any object carrying them)."""
+    return {dimension: getattr(issue, dimension) for dimension in STAT_DIMENSIONS}
+
+
+def _values_before_flush(issue: Issue) -> dict:
+    values = issue_stat_values(issue)
+    for dimension in STAT_DIMENSIONS:
+        changes = get_history(issue, dimension)
+        if changes.deleted:
+            values[dimension] = changes.deleted[0]
+    return values
+
+
+def maintain_issue_stats(session: Session) -> None:
+    """Apply the counter changes of the Issue objects just flushed."""
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, Issue):
+            deltas.update(issue_stat_deltas(obj.project_id, after=issue_stat_values(obj)))
+    for obj in session.dirty:
+        if isinstance(obj, Issue) and any(get_history(obj, d).has_changes() for d in STAT_DIMENSIONS):
+            deltas.update(issue_stat_deltas(
+                obj.project_id, before=_values_before_flush(obj), after=issue_stat_values(obj)
+            ))
+    for obj in session.deleted:
+        if isinstance(obj, Issue):
+            deltas.update(issue_stat_deltas(obj.project_id, before=_values_before_flush(obj)))
+
+    apply_stat_deltas(session, deltas)
@@ -0,0 +1,158 @@
+"""
+Change counters behind the ETags of issue, comment and issue list reads.
+
+Every flush that writes issues or comments bumps, in the same transaction:
+
+- issues.version of each updated issue,
+- issues.comments_version of each issue whose comments changed,
+- projects.issues_version of each project whose issues or comments changed
+  (issue lists can be filtered by comment text).
+
+Issues whose comments changed also get their comment_count adjusted and,
+through its onupdate default, last_activity_at refreshed; since both are
+part of the issue representation, they count as updated issues too.
+
+Created and updated issues are also stamped with the new issues_version as
+their change_seq, and deleted issues leave an IssueTombstone with it, which
+is what GET /projects/{id}/issues/changes syncs from. Writers of a project
+serialize on its row, so change_seq values commit in increasing order.
+
+Statements that bypass the unit of work, such as the bulk issue endpoints,
+call bump_versions themselves.
+
+The flush hook also maintains the per-project issue stats, after the bump,
+so the project row is always locked before its counter rows.
+"""
+from collections import Counter
+from typing import Iterable, Mapping, Optional, Tuple
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+from app.models.project import Project
+from app.models.issue import Issue, IssueTombstone
+from app.models.comment import Comment
+from app.models.stats import maintain_issue_stats
+
+
+def bump_versions(
+    session: Session,
+    project_ids: Iterable[int] = (),
+    updated_issue_ids: Iterable[int] = (),
+    comment_issue_ids: Iterable[int] = (),
+    changed_issue_ids: Iterable[int] = (),
+    deleted_issues: Iterable[Tuple[int, int]] = (),
+    comment_count_deltas: Optional[Mapping[int, int]] = None,
+) -> None:
+    """
+    Bump the counters after a change to the given projects.
+
+    updated_issue_ids are issues updated by statements outside the unit of
+    work (ORM updates bump their own version), changed_issue_ids every created
+    or updated issue, deleted_issues (issue_id, project_id) pairs, and
+    comment_count_deltas the change in comment count of each issue in
+    comment_issue_ids whose comments were added or removed.
+    """
+    comment_count_deltas = comment_count_deltas or {}
+    connection = session.connection()
+    project_ids = set(project_ids) | {project_id for _, project_id in deleted_issues}
+    comment_issue_ids = set(comment_issue_ids) | set(comment_count_deltas)
+    updated_issue_ids = set(updated_issue_ids) | comment_issue_ids
+    changed_issue_ids = set(changed_issue_ids) | updated_issue_ids
+
+    # updated_at is assigned to itself so the onupdate default does not fire
+    if updated_issue_ids:
+        connection.execute(
+            update(Issue).where(Issue.id.in_(updated_issue_ids))
+            .values(version=Issue.version + 1, updated_at=Issue.updated_at)
+        )
+    if comment_issue_ids:
+        # One statement per distinct delta; almost always just +1
+        issue_ids_by_delta = {}
+        for issue_id in comment_issue_ids:
+            issue_ids_by_delta.setdefault(comment_count_deltas.get(issue_id, 0), []).append(issue_id)
+        for delta, issue_ids in sorted(issue_ids_by_delta.items()):
+            connection.execute(
+                update(Issue).where(Issue.id.in_(issue_ids))
+                .values(
+                    comments_version=Issue.comments_version + 1,
+                    comment_count=Issue.comment_count + delta,
+                    updated_at=Issue.updated_at
+                )
+            )
+
+    project_filter = Project.id.in_(project_ids)
+    if comment_issue_ids:
+        project_filter = project_filter | Project.id.in_(
+            select(Issue.project_id).where(Issue.id.in_(comment_issue_ids))
+        )
+    if project_ids or comment_issue_ids:
+        connection.execute(
+            update(Project).where(project_filter).values(issues_version=Project.issues_version + 1)
+        )
+
+    # Stamp changes and deletions with the version just written
+    project_version = select(Project.issues_version).where(Project.id == Issue.project_id).scalar_subquery()
+    if changed_issue_ids:
+        connection.execute(
+            update(Issue).where(Issue.id.in_(changed_issue_ids))
+            .values(change_seq=project_version, updated_at=Issue.updated_at)
+        )
+    if deleted_issues:
+        versions = dict(connection.execute(
+            select(Project.id, Project.issues_version).where(Project.id.in_({p for _, p in deleted_issues}))
+        ).all())
+        connection.execute(insert(IssueTombstone), [
+            {"issue_id": issue_id, "project_id": project_id, "change_seq": versions[project_id]}
+            for issue_id, project_id in deleted_issues
+        ])
+
+
+def _changed(session: Session, obj) -> bool:
+    # session.dirty also holds objects whose only change is to a relationship collection
+    return obj not in session.dirty or session.is_modified(obj, include_collections=False)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_issue_versions(session, flush_context, instances):
+    # Folded into the issue's own UPDATE statement
+    for obj in session.dirty:
+        if isinstance(obj, Issue) and _changed(session, obj):
+            obj.version = Issue.version + 1
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_list_versions(session, flush_context):
+    project_ids = set()
+    comment_issue_ids = set()
+    comment_count_deltas = Counter()
+    changed_issue_ids = set()
+    deleted_issues = set()
+    for obj in [*session.new, *session.dirty, *session.deleted]:
+        if isinstance(obj, Issue) and _changed(session, obj):
+            project_ids.add(obj.project_id)
+            if obj in session.deleted:
+                deleted_issues.add((obj.id, obj.project_id))
+            else:
+                changed_issue_ids.add(obj.id)
+        elif isinstance(obj, Comment) and _changed(session, obj):
+            comment_issue_ids.add(obj.issue_id)
+            if obj in session.new:
+                comment_count_deltas[obj.issue_id] += 1
+            elif obj in session.deleted:
+                comment_count_deltas[obj.issue_id] -= 1
+
+    # Comments of a deleted issue go with it
+    deleted_issue_ids = {issue_id for issue_id, _ in deleted_issues}
+    comment_issue_ids -= deleted_issue_ids
+    for issue_id in deleted_issue_ids:
+        comment_count_deltas.pop(issue_id, None)
+
+    if project_ids or comment_issue_ids:
+        bump_versions(
+            session,
+            project_ids=project_ids,
+            comment_issue_ids=comment_issue_ids,
+            changed_issue_ids=changed_issue_ids,
+            deleted_issues=deleted_issues,
+            comment_count_deltas=comment_count_deltas
+        )
+    maintain_issue_stats(session)
@@ -1,12 +1,28 @@
-from app.schemas.auth import SignupRequest, LoginRequest, TokenResponse, UserResponse
+from app.schemas.auth import SignupRequest, LoginRequest, RefreshRequest, TokenResponse, UserResponse
 from app.schemas.project import ProjectCreate, ProjectResponse, ProjectMemberAdd, ProjectMemberResponse
-from app.schemas.issue import IssueCreate, IssueUpdate, IssueResponse
-from app.schemas.comment import CommentCreate, CommentResponse
+from app.schemas.issue import (
+    IssueCreate,
+    IssueUpdate,
+    IssueResponse,
+    IssueExport,
+    IssuePage,
+    IssueChanges,
+    IssueBulkCreate,
+    IssueBulkUpdateItem,
+    IssueBulkUpdate,
+    BulkItemError,
+    IssueBulkResult,
+)
+from app.schemas.comment import CommentCreate, CommentResponse, CommentPage
+from app.schemas.search import IssueSearchResult
+from app.schemas.event import ProjectEvent
+from app.schemas.stats import AssigneeCount, ProjectStats
 from app.schemas.error import ErrorResponse, ErrorDetail
 
 __all__ = [
     "SignupRequest",
     "LoginRequest",
+    "RefreshRequest",
     "TokenResponse",
     "UserResponse",
     "ProjectCreate",
@@ -16,8 +32,21 @@ __all__ = [
     "IssueCreate",
     "IssueUpdate",
     "IssueResponse",
+    "IssueExport",
+    "IssuePage",
+    "IssueChanges",
+    "IssueBulkCreate",
+    "IssueBulkUpdateItem",
+    "IssueBulkUpdate",
+    "BulkItemError",
+    "IssueBulkResult",
     "CommentCreate",
     "CommentResponse",
+    "CommentPage",
+    "IssueSearchResult",
+    "ProjectEvent",
+    "AssigneeCount",
+    "ProjectStats",
     "ErrorResponse",
     "ErrorDetail",
 ]
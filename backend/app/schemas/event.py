@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Any, Dict
+
+
+class ProjectEvent(BaseModel):
+    """A change in a project, as sent on its event stream."""
+    # issues_version of the project after the change
+    id: int
+    project_id: int
+    # issue.created, issue.updated, issue.deleted, issues.bulk_created,
+    # issues.bulk_updated, comment.created, or reset
+    type: str
+    data: Dict[str, Any] = {}
+
+    def to_sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.model_dump_json()}\n\n"
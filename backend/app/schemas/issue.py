@@ -1,7 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.models.issue import IssueStatus, IssuePriority
+from app.schemas.comment import CommentResponse
+
+# Upper bound on the items of one bulk create or update request
+MAX_BULK_ITEMS = 5000
 
 
 class IssueCreate(BaseModel):
@@ -30,6 +34,49 @@ class IssueResponse(BaseModel):
     assignee_id: Optional[int]
     created_at: datetime
     updated_at: datetime
+    comment_count: int
+    last_activity_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class IssueExport(IssueResponse):
+    """An issue with its comments, oldest first, as written by project exports."""
+    comments: List[CommentResponse]
+
+
+class IssuePage(BaseModel):
+    items: List[IssueResponse]
+    next_cursor: Optional[str] = None
+
+
+class IssueChanges(BaseModel):
+    """Issues created or updated since a sync token, and the ids of issues deleted since."""
+    issues: List[IssueResponse]
+    deleted: List[int]
+    next_token: str
+    has_more: bool
+
+
+class IssueBulkCreate(BaseModel):
+    items: List[IssueCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class IssueBulkUpdateItem(IssueUpdate):
+    id: int
+
+
+class IssueBulkUpdate(BaseModel):
+    items: List[IssueBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+
+class IssueBulkResult(BaseModel):
+    """Issues written by a bulk request, in request order, and the items that were rejected."""
+    items: List[IssueResponse]
+    errors: List[BulkItemError]
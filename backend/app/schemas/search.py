@@ -0,0 +1,5 @@
+from app.schemas.issue import IssueResponse
+
+
+class IssueSearchResult(IssueResponse):
+    score: float
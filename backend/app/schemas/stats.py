@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from app.models.issue import IssueStatus, IssuePriority
+
+
+class AssigneeCount(BaseModel):
+    assignee_id: Optional[int]
+    count: int
+
+
+class ProjectStats(BaseModel):
+    total: int
+    status: Dict[IssueStatus, int]
+    priority: Dict[IssuePriority, int]
+    # Most assigned first; assignee_id null counts unassigned issues
+    assignee: List[AssigneeCount]
@@ -0,0 +1,93 @@
+"""
+Project authorization checks shared by the API routers.
+
+Roles are cached per (project_id, user_id). Only memberships are cached, never
+their absence, so a newly added member is recognised immediately; changes and
+removals evict the entry through the ProjectMember mapper events below, at
+flush and again after commit.
+"""
+from typing import Dict, Iterable, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.core.cache import TTLCache, evict_on_commit
+from app.core.config import get_settings
+from app.models.project import ProjectMember, ProjectRole
+
+settings = get_settings()
+
+# (project_id, user_id) -> ProjectRole
+membership_cache = TTLCache(
+    maxsize=settings.MEMBERSHIP_CACHE_MAX_SIZE,
+    ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS
+)
+
+
+def get_project_role(db: Session, project_id: int, user_id: int) -> Optional[ProjectRole]:
+    """Return the user's role in the project, or None if they are not a member."""
+    key = (project_id, user_id)
+    role = membership_cache.get(key)
+    if role is not None:
+        return role
+
+    role = db.query(ProjectMember.role).filter(
+        ProjectMember.project_id == project_id,
+        ProjectMember.user_id == user_id
+    ).scalar()
+    if role is not None:
+        membership_cache.set(key, role)
+    return role
+
+
+def get_project_roles(db: Session, project_ids: Iterable[int], user_id: int) -> Dict[int, ProjectRole]:
+    """The user's role in each of the projects they belong to, with one query for the uncached ones."""
+    roles = {}
+    missing = []
+    for project_id in set(project_ids):
+        role = membership_cache.get((project_id, user_id))
+        if role is not None:
+            roles[project_id] = role
+        else:
+            missing.append(project_id)
+
+    if missing:
+        rows = db.query(ProjectMember.project_id, ProjectMember.role).filter(
+            ProjectMember.project_id.in_(missing),
+            ProjectMember.user_id == user_id
+        ).all()
+        for project_id, role in rows:
+            membership_cache.set((project_id, user_id), role)
+            roles[project_id] = role
+    return roles
+
+
+def require_project_member(db: Session, project_id: int, user_id: int) -> ProjectRole:
+    """Return the user's role in the project, raising 403 if they are not a member."""
+    role = get_project_role(db, project_id, user_id)
+    if role is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not a member of this project"
+        )
+    return role
+
+
+def require_maintainer(db: Session, project_id: int, user_id: int, detail: str) -> None:
+    """Raise 403 with the given detail unless the user maintains the project."""
+    if get_project_role(db, project_id, user_id) != ProjectRole.MAINTAINER:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+
+
+def invalidate_membership(project_id: int, user_id: int) -> None:
+    """Drop a cached role. Call whenever a membership is changed or removed."""
+    membership_cache.pop((project_id, user_id))
+
+
+@event.listens_for(ProjectMember, "after_insert")
+@event.listens_for(ProjectMember, "after_update")
+@event.listens_for(ProjectMember, "after_delete")
+def _invalidate_membership_on_write(mapper, connection, target):
+    evict_on_commit(object_session(target), membership_cache, (target.project_id, target.user_id))
@@ -0,0 +1,266 @@
+"""
+Bulk loading of users, projects, members, issues and comments, for imports
+from other trackers and generated load-test datasets (see seed.py).
+
+Records are buffered per kind and written in batches: with COPY on
+PostgreSQL (psycopg2), as executemany INSERTs elsewhere. Buffers are flushed
+in dependency order, so a record may reference any record added before it.
+Ids of users, projects, issues and comments are loaded as given.
+
+Rows bypass the ORM, so the flush hooks behind comment counts, issue stats
+and change counters do not run. finish() instead brings every touched
+project up to date with a few set-based statements: its issue version is
+bumped and its issues restamped, so ETags and incremental sync see the
+load as one change. No events are published.
+
+With defer_indexes, secondary and full-text indexes of the member, issue
+and comment tables are dropped first and rebuilt by finish(), which is far
+cheaper than maintaining them row by row but leaves the tables unindexed
+while loading: use it on a database nothing else is using.
+
+Everything runs on the session's connection; the caller commits, or calls
+abort() on failure.
+"""
+import enum
+import io
+import time
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, Optional, Set
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+from app.models.comment import Comment
+from app.models.issue import Issue, IssuePriority, IssueStatus, PRIORITY_RANK
+from app.models.project import Project, ProjectMember, ProjectRole
+from app.models.search import resume_search_indexing, suspend_search_indexing
+from app.models.user import User
+from app.services.stats import rebuild_project_stats
+
+# Record kind -> (model, loaded columns), in dependency order
+LOAD_COLUMNS = {
+    "user": (User, ("id", "name", "email", "password_hash", "created_at")),
+    "project": (Project, ("id", "name", "key", "description", "start_date", "created_at")),
+    "member": (ProjectMember, ("project_id", "user_id", "role")),
+    "issue": (Issue, (
+        "id", "project_id", "title", "description", "status", "priority", "priority_rank",
+        "reporter_id", "assignee_id", "created_at", "updated_at",
+    )),
+    "comment": (Comment, ("id", "issue_id", "author_id", "body", "created_at")),
+}
+RECORD_KINDS = tuple(LOAD_COLUMNS)
+
+# Kinds whose tables may have their indexes deferred
+DEFERRED_INDEX_KINDS = ("member", "issue", "comment")
+
+# Projects refreshed per statement in finish()
+REFRESH_CHUNK_SIZE = 500
+
+
+def _timestamp(value, default: Optional[datetime] = None) -> Optional[datetime]:
+    if value is None:
+        return default
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    # Naive timestamps are taken as UTC, like the database's own CURRENT_TIMESTAMP
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# Fields a record of each kind must have
+REQUIRED_FIELDS = {
+    "user": ("id", "name", "email", "password_hash"),
+    "project": ("id", "name", "key"),
+    "member": ("project_id", "user_id"),
+    "issue": ("id", "project_id", "title", "reporter_id"),
+    "comment": ("id", "issue_id", "author_id", "body"),
+}
+
+
+def normalize_record(kind: str, record: dict) -> dict:
+    """The loaded columns of a record, with defaults filled in and values coerced to column types."""
+    if kind not in LOAD_COLUMNS:
+        raise ValueError(f"Unknown record type {kind!r}; expected one of {list(RECORD_KINDS)}")
+    missing = [field for field in REQUIRED_FIELDS[kind] if record.get(field) is None]
+    if missing:
+        raise ValueError(f"{kind} record is missing {', '.join(missing)}")
+
+    row = {column: record.get(column) for column in LOAD_COLUMNS[kind][1]}
+    if "created_at" in row:
+        row["created_at"] = _timestamp(row["created_at"], datetime.now(timezone.utc))
+    if kind == "project" and isinstance(row["start_date"], str):
+        row["start_date"] = date.fromisoformat(row["start_date"])
+    elif kind == "member":
+        row["role"] = ProjectRole(row["role"] or ProjectRole.MEMBER)
+    elif kind == "issue":
+        row["status"] = IssueStatus(row["status"] or IssueStatus.OPEN)
+        row["priority"] = IssuePriority(row["priority"] or IssuePriority.MEDIUM)
+        row["priority_rank"] = PRIORITY_RANK[row["priority"]]
+        row["updated_at"] = _timestamp(row["updated_at"], row["created_at"])
+    return row
+
+
+def _copy_value(value) -> str:
+    """A value in the COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy Enum columns store member names
+        return value.name
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class BulkLoader:
+    """Batches records into the database and derives what the ORM would have maintained."""
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = 10000,
+        defer_indexes: bool = False,
+        report: Optional[Callable[[str], None]] = None,
+        report_interval: float = 2.0,
+    ):
+        self.db = db
+        self.connection = db.connection()
+        self.batch_size = batch_size
+        self.counts = dict.fromkeys(RECORD_KINDS, 0)
+        self._buffers: Dict[str, List[dict]] = {kind: [] for kind in RECORD_KINDS}
+        self._project_ids: Set[int] = set()
+        self._report = report
+        self._report_interval = report_interval
+        self._started = self._reported = time.monotonic()
+
+        dialect = self.connection.dialect
+        self._use_copy = dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+        self._deferred_indexes = []
+        if defer_indexes:
+            for kind in DEFERRED_INDEX_KINDS:
+                table = LOAD_COLUMNS[kind][0].__table__
+                for index in sorted(table.indexes, key=lambda index: index.name):
+                    if not index.unique:
+                        index.drop(self.connection)
+                        self._deferred_indexes.append(index)
+            suspend_search_indexing(self.connection)
+
+    def first_free_id(self, kind: str) -> int:
+        """The id after the highest one in use, for records generated with explicit ids."""
+        model = LOAD_COLUMNS[kind][0]
+        return (self.connection.scalar(select(func.max(model.id))) or 0) + 1
+
+    def add(self, kind: str, record: dict) -> None:
+        row = normalize_record(kind, record)
+        self._buffers[kind].append(row)
+        if len(self._buffers[kind]) >= self.batch_size:
+            # Rows of earlier kinds may be referenced by this batch, so go first
+            self.flush(kind)
+
+    def flush(self, upto: Optional[str] = None) -> None:
+        """Write the buffered records of kind upto and the kinds before it (default all)."""
+        kinds = RECORD_KINDS if upto is None else RECORD_KINDS[:RECORD_KINDS.index(upto) + 1]
+        for kind in kinds:
+            rows, self._buffers[kind] = self._buffers[kind], []
+            if rows:
+                self._write(kind, rows)
+
+    def _write(self, kind: str, rows: List[dict]) -> None:
+        model, columns = LOAD_COLUMNS[kind]
+        if self._use_copy:
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write("\t".join(_copy_value(row[column]) for column in columns))
+                buffer.write("\n")
+            buffer.seek(0)
+            with self.connection.connection.dbapi_connection.cursor() as cursor:
+                cursor.copy_expert(f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN", buffer)
+        else:
+            self.connection.execute(insert(model.__table__), rows)
+
+        if kind == "project":
+            self._project_ids.update(row["id"] for row in rows)
+        elif kind in ("member", "issue"):
+            self._project_ids.update(row["project_id"] for row in rows)
+        elif kind == "comment":
+            issue_ids = {row["issue_id"] for row in rows}
+            self._project_ids.update(self.connection.scalars(
+                select(Issue.project_id).where(Issue.id.in_(issue_ids)).distinct()
+            ))
+
+        self.counts[kind] += len(rows)
+        now = time.monotonic()
+        if self._report and now - self._reported >= self._report_interval:
+            self._reported = now
+            self._report(self.progress())
+
+    def progress(self) -> str:
+        total = sum(self.counts.values())
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        kinds = ", ".join(f"{count:,} {kind}s" for kind, count in self.counts.items() if count)
+        return f"{total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s): {kinds or 'nothing yet'}"
+
+    def finish(self) -> Dict[str, int]:
+        """Write what is buffered, rebuild deferred indexes and bring touched projects up to date."""
+        self.flush()
+
+        if self._deferred_indexes:
+            self._report_step("Rebuilding indexes")
+            self._restore_indexes()
+
+        self._report_step("Updating comment counts, activity, versions and stats")
+        project_ids = sorted(self._project_ids)
+        for start in range(0, len(project_ids), REFRESH_CHUNK_SIZE):
+            chunk = project_ids[start:start + REFRESH_CHUNK_SIZE]
+            self._refresh_projects(chunk)
+            rebuild_project_stats(self.db, chunk)
+
+        if self.connection.dialect.name == "postgresql":
+            # Explicit ids do not advance the id sequences
+            for kind in ("user", "project", "issue", "comment"):
+                table = LOAD_COLUMNS[kind][0].__tablename__
+                self.connection.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), false)"
+                )
+
+        return dict(self.counts)
+
+    def abort(self) -> None:
+        """Roll back the load and put back any indexes that were dropped outside the transaction."""
+        self.db.rollback()
+        if self._deferred_indexes:
+            connection = self.db.connection()
+            for index in self._deferred_indexes:
+                index.create(connection, checkfirst=True)
+            resume_search_indexing(connection)
+            self.db.commit()
+
+    def _restore_indexes(self) -> None:
+        for index in self._deferred_indexes:
+            index.create(self.connection, checkfirst=True)
+        resume_search_indexing(self.connection)
+        self._deferred_indexes = []
+
+    def _refresh_projects(self, project_ids: List[int]) -> None:
+        self.connection.execute(
+            update(Project).where(Project.id.in_(project_ids)).values(issues_version=Project.issues_version + 1)
+        )
+        comment_count = select(func.count()).where(Comment.issue_id == Issue.id).scalar_subquery()
+        newest_comment = select(func.max(Comment.created_at)).where(
+            Comment.issue_id == Issue.id, Comment.created_at > Issue.updated_at
+        ).scalar_subquery()
+        project_version = select(Project.issues_version).where(Project.id == Issue.project_id).scalar_subquery()
+        # updated_at is assigned to itself so the onupdate default does not fire
+        self.connection.execute(
+            update(Issue).where(Issue.project_id.in_(project_ids)).values(
+                comment_count=comment_count,
+                last_activity_at=func.coalesce(newest_comment, Issue.updated_at, Issue.created_at),
+                version=Issue.version + 1,
+                comments_version=Issue.comments_version + 1,
+                change_seq=project_version,
+                updated_at=Issue.updated_at
+            )
+        )
+
+    def _report_step(self, message: str) -> None:
+        if self._report:
+            self._report(message)
@@ -0,0 +1,266 @@
+"""
+Project change feed behind GET /projects/{id}/events.
+
+Handlers call publish_event for each issue and comment change after flushing
+and before committing. The configured backend hands committed events to the
+broadcaster of every API process, which fans them out to the streams
+subscribed to the project and keeps a ring buffer of recent events per
+project so reconnecting clients can resume from Last-Event-ID.
+
+Backends (EVENTS_BACKEND):
+
+- "local": events are dispatched to this process's broadcaster when the
+  session commits. Only clients connected to the same process see them, which
+  suits a single worker and the tests.
+- "postgres": events are sent with pg_notify inside the transaction, so
+  PostgreSQL delivers them on commit, in commit order, to a LISTEN connection
+  in every worker.
+
+Event ids are the project's issues_version after the change. They increase
+with every change to the project, whichever worker made it.
+"""
+import asyncio
+import json
+import select as select_module
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.core.database import engine
+from app.models.project import Project
+from app.schemas.event import ProjectEvent
+
+settings = get_settings()
+
+PENDING_EVENTS_KEY = "pending_project_events"
+
+
+def reset_event(project_id: int, version: int) -> ProjectEvent:
+    """Tells a client it may have missed events and should refetch what it shows."""
+    return ProjectEvent(id=version, project_id=project_id, type="reset")
+
+
+class Subscription:
+    """One open event stream; created and consumed on the event loop serving it."""
+
+    def __init__(self, project_id: int, maxsize: int):
+        self.project_id = project_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.loop = asyncio.get_running_loop()
+
+    def deliver(self, event: ProjectEvent) -> None:
+        # Runs on self.loop. A client too slow to keep up gets a reset instead
+        # of an unbounded backlog.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(reset_event(event.project_id, event.id))
+
+
+class EventBroadcaster:
+    """Fans events out to subscriptions and remembers recent events per project."""
+
+    def __init__(self, buffer_size: int):
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._buffers: Dict[int, Deque[ProjectEvent]] = {}
+        # Highest event id that is no longer (or never was) in the buffer
+        self._floors: Dict[int, int] = {}
+
+    def subscribe(self, project_id: int) -> Subscription:
+        subscription = Subscription(project_id, maxsize=self.buffer_size)
+        with self._lock:
+            self._subscriptions.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.project_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.project_id, None)
+
+    def dispatch(self, event: ProjectEvent) -> None:
+        """Buffer an event and deliver it to the project's subscriptions. Safe from any thread."""
+        with self._lock:
+            buffer = self._buffers.get(event.project_id)
+            if buffer is None:
+                buffer = self._buffers[event.project_id] = deque(maxlen=self.buffer_size)
+                self._floors[event.project_id] = event.id - 1
+            elif len(buffer) == buffer.maxlen:
+                self._floors[event.project_id] = buffer[0].id
+            buffer.append(event)
+            subscriptions = list(self._subscriptions.get(event.project_id, ()))
+
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+
+    def replay(self, project_id: int, last_event_id: int) -> Optional[List[ProjectEvent]]:
+        """Buffered events after last_event_id, or None if some of them may be missing."""
+        with self._lock:
+            buffer = self._buffers.get(project_id)
+            if buffer is None or last_event_id < self._floors[project_id]:
+                return None
+            return [event for event in buffer if event.id > last_event_id]
+
+    def reset(self) -> None:
+        """Forget buffered events and tell every open stream to refetch."""
+        with self._lock:
+            last_ids = {project_id: buffer[-1].id for project_id, buffer in self._buffers.items() if buffer}
+            self._buffers.clear()
+            self._floors.clear()
+            subscriptions = [s for project in self._subscriptions.values() for s in project]
+
+        for subscription in subscriptions:
+            event = reset_event(subscription.project_id, last_ids.get(subscription.project_id, 0))
+            subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+
+
+broadcaster = EventBroadcaster(buffer_size=settings.EVENTS_BUFFER_SIZE)
+
+
+class LocalEventBackend:
+    """Dispatches events to this process's broadcaster when the session commits."""
+
+    def publish(self, session: Session, event: ProjectEvent) -> None:
+        session.info.setdefault(PENDING_EVENTS_KEY, []).append(event)
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_pending_events(session):
+    for pending in session.info.pop(PENDING_EVENTS_KEY, []):
+        broadcaster.dispatch(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_events(session):
+    session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+class PostgresEventBackend:
+    """Publishes with pg_notify and dispatches what a LISTEN connection receives."""
+
+    CHANNEL = "issuehub_project_events"
+    # NOTIFY payloads must stay under 8000 bytes
+    MAX_PAYLOAD_BYTES = 7900
+
+    def __init__(self):
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, session: Session, event: ProjectEvent) -> None:
+        payload = event.model_dump_json()
+        if len(payload.encode("utf-8")) > self.MAX_PAYLOAD_BYTES:
+            # Too large to notify: send the ids and let clients fetch the rest
+            data = {key: event.data[key] for key in ("id", "issue_id", "ids") if key in event.data}
+            payload = event.model_copy(update={"data": data}).model_dump_json()
+        session.execute(select(func.pg_notify(self.CHANNEL, payload)))
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen, name="project-events-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                # A dedicated connection, detached so it does not count against the pool
+                connection = engine.raw_connection()
+                connection.detach()
+                dbapi_connection = connection.dbapi_connection
+                dbapi_connection.autocommit = True
+                try:
+                    dbapi_connection.cursor().execute(f"LISTEN {self.CHANNEL}")
+                    while not self._stopped.is_set():
+                        if select_module.select([dbapi_connection], [], [], 1.0)[0]:
+                            dbapi_connection.poll()
+                            while dbapi_connection.notifies:
+                                notify = dbapi_connection.notifies.pop(0)
+                                broadcaster.dispatch(ProjectEvent.model_validate(json.loads(notify.payload)))
+                finally:
+                    dbapi_connection.close()
+            except Exception:
+                if self._stopped.wait(1.0):
+                    break
+                # Events sent while disconnected are lost; make streams refetch
+                broadcaster.reset()
+
+
+@lru_cache()
+def get_event_backend():
+    backends = {"local": LocalEventBackend, "postgres": PostgresEventBackend}
+    if settings.EVENTS_BACKEND not in backends:
+        raise ValueError(f"Unknown EVENTS_BACKEND {settings.EVENTS_BACKEND!r}; expected one of {sorted(backends)}")
+    return backends[settings.EVENTS_BACKEND]()
+
+
+def get_issues_version(db: Session, project_id: int) -> int:
+    return db.query(Project.issues_version).filter(Project.id == project_id).scalar() or 0
+
+
+def publish_event(db: Session, project_id: int, event_type: str, data: dict) -> None:
+    """
+    Publish a project event for changes already flushed in this transaction.
+
+    Call after db.flush() and before db.commit(); nothing is delivered if the
+    transaction rolls back.
+    """
+    event = ProjectEvent(
+        id=get_issues_version(db, project_id),
+        project_id=project_id,
+        type=event_type,
+        data=data
+    )
+    get_event_backend().publish(db, event)
+
+
+def resume_events(project_id: int, last_event_id: Optional[int], current_version: int) -> List[ProjectEvent]:
+    """What a stream reconnecting with Last-Event-ID must be sent before live events."""
+    if last_event_id is None:
+        return []
+    events = broadcaster.replay(project_id, last_event_id)
+    if events is not None:
+        return events
+    if last_event_id == current_version:
+        return []
+    return [reset_event(project_id, current_version)]
+
+
+async def stream_events(subscription: Subscription, backlog: List[ProjectEvent]) -> AsyncIterator[str]:
+    """Server-sent events: the backlog, then live events, with keepalive comments in between."""
+    try:
+        replayed = 0
+        for event in backlog:
+            replayed = max(replayed, event.id)
+            yield event.to_sse()
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            # Events dispatched between subscribing and taking the backlog arrive twice
+            if event.id <= replayed and event.type != "reset":
+                continue
+            yield event.to_sse()
+    finally:
+        broadcaster.unsubscribe(subscription)
@@ -0,0 +1,105 @@
+"""
+Streaming export of a project's issues, each with its comments embedded.
+
+Issues and comments are read through two server-side cursors (yield_per),
+both in issue id order, and merged as they go. Memory use is bounded by the
+batch size and the longest comment thread rather than by the project, so
+whole projects can be exported from a worker or from export_project.py.
+"""
+import csv
+import io
+import json
+import zlib
+from itertools import groupby
+from operator import attrgetter
+from typing import Iterable, Iterator
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.issue import Issue
+from app.models.comment import Comment
+from app.schemas.comment import CommentResponse
+from app.schemas.issue import IssueExport, IssueResponse
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Rows fetched per round trip from each cursor
+EXPORT_BATCH_SIZE = 500
+
+# Output is written in chunks of about this many characters
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# CSV columns: the issue fields, then its comments as a JSON array
+CSV_COLUMNS = [*IssueResponse.model_fields, "comments"]
+
+
+def export_issues(db: Session, project_id: int) -> Iterator[IssueExport]:
+    """The project's issues in id order, each with its comments oldest first."""
+    issues = db.execute(
+        select(Issue).where(Issue.project_id == project_id).order_by(Issue.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    ).scalars()
+    comments = db.execute(
+        select(Comment).join(Issue, Comment.issue_id == Issue.id).where(Issue.project_id == project_id)
+        .order_by(Comment.issue_id, Comment.created_at, Comment.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    ).scalars()
+
+    threads = groupby(comments, key=attrgetter("issue_id"))
+    thread = next(threads, None)
+    for issue in issues:
+        # Comments of issues created after the issue cursor opened have no issue here
+        while thread is not None and thread[0] < issue.id:
+            thread = next(threads, None)
+        issue_comments = []
+        if thread is not None and thread[0] == issue.id:
+            issue_comments = [CommentResponse.model_validate(comment) for comment in thread[1]]
+            thread = next(threads, None)
+        yield IssueExport(**IssueResponse.model_validate(issue).model_dump(), comments=issue_comments)
+
+
+def _lines(issues: Iterable[IssueExport], export_format: str) -> Iterator[str]:
+    if export_format == "ndjson":
+        for issue in issues:
+            yield issue.model_dump_json() + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for issue in issues:
+        row = issue.model_dump(mode="json")
+        row["comments"] = json.dumps(row["comments"], separators=(",", ":"))
+        writer.writerow([row[column] for column in CSV_COLUMNS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _chunks(lines: Iterable[str]) -> Iterator[bytes]:
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a byte stream into a gzip stream as it is produced."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_project(db: Session, project_id: int, export_format: str, gzip: bool = False) -> Iterator[bytes]:
+    """The project's issues and comments as NDJSON (one issue per line) or CSV, optionally gzipped."""
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unknown export format {export_format!r}; expected one of {sorted(EXPORT_MEDIA_TYPES)}")
+    chunks = _chunks(_lines(export_issues(db, project_id), export_format))
+    return gzip_chunks(chunks) if gzip else chunks
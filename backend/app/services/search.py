@@ -0,0 +1,133 @@
+"""
+Full-text search over issue titles, descriptions and comment bodies.
+
+Queries are tokenized into words and every word is matched as a prefix, so
+"log err" finds "login errors". Issues matching in their own text rank above
+issues that only match through a comment.
+"""
+import re
+from typing import List, Tuple
+from sqlalchemy import Integer, false, or_, select, text
+from sqlalchemy.orm import Session
+from app.models.issue import Issue
+from app.models.search import SEARCH_LANGUAGE
+
+MAX_TERMS = 16
+
+# Comment hits count for less than hits in the issue itself
+COMMENT_WEIGHT = 0.5
+
+SQLITE_SEARCH = text(f"""
+    SELECT hits.issue_id, MAX(hits.score) AS score
+    FROM (
+        SELECT issues_fts.rowid AS issue_id, -bm25(issues_fts, 10.0, 1.0) AS score
+        FROM issues_fts WHERE issues_fts MATCH :query
+        UNION ALL
+        SELECT comments.issue_id, -bm25(comments_fts) * {COMMENT_WEIGHT}
+        FROM comments_fts JOIN comments ON comments.id = comments_fts.rowid
+        WHERE comments_fts MATCH :query
+    ) AS hits
+    JOIN issues ON issues.id = hits.issue_id
+    WHERE issues.project_id = :project_id
+    GROUP BY hits.issue_id
+    ORDER BY score DESC, hits.issue_id
+    LIMIT :limit
+""")
+
+# The MATCH subqueries drive the plan; the unary + keeps SQLite from starting
+# at a project_id index instead and probing the FTS index once per project issue
+SQLITE_MATCHING_IDS = text("""
+    SELECT issues.id AS issue_id FROM issues
+    WHERE issues.id IN (SELECT rowid FROM issues_fts WHERE issues_fts MATCH :query)
+      AND +issues.project_id = :project_id
+    UNION
+    SELECT comments.issue_id FROM comments JOIN issues ON issues.id = comments.issue_id
+    WHERE comments.id IN (SELECT rowid FROM comments_fts WHERE comments_fts MATCH :query)
+      AND +issues.project_id = :project_id
+""")
+
+POSTGRES_SEARCH = text(f"""
+    SELECT hits.issue_id, MAX(hits.score) AS score
+    FROM (
+        SELECT issues.id AS issue_id, ts_rank_cd(issues.search_vector, query) AS score
+        FROM issues, to_tsquery('{SEARCH_LANGUAGE}', :query) AS query
+        WHERE issues.project_id = :project_id AND issues.search_vector @@ query
+        UNION ALL
+        SELECT comments.issue_id, ts_rank_cd(comments.search_vector, query) * {COMMENT_WEIGHT}
+        FROM comments JOIN issues ON issues.id = comments.issue_id,
+             to_tsquery('{SEARCH_LANGUAGE}', :query) AS query
+        WHERE issues.project_id = :project_id AND comments.search_vector @@ query
+    ) AS hits
+    GROUP BY hits.issue_id
+    ORDER BY score DESC, hits.issue_id
+    LIMIT :limit
+""")
+
+POSTGRES_MATCHING_IDS = text(f"""
+    SELECT id AS issue_id FROM issues
+    WHERE project_id = :project_id AND search_vector @@ to_tsquery('{SEARCH_LANGUAGE}', :query)
+    UNION
+    SELECT comments.issue_id FROM comments JOIN issues ON issues.id = comments.issue_id
+    WHERE issues.project_id = :project_id
+      AND comments.search_vector @@ to_tsquery('{SEARCH_LANGUAGE}', :query)
+""")
+
+
+def _terms(q: str) -> List[str]:
+    return re.findall(r"\w+", q.lower())[:MAX_TERMS]
+
+
+def _build_query(dialect: str, terms: List[str]) -> str:
+    """Turn words into an all-terms-required prefix query for the backend."""
+    if dialect == "sqlite":
+        return " ".join(f'"{term}"*' for term in terms)
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def search_issues(db: Session, project_id: int, q: str, limit: int) -> List[Tuple[int, float]]:
+    """Return (issue_id, score) pairs for a project, best matches first."""
+    terms = _terms(q)
+    if not terms:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        statement = SQLITE_SEARCH
+    elif dialect == "postgresql":
+        statement = POSTGRES_SEARCH
+    else:
+        # No full-text index: fall back to substring matching without ranking
+        rows = db.execute(
+            select(Issue.id).where(
+                Issue.project_id == project_id,
+                *[or_(Issue.title.ilike(f"%{term}%"), Issue.description.ilike(f"%{term}%")) for term in terms]
+            ).order_by(Issue.id.desc()).limit(limit)
+        )
+        return [(issue_id, 0.0) for (issue_id,) in rows]
+
+    rows = db.execute(statement, {
+        "query": _build_query(dialect, terms),
+        "project_id": project_id,
+        "limit": limit,
+    })
+    return [(issue_id, float(score)) for issue_id, score in rows]
+
+
+def matching_issue_filter(db: Session, project_id: int, q: str):
+    """Filter clause restricting an Issue query to full-text matches of q in the project."""
+    terms = _terms(q)
+    if not terms:
+        return false()
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        statement = SQLITE_MATCHING_IDS
+    elif dialect == "postgresql":
+        statement = POSTGRES_MATCHING_IDS
+    else:
+        return Issue.title.ilike(f"%{q}%")
+
+    matching_ids = statement.bindparams(
+        query=_build_query(dialect, terms), project_id=project_id
+    ).columns(issue_id=Integer)
+    return Issue.id.in_(matching_ids)
@@ -0,0 +1,97 @@
+"""
+Server-side sessions behind rotating refresh tokens.
+
+Logging in checks the password once and opens a session; after that the
+client trades its refresh token for a new access token (and a new refresh
+token) at /auth/refresh, which is one indexed lookup and one update rather
+than a bcrypt verification.
+
+Every refresh token is single use. A session is found by the digest of its
+current token; the token it replaced is kept in previous_token_hash, and
+presenting that one again revokes the session, since a copy of the token is
+in use elsewhere. Within REFRESH_REUSE_GRACE_SECONDS of the refresh that
+replaced it, it is only refused: two tabs of one browser refreshing with the
+same token at once look the same. Sessions end on logout or after
+REFRESH_TOKEN_EXPIRE_DAYS without a refresh.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.core.security import create_refresh_token, hash_refresh_token
+from app.models.session import UserSession
+
+settings = get_settings()
+
+
+def _expiry(now: datetime) -> datetime:
+    return now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+def start_session(db: Session, user_id: int) -> str:
+    """Open a session for a user who just signed in and return its refresh token."""
+    now = datetime.now(timezone.utc)
+    # Drop the user's ended sessions while here, so the table only holds live ones
+    db.query(UserSession).filter(
+        UserSession.user_id == user_id,
+        or_(UserSession.expires_at <= now, UserSession.revoked_at.isnot(None))
+    ).delete(synchronize_session="fetch")
+
+    refresh_token = create_refresh_token()
+    db.add(UserSession(
+        user_id=user_id,
+        token_hash=hash_refresh_token(refresh_token),
+        last_used_at=now,
+        expires_at=_expiry(now),
+    ))
+    db.commit()
+    return refresh_token
+
+
+def rotate_session(db: Session, refresh_token: str) -> Optional[Tuple[int, str]]:
+    """
+    Redeem a refresh token: (user id, the session's next refresh token), or
+    None if the token is unknown, already used, revoked or expired.
+    """
+    token_hash = hash_refresh_token(refresh_token)
+    now = datetime.now(timezone.utc)
+    live = db.query(UserSession.id, UserSession.user_id).filter(
+        UserSession.token_hash == token_hash,
+        UserSession.revoked_at.is_(None),
+        UserSession.expires_at > now
+    ).first()
+    if live is None:
+        # A replaced token coming back was copied: end the session for every holder
+        db.query(UserSession).filter(
+            UserSession.previous_token_hash == token_hash,
+            UserSession.revoked_at.is_(None),
+            UserSession.last_used_at <= now - timedelta(seconds=settings.REFRESH_REUSE_GRACE_SECONDS)
+        ).update({UserSession.revoked_at: now})
+        db.commit()
+        return None
+
+    next_token = create_refresh_token()
+    # Conditional on the old digest, so of two concurrent refreshes with one token only one wins
+    rotated = db.query(UserSession).filter(
+        UserSession.id == live.id,
+        UserSession.token_hash == token_hash
+    ).update({
+        UserSession.token_hash: hash_refresh_token(next_token),
+        UserSession.previous_token_hash: token_hash,
+        UserSession.last_used_at: now,
+        UserSession.expires_at: _expiry(now),
+    })
+    db.commit()
+    if not rotated:
+        return None
+    return live.user_id, next_token
+
+
+def revoke_session(db: Session, refresh_token: str) -> None:
+    """End the session a refresh token belongs to, if it is still open."""
+    db.query(UserSession).filter(
+        UserSession.token_hash == hash_refresh_token(refresh_token),
+        UserSession.revoked_at.is_(None)
+    ).update({UserSession.revoked_at: datetime.now(timezone.utc)})
+    db.commit()
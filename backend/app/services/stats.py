@@ -0,0 +1,82 @@
+"""
+Reads and rebuilds of the per-project issue counters kept in project_issue_stats.
+"""
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.issue import Issue, IssueStatus, IssuePriority
+from app.models.project import Project
+from app.models.stats import ProjectIssueStat, STAT_DIMENSIONS, apply_stat_deltas, stat_value
+from app.schemas.stats import AssigneeCount, ProjectStats
+
+
+def get_project_stats(db: Session, project_id: int) -> ProjectStats:
+    """The project's issue counts by status, priority and assignee, from its counter rows."""
+    rows = db.query(ProjectIssueStat.dimension, ProjectIssueStat.value, ProjectIssueStat.count).filter(
+        ProjectIssueStat.project_id == project_id,
+        ProjectIssueStat.count != 0
+    ).all()
+
+    by_status = {issue_status: 0 for issue_status in IssueStatus}
+    by_priority = {priority: 0 for priority in IssuePriority}
+    by_assignee = []
+    for dimension, value, count in rows:
+        if dimension == "status":
+            by_status[IssueStatus(value)] = count
+        elif dimension == "priority":
+            by_priority[IssuePriority(value)] = count
+        elif dimension == "assignee_id":
+            by_assignee.append(AssigneeCount(assignee_id=int(value) if value else None, count=count))
+    by_assignee.sort(key=lambda item: (-item.count, item.assignee_id is None, item.assignee_id or 0))
+
+    return ProjectStats(
+        total=sum(by_status.values()),
+        status=by_status,
+        priority=by_priority,
+        assignee=by_assignee
+    )
+
+
+def count_issue_stats(db: Session, project_ids: Optional[Iterable[int]] = None) -> Dict[Tuple[int, str, str], int]:
+    """Counters computed from the issues table, keyed like issue_stat_deltas."""
+    counts = {}
+    for dimension in STAT_DIMENSIONS:
+        column = getattr(Issue, dimension)
+        query = db.query(Issue.project_id, column, func.count()).group_by(Issue.project_id, column)
+        if project_ids is not None:
+            query = query.filter(Issue.project_id.in_(project_ids))
+        for project_id, value, count in query:
+            counts[(project_id, dimension, stat_value(value))] = count
+    return counts
+
+
+def rebuild_project_stats(db: Session, project_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Correct the counters of the given projects (default all) from the issues
+    table, and return how many had drifted. The caller commits.
+    """
+    project_ids = list(project_ids) if project_ids is not None else None
+
+    # Issue writers bump the project row before touching its counters, so
+    # locking the rows keeps them out until the rebuild commits (a no-op on SQLite)
+    projects = db.query(Project.id).with_for_update()
+    if project_ids is not None:
+        projects = projects.filter(Project.id.in_(project_ids))
+    projects.all()
+
+    expected = count_issue_stats(db, project_ids)
+    stored_query = db.query(
+        ProjectIssueStat.project_id, ProjectIssueStat.dimension, ProjectIssueStat.value, ProjectIssueStat.count
+    )
+    if project_ids is not None:
+        stored_query = stored_query.filter(ProjectIssueStat.project_id.in_(project_ids))
+    stored = {(project_id, dimension, value): count for project_id, dimension, value, count in stored_query}
+
+    drift = Counter({
+        key: expected.get(key, 0) - stored.get(key, 0)
+        for key in expected.keys() | stored.keys()
+        if expected.get(key, 0) != stored.get(key, 0)
+    })
+    apply_stat_deltas(db, drift)
+    return len(drift)
@@ -0,0 +1,260 @@
+"""
+Measure latency percentiles and queries per request of the API hot paths at several dataset sizes.
+
+For each scale (number of issues), a dataset is generated with seed.py
+generate into its own database, reused by later runs, and then every
+endpoint case is requested sequentially in process: the current user, login,
+project listing, members, the issue list in each sort and with each filter,
+and the comment list of the most discussed issue. Statements are counted per
+request with an engine listener, so a change that adds a query per row shows
+up as a growing query count at larger scales.
+
+Usage:
+  python benchmarks/bench_api.py run [--scales 1000,100000,1000000] [--requests 50] [--output results.jsonl]
+  python benchmarks/bench_api.py compare baseline.jsonl results.jsonl
+
+Databases default to SQLite files in --data-dir, kept for later runs; pass
+--database-url with a {scale} placeholder, e.g.
+postgresql://localhost/issuehub_bench_{scale}, to run against PostgreSQL
+(the databases must exist). Results are printed as one
+JSON object per scale and case, and appended to --output if given.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench_login import percentile
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+ISSUES_PER_PROJECT = 20000
+
+
+def dataset_options(scale: int) -> list:
+    """seed.py generate options for a dataset of the given number of issues."""
+    return [
+        "--issues", str(scale),
+        "--comments", str(scale * 3),
+        "--projects", str(max(1, scale // ISSUES_PER_PROJECT)),
+        "--users", str(min(max(scale // 10, 50), 5000)),
+        "--members-per-project", "25",
+        "--random-seed", "1",
+    ]
+
+
+def prepare_dataset(env: dict, scale: int) -> None:
+    """Generate the dataset unless the database already holds it."""
+    check = subprocess.run(
+        [sys.executable, "-c",
+         "from sqlalchemy import func, inspect, select\n"
+         "from app.core.database import engine\n"
+         "from app.models.issue import Issue\n"
+         "with engine.connect() as c:\n"
+         "    print(c.scalar(select(func.count(Issue.id))) if inspect(c).has_table('issues') else 0)"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    existing = int(check.stdout.strip())
+    if existing == scale:
+        return
+    if existing:
+        raise SystemExit(f"{env['DATABASE_URL']} holds {existing} issues, not {scale}; use an empty database")
+    print(f"Generating {scale:,} issues into {env['DATABASE_URL']}", file=sys.stderr)
+    subprocess.run(
+        [sys.executable, "seed.py", "generate", "--defer-indexes", *dataset_options(scale)],
+        cwd=BACKEND_DIR, env=env, check=True
+    )
+
+
+def run(args) -> None:
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True
+    ).stdout.strip() or None
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    output = open(args.output, "a") if args.output else None
+    try:
+        for scale in args.scales:
+            env = dict(os.environ)
+            env["DATABASE_URL"] = args.database_url.format(scale=scale, data_dir=args.data_dir)
+            # Measure the request path, not the caches in front of it
+            env.setdefault("USER_CACHE_TTL_SECONDS", "0")
+            env.setdefault("MEMBERSHIP_CACHE_TTL_SECONDS", "0")
+            prepare_dataset(env, scale)
+
+            measured = subprocess.run(
+                [sys.executable, str(Path(__file__).resolve()), "measure", "--requests", str(args.requests)],
+                cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, text=True, check=True
+            )
+            for line in measured.stdout.splitlines():
+                result = {"commit": commit, "started_at": started_at, "scale": scale, **json.loads(line)}
+                print(json.dumps(result), flush=True)
+                if output:
+                    output.write(json.dumps(result) + "\n")
+    finally:
+        if output:
+            output.close()
+
+
+def measure(args) -> None:
+    """Drive every case against the database DATABASE_URL points at, in this process."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event, func, select
+
+    from app.api.issues import SORT_KEYS
+    from app.core.config import get_settings
+    from app.core.database import SessionLocal, engine, get_async_sessionmaker
+    from app.models.issue import Issue, IssuePriority, IssueStatus
+    from app.models.project import ProjectMember, ProjectRole
+    from app.models.user import User
+    from main import app
+    from seed import DEMO_PASSWORD
+
+    with SessionLocal() as db:
+        # The largest project, one of its maintainers, its busiest assignee and most discussed issue
+        project_id = db.scalar(
+            select(Issue.project_id).group_by(Issue.project_id).order_by(func.count().desc()).limit(1)
+        )
+        email = db.scalar(
+            select(User.email).join(ProjectMember, ProjectMember.user_id == User.id)
+            .where(ProjectMember.project_id == project_id, ProjectMember.role == ProjectRole.MAINTAINER)
+            .order_by(User.id).limit(1)
+        )
+        assignee = db.scalar(
+            select(Issue.assignee_id).where(Issue.project_id == project_id, Issue.assignee_id.is_not(None))
+            .group_by(Issue.assignee_id).order_by(func.count().desc()).limit(1)
+        )
+        issue_id = db.scalar(
+            select(Issue.id).where(Issue.project_id == project_id)
+            .order_by(Issue.comment_count.desc(), Issue.id).limit(1)
+        )
+    if project_id is None:
+        raise SystemExit("The database has no issues; generate a dataset first")
+
+    settings = get_settings()
+    statements = 0
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    if settings.DATABASE_ASYNC:
+        event.listen(get_async_sessionmaker().kw["bind"].sync_engine, "before_cursor_execute", count)
+
+    credentials = {"email": email, "password": DEMO_PASSWORD}
+    issues_path = f"/api/projects/{project_id}/issues"
+    # (endpoint, method, path, query parameters)
+    cases = [
+        ("get_current_user", "GET", "/api/auth/me", {}),
+        ("login", "POST", "/api/auth/login", {}),
+        ("list_projects", "GET", "/api/projects", {}),
+        ("get_project_members", "GET", f"/api/projects/{project_id}/members", {}),
+        *[("list_issues", "GET", issues_path, {"sort": sort}) for sort in SORT_KEYS],
+        ("list_issues", "GET", issues_path, {"status": IssueStatus.IN_PROGRESS.value}),
+        ("list_issues", "GET", issues_path, {"priority": IssuePriority.CRITICAL.value}),
+        ("list_issues", "GET", issues_path, {"assignee": assignee}),
+        # Matches every generated issue, so ranking sees the whole project
+        ("list_issues", "GET", issues_path, {"q": "reproduce"}),
+        ("list_comments", "GET", f"/api/issues/{issue_id}/comments", {"order": "asc"}),
+        ("list_comments", "GET", f"/api/issues/{issue_id}/comments", {"order": "desc"}),
+    ]
+
+    with TestClient(app) as client:
+        response = client.post("/api/auth/login", json=credentials)
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+        for endpoint, method, path, params in cases:
+            body = credentials if endpoint == "login" else None
+            latencies, queries = [], []
+            for i in range(args.warmup + args.requests):
+                statements = 0
+                started = time.perf_counter()
+                response = client.request(method, path, params=params, json=body)
+                elapsed = time.perf_counter() - started
+                response.raise_for_status()
+                if i >= args.warmup:
+                    latencies.append(elapsed)
+                    queries.append(statements)
+
+            print(json.dumps({
+                "database": engine.dialect.name,
+                "async": settings.DATABASE_ASYNC,
+                "endpoint": endpoint,
+                "params": params,
+                "requests": args.requests,
+                "p50_ms": percentile(latencies, 0.50),
+                "p95_ms": percentile(latencies, 0.95),
+                "p99_ms": percentile(latencies, 0.99),
+                "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+                "queries_per_request": round(sum(queries) / len(queries), 2),
+                "max_queries": max(queries),
+                "response_bytes": len(response.content),
+            }), flush=True)
+
+
+def case_key(result: dict) -> tuple:
+    return (result["database"], result["async"], result["scale"], result["endpoint"],
+            json.dumps(result["params"], sort_keys=True))
+
+
+def load_results(path: str) -> dict:
+    """The results of a file by case; the last run wins when a file holds several."""
+    with open(path) as f:
+        return {case_key(result): result for result in map(json.loads, filter(str.strip, f))}
+
+
+def compare(args) -> None:
+    baseline, current = load_results(args.baseline), load_results(args.results)
+    print(f"{'case':<70} {'p50 ms':>22} {'p95 ms':>22} {'queries':>12}")
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        database, is_async, scale, endpoint, params = key
+        name = f"{database}{' async' if is_async else ''} {scale} {endpoint} {params}"
+
+        def change(field):
+            old, new = before[field], after[field]
+            ratio = f"{(new - old) / old:+.0%}" if old else "n/a"
+            return f"{old:.1f} -> {new:.1f} ({ratio})"
+
+        queries = f"{before['queries_per_request']:g} -> {after['queries_per_request']:g}"
+        flag = "  MORE QUERIES" if after["queries_per_request"] > before["queries_per_request"] else ""
+        print(f"{name:<70} {change('p50_ms'):>22} {change('p95_ms'):>22} {queries:>12}{flag}")
+    for key in sorted(baseline.keys() ^ current.keys()):
+        print(f"only in {'baseline' if key in baseline else 'results'}: {key}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="generate datasets as needed and measure each scale")
+    run_parser.add_argument("--scales", type=lambda value: [int(s) for s in value.split(",")],
+                            default=[1000, 100000, 1000000], help="comma-separated issue counts")
+    run_parser.add_argument("--requests", type=int, default=50, help="measured requests per case")
+    run_parser.add_argument("--data-dir", type=Path, default=Path(tempfile.gettempdir()) / "issuehub-bench")
+    run_parser.add_argument("--database-url", default="sqlite:///{data_dir}/bench_{scale}.db",
+                            help="database URL with a {scale} placeholder")
+    run_parser.add_argument("--output", help="append results to this JSON lines file")
+
+    measure_parser = commands.add_parser("measure", help="measure the dataset DATABASE_URL points at")
+    measure_parser.add_argument("--requests", type=int, default=50)
+    measure_parser.add_argument("--warmup", type=int, default=5)
+
+    compare_parser = commands.add_parser("compare", help="compare two result files case by case")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results")
+
+    args = parser.parse_args()
+    {"run": run, "measure": measure, "compare": compare}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
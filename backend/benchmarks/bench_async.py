@@ -0,0 +1,129 @@
+"""
+Compare requests/sec of the sync (thread pool) and async (DATABASE_ASYNC) request paths.
+
+Starts uvicorn once per mode against the same database, seeds a user, a project
+and some issues through the API, then drives the issue list and issue detail
+endpoints with concurrent clients.
+
+Usage: python benchmarks/bench_async.py [--requests 2000] [--concurrency 64] [--issues 200]
+
+Set DATABASE_URL to benchmark against PostgreSQL; a temporary SQLite file is
+used otherwise. Results are printed as one JSON object per mode.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+EMAIL = "bench@example.com"
+PASSWORD = "password123"
+
+
+def start_server(port: int, env: dict) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health").raise_for_status()
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+def seed(base_url: str, issue_count: int):
+    """Create (or log back into) the benchmark user and return auth headers, project and issue ids."""
+    with httpx.Client(base_url=base_url) as client:
+        response = client.post("/api/auth/signup", json={"name": "Bench", "email": EMAIL, "password": PASSWORD})
+        if response.status_code != 201:
+            response = client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        projects = client.get("/api/projects", headers=headers).json()
+        if projects:
+            project_id = projects[0]["id"]
+        else:
+            project_id = client.post("/api/projects", json={"name": "Bench", "key": "BENCH"}, headers=headers).json()["id"]
+            for i in range(issue_count):
+                client.post(
+                    f"/api/projects/{project_id}/issues",
+                    json={"title": f"Issue {i}", "description": "x" * 200},
+                    headers=headers
+                )
+
+        issues = client.get(f"/api/projects/{project_id}/issues?limit=200", headers=headers).json()["items"]
+        return headers, project_id, [issue["id"] for issue in issues]
+
+
+async def drive(base_url: str, headers: dict, project_id: int, issue_ids: list, total: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        async def one(i: int):
+            path = f"/api/projects/{project_id}/issues" if i % 2 else f"/api/issues/{issue_ids[i % len(issue_ids)]}"
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--issues", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env.setdefault("DATABASE_URL", f"sqlite:///{tmp}/bench.db")
+        # Measure the request path, not the caches in front of it
+        env.setdefault("USER_CACHE_TTL_SECONDS", "0")
+        env.setdefault("MEMBERSHIP_CACHE_TTL_SECONDS", "0")
+
+        for mode in ("sync", "async"):
+            env["DATABASE_ASYNC"] = "true" if mode == "async" else "false"
+            server = start_server(args.port, env)
+            try:
+                base_url = f"http://127.0.0.1:{args.port}"
+                headers, project_id, issue_ids = seed(base_url, args.issues)
+                result = asyncio.run(drive(base_url, headers, project_id, issue_ids, args.requests, args.concurrency))
+                print(json.dumps({"mode": mode, **result}))
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
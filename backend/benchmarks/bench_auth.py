@@ -0,0 +1,83 @@
+"""
+Microbenchmark of the per-request authentication cost, with and without the token cache.
+
+Times decode_access_token on a fresh token for every call (each one parsed
+and its signature verified, as before the cache) and on one repeated token
+(served from the cache), then the same for the get_current_user
+dependency with the user cache warm, so the token is its only work left.
+
+Usage: python benchmarks/bench_auth.py [--iterations 20000]
+
+Results are printed as one JSON object per path.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def per_call(function, iterations: int, make_args=lambda i: ()) -> float:
+    """Microseconds per call; arguments are built before the clock starts."""
+    arguments = [make_args(i) for i in range(iterations)]
+    started = time.perf_counter()
+    for args in arguments:
+        function(*args)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def fresh_token(create_access_token, user_id: int, i: int) -> str:
+    return create_access_token({"sub": user_id}, timedelta(minutes=30, seconds=i))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tmp.name}/bench.db")
+    sys.path.insert(0, str(BACKEND_DIR))
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.deps import get_current_user
+    from app.core.security import create_access_token, decode_access_token, token_cache
+    from app.models.user import User
+
+    # Tokens minted in the same second are identical: vary them by expiry, so every decode misses the cache
+    tokens = [fresh_token(create_access_token, i % 1000 + 1, i) for i in range(args.iterations)]
+    token_cache.clear()
+    results = {"verify": per_call(decode_access_token, args.iterations, lambda i: (tokens[i],))}
+    decode_access_token(tokens[0])
+    results["cached"] = per_call(decode_access_token, args.iterations, lambda i: (tokens[0],))
+
+    # get_current_user as a route runs it, with the user cache warm, so the
+    # token is the only per-request work left
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = User(name="Bench", email="bench@example.com", password_hash="-")
+        db.add(user)
+        db.commit()
+        user_tokens = [fresh_token(create_access_token, user.id, i) for i in range(args.iterations)]
+
+        def current_user(token):
+            get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), db)
+
+        current_user(user_tokens[0])
+        token_cache.clear()
+        results["get_current_user_verify"] = per_call(current_user, args.iterations, lambda i: (user_tokens[i],))
+        results["get_current_user_cached"] = per_call(current_user, args.iterations, lambda i: (user_tokens[0],))
+
+    for path, microseconds in results.items():
+        print(json.dumps({"path": path, "us_per_call": round(microseconds, 1)}))
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Measure login throughput with bcrypt on the request thread pool and on the password hashing processes.
+
+Starts uvicorn once per PASSWORD_HASH_WORKERS setting, signs up a user, then
+sends concurrent logins while a side client keeps calling /api/auth/me, which
+shows whether the login storm starves other endpoints.
+
+Usage: python benchmarks/bench_login.py [--requests 200] [--concurrency 32] [--workers 0,2,4]
+
+Set BCRYPT_ROUNDS to benchmark another cost factor. Results are printed as one
+JSON object per setting.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+from bench_async import start_server
+
+EMAIL = "bench@example.com"
+PASSWORD = "password123"
+
+
+def percentile(latencies: list, fraction: float) -> float:
+    latencies = sorted(latencies)
+    return round(latencies[max(int(len(latencies) * fraction) - 1, 0)] * 1000, 2)
+
+
+async def drive(base_url: str, total: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        response = await client.post("/api/auth/signup", json={"name": "Bench", "email": EMAIL, "password": PASSWORD})
+        if response.status_code != 201:
+            response = await client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        login_latencies, me_latencies = [], []
+        done = asyncio.Event()
+
+        async def login():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+                login_latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        async def me():
+            while not done.is_set():
+                started = time.perf_counter()
+                response = await client.get("/api/auth/me", headers=headers)
+                me_latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+                await asyncio.sleep(0.05)
+
+        side = asyncio.create_task(me())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await side
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "logins_per_sec": round(total / elapsed, 1),
+        "login_p50_ms": percentile(login_latencies, 0.5),
+        "login_p99_ms": percentile(login_latencies, 0.99),
+        "me_p50_ms": percentile(me_latencies, 0.5),
+        "me_p99_ms": percentile(me_latencies, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", default=f"0,{os.cpu_count() or 1}",
+                        help="comma-separated PASSWORD_HASH_WORKERS values to compare")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env.setdefault("DATABASE_URL", f"sqlite:///{tmp}/bench.db")
+        env.setdefault("USER_CACHE_TTL_SECONDS", "0")
+
+        for workers in args.workers.split(","):
+            env["PASSWORD_HASH_WORKERS"] = workers
+            server = start_server(args.port, env)
+            try:
+                result = asyncio.run(drive(f"http://127.0.0.1:{args.port}", args.requests, args.concurrency))
+                print(json.dumps({"password_hash_workers": int(workers), **result}))
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
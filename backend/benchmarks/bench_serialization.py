@@ -0,0 +1,136 @@
+"""
+Compare the issue list's response_model path with the row-tuple + orjson fast path.
+
+Generates one project of issues into a temporary SQLite database (or
+DATABASE_URL), then for each page size times both halves of a list
+response: the query (ORM objects vs. column tuples) and the serialization
+(IssuePage validation and FastAPI's serialize_response + JSONResponse vs.
+row_dicts + FastJSONResponse). Both paths must produce the same bytes.
+A third path, sparse, selects only the BOARD_FIELDS a board view asks for
+with fields=.
+
+Usage: python benchmarks/bench_serialization.py [--rows 200,1000,5000,10000] [--repeat 20]
+
+Results are printed as one JSON object per page size and path.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BOARD_FIELDS = ("id", "title", "status", "priority", "assignee_id")
+
+
+def timed(function, repeat: int):
+    """Median seconds of repeat calls, and the last result."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=lambda value: [int(n) for n in value.split(",")], default=[200, 1000, 5000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tmp.name}/bench.db")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    sys.path.insert(0, str(BACKEND_DIR))
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from sqlalchemy import func, select
+
+    from app.api.issues import ISSUE_COLUMNS, ISSUE_FIELD_COLUMNS
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.responses import FastJSONResponse, row_dicts
+    from app.models.issue import Issue
+    from app.schemas.issue import IssuePage, IssueResponse
+    from app.services.bulk_load import BulkLoader
+    from seed import generate_records, load_records
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        project_id = db.scalar(
+            select(Issue.project_id).group_by(Issue.project_id).order_by(func.count().desc()).limit(1)
+        )
+        available = db.scalar(select(func.count()).where(Issue.project_id == project_id)) if project_id else 0
+        if available < max(args.rows):
+            loader = BulkLoader(db)
+            records = generate_records(loader, 10, 1, max(args.rows), 0, 10, random.Random(1))
+            load_records(records, loader, db)
+            project_id = db.scalar(select(func.max(Issue.project_id)))
+
+    field = create_response_field(name="response", type_=IssuePage, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    for rows in args.rows:
+        def query_objects():
+            with SessionLocal() as db:
+                return db.query(Issue).filter(Issue.project_id == project_id) \
+                    .order_by(Issue.created_at.desc(), Issue.id.desc()).limit(rows).all()
+
+        def query_rows():
+            with SessionLocal() as db:
+                return db.query(*ISSUE_COLUMNS).filter(Issue.project_id == project_id) \
+                    .order_by(Issue.created_at.desc(), Issue.id.desc()).limit(rows).all()
+
+        def query_board_rows():
+            with SessionLocal() as db:
+                return db.query(*(ISSUE_FIELD_COLUMNS[name] for name in BOARD_FIELDS)) \
+                    .filter(Issue.project_id == project_id) \
+                    .order_by(Issue.created_at.desc(), Issue.id.desc()).limit(rows).all()
+
+        issues = query_objects()
+        issue_rows = query_rows()
+        board_rows = query_board_rows()
+
+        def serialize_objects():
+            page = IssuePage(items=issues, next_cursor=None)
+            content = loop.run_until_complete(serialize_response(field=field, response_content=page))
+            return JSONResponse(content).body
+
+        def serialize_rows():
+            return FastJSONResponse({"items": row_dicts(issue_rows, IssueResponse.model_fields), "next_cursor": None}).body
+
+        def serialize_board_rows():
+            return FastJSONResponse({"items": row_dicts(board_rows, BOARD_FIELDS), "next_cursor": None}).body
+
+        results = {}
+        for path, query, serialize in (
+            ("response_model", query_objects, serialize_objects),
+            ("fast", query_rows, serialize_rows),
+            ("sparse", query_board_rows, serialize_board_rows),
+        ):
+            query_seconds, _ = timed(query, args.repeat)
+            serialize_seconds, body = timed(serialize, args.repeat)
+            results[path] = body
+            print(json.dumps({
+                "rows": rows,
+                "path": path,
+                "query_ms": round(query_seconds * 1000, 2),
+                "serialize_ms": round(serialize_seconds * 1000, 2),
+                "total_ms": round((query_seconds + serialize_seconds) * 1000, 2),
+                "bytes": len(body),
+            }), flush=True)
+        if results["response_model"] != results["fast"]:
+            raise SystemExit(f"The paths produced different bodies for {rows} rows")
+
+    loop.close()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Export a project's issues, with their comments embedded, as NDJSON or CSV.
+
+Usage: python export_project.py PROJECT_ID [--format ndjson|csv] [--gzip] [--output FILE]
+
+Writes to standard output unless --output is given. Rows are streamed from
+the database, so memory use stays flat however large the project is.
+"""
+
+import argparse
+import sys
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.services.export import EXPORT_MEDIA_TYPES, export_project
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("project_id", type=int)
+    parser.add_argument("--format", choices=sorted(EXPORT_MEDIA_TYPES), default="ndjson")
+    parser.add_argument("--gzip", action="store_true", help="gzip the output")
+    parser.add_argument("--output", help="file to write; standard output by default")
+    args = parser.parse_args()
+
+    db: Session = SessionLocal()
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in export_project(db, args.project_id, args.format, args.gzip):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
-from app.core.database import Base, engine
+from app.core.database import Base, engine, get_async_sessionmaker, get_pool_stats
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
-from app.api import auth, projects, issues, comments
+from app.core.metrics import RequestMetricsMiddleware, instrument_engine, instrument_routes, render_metrics
+from app.core.security import shutdown_password_hasher
+from app.services.events import get_event_backend
+from app.api import auth, projects, issues, comments, search, events, export
+from app.api.aio import asyncify_router
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -13,11 +19,22 @@ Base.metadata.create_all(bind=engine)
 # Get settings
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_event_backend().start()
+    yield
+    get_event_backend().stop()
+    # Stop the password hashing processes started by signup/login
+    shutdown_password_hasher()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="IssueHub API",
     description="A lightweight bug tracker API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -29,6 +46,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Wraps CORS (added earlier); the metrics middleware, added last, wraps both
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    encodings=[encoding.strip() for encoding in settings.COMPRESSION_ENCODINGS.split(",") if encoding.strip()],
+)
+
 
 # Global exception handlers
 @app.exception_handler(RequestValidationError)
@@ -75,9 +99,12 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 # Include routers
 app.include_router(auth.router, prefix="/api")
-app.include_router(projects.router, prefix="/api")
-app.include_router(issues.router, prefix="/api")
-app.include_router(comments.router, prefix="/api")
+for module in (projects, issues, comments, search):
+    router = asyncify_router(module.router) if settings.DATABASE_ASYNC else module.router
+    app.include_router(router, prefix="/api")
+# Not asyncified: events is async already, and export streams on a sync session of its own
+app.include_router(events.router, prefix="/api")
+app.include_router(export.router, prefix="/api")
 
 
 # Health check endpoint
@@ -86,6 +113,12 @@ def health_check():
     return {"status": "ok"}
 
 
+# Connection pool stats, for sizing DB_POOL_SIZE against the uvicorn worker count
+@app.get("/health/pool")
+def pool_stats():
+    return get_pool_stats()
+
+
 # Root endpoint
 @app.get("/")
 def root():
@@ -94,3 +127,16 @@ def root():
         "docs": "/docs",
         "health": "/health"
     }
+
+
+# Opt-in request instrumentation; the middleware goes outermost to time everything inside it
+if settings.REQUEST_METRICS:
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        return render_metrics()
+
+    instrument_engine(engine)
+    if settings.DATABASE_ASYNC:
+        instrument_engine(get_async_sessionmaker().kw["bind"].sync_engine)
+    instrument_routes(app)
+    app.add_middleware(RequestMetricsMiddleware, log_min_ms=settings.REQUEST_LOG_MIN_MS)
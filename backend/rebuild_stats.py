@@ -0,0 +1,33 @@
+"""
+Recompute the per-project issue counters behind GET /api/projects/{id}/stats
+from the issues table, correcting any drift.
+
+Usage: python rebuild_stats.py [--project ID ...]
+"""
+
+import argparse
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.services.stats import rebuild_project_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--project", type=int, action="append", dest="project_ids",
+                        help="project id to rebuild (repeatable); all projects by default")
+    args = parser.parse_args()
+
+    db: Session = SessionLocal()
+    try:
+        drifted = rebuild_project_stats(db, args.project_ids)
+        db.commit()
+        print(f"Rebuilt issue stats; corrected {drifted} drifted counter(s)")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,47 @@
 """
-Seed script to populate the database with demo data.
+Populate the database: demo data, an NDJSON import, or a generated dataset.
 
-Usage: python seed.py
+Usage:
+  python seed.py [demo]
+      Replace all data with three demo users, two projects and a few issues.
+
+  python seed.py import FILE [--default-password PASSWORD] [--batch-size N] [--defer-indexes]
+      Load records from NDJSON (FILE may be gzipped, or - for stdin), one per
+      line, each with a "type" of user, project, member, issue or comment and
+      the model's fields. Records keep their ids and must come after the
+      records they reference; issues may embed their comments in a
+      "comments" array. Users without a password_hash get the default
+      password.
+
+  python seed.py generate [--users N] [--projects N] [--issues N] [--comments N]
+                          [--members-per-project N] [--random-seed N] [--batch-size N] [--defer-indexes]
+      Add a synthetic dataset of the given size, e.g. for load tests. Every
+      generated user's password is password123.
+
+import and generate write through app.services.bulk_load: batched COPY on
+PostgreSQL and executemany elsewhere, with progress on stderr. Use
+--defer-indexes when loading into a database nothing else is using.
 """
 
+import argparse
+import gzip
+import json
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Tuple
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal, engine, Base
 from app.core.security import get_password_hash
-from app.models import User, Project, ProjectMember, ProjectRole, Issue, IssueStatus, IssuePriority, Comment
+from app.models import (
+    User, Project, ProjectMember, ProjectRole, Issue, IssueStatus, IssuePriority, IssueTombstone, Comment,
+    ProjectIssueStat, UserSession,
+)
+from app.services.bulk_load import BulkLoader
 import random
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+DEMO_PASSWORD = "password123"
 
 
 def seed_database():
@@ -22,28 +52,32 @@ def seed_database():
         print("Clearing existing data...")
         db.query(Comment).delete()
         db.query(Issue).delete()
+        db.query(IssueTombstone).delete()
+        db.query(ProjectIssueStat).delete()
         db.query(ProjectMember).delete()
         db.query(Project).delete()
+        db.query(UserSession).delete()
         db.query(User).delete()
         db.commit()
 
-        # Create users
+        # Create users; they share a password, so hash it once
         print("Creating users...")
+        password_hash = get_password_hash(DEMO_PASSWORD)
         users = [
             User(
                 name="Alice Johnson",
                 email="alice@example.com",
-                password_hash=get_password_hash("password123")
+                password_hash=password_hash
             ),
             User(
                 name="Bob Smith",
                 email="bob@example.com",
-                password_hash=get_password_hash("password123")
+                password_hash=password_hash
             ),
             User(
                 name="Charlie Brown",
                 email="charlie@example.com",
-                password_hash=get_password_hash("password123")
+                password_hash=password_hash
             ),
         ]
 
@@ -165,5 +199,186 @@ def seed_database():
         db.close()
 
 
+def read_records(path: str) -> Iterator[Tuple[str, dict]]:
+    """(type, record) pairs from an NDJSON file, with embedded issue comments flattened out."""
+    if path == "-":
+        lines = sys.stdin
+    elif path.endswith(".gz"):
+        lines = gzip.open(path, "rt", encoding="utf-8")
+    else:
+        lines = open(path, encoding="utf-8")
+    with lines:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                kind = record.pop("type")
+            except (ValueError, KeyError, AttributeError):
+                raise ValueError(f"line {number}: expected a JSON object with a \"type\"")
+            comments = record.pop("comments", None) if kind == "issue" else None
+            yield kind, record
+            for comment in comments or ():
+                yield "comment", {**comment, "issue_id": record.get("id")}
+
+
+def generate_records(
+    loader: BulkLoader,
+    users: int,
+    projects: int,
+    issues: int,
+    comments: int,
+    members_per_project: int,
+    rng: random.Random,
+) -> Iterator[Tuple[str, dict]]:
+    """A synthetic dataset with ids following the existing rows."""
+    now = datetime.now(timezone.utc)
+    password_hash = get_password_hash(DEMO_PASSWORD)
+    first_user = loader.first_free_id("user")
+    first_project = loader.first_free_id("project")
+    first_issue = loader.first_free_id("issue")
+    first_comment = loader.first_free_id("comment")
+
+    for user_id in range(first_user, first_user + users):
+        yield "user", {
+            "id": user_id,
+            "name": f"User {user_id}",
+            "email": f"user{user_id}@example.com",
+            "password_hash": password_hash,
+            "created_at": now - timedelta(days=rng.uniform(365, 730)),
+        }
+
+    members = []
+    for offset in range(projects):
+        project_id = first_project + offset
+        yield "project", {
+            "id": project_id,
+            "name": f"Project {project_id}",
+            "key": f"GEN{project_id}",
+            "description": "Generated project",
+            "created_at": now - timedelta(days=365),
+        }
+        project_members = rng.sample(range(first_user, first_user + users), min(members_per_project, users))
+        members.append(project_members)
+        for position, user_id in enumerate(project_members):
+            role = ProjectRole.MAINTAINER if position == 0 else ProjectRole.MEMBER
+            yield "member", {"project_id": project_id, "user_id": user_id, "role": role}
+
+    # Per issue, only what its comments need: project and age in seconds
+    issue_projects = array("l")
+    issue_ages = array("d")
+    statuses, priorities = list(IssueStatus), list(IssuePriority)
+    for issue_id in range(first_issue, first_issue + issues):
+        project = rng.randrange(projects)
+        age = rng.uniform(0, 365 * 86400)
+        issue_projects.append(project)
+        issue_ages.append(age)
+        created_at = now - timedelta(seconds=age)
+        yield "issue", {
+            "id": issue_id,
+            "project_id": first_project + project,
+            "title": f"Generated issue {issue_id}",
+            "description": f"Steps to reproduce issue {issue_id}.",
+            "status": rng.choice(statuses),
+            "priority": rng.choices(priorities, weights=(3, 5, 2, 1))[0],
+            "reporter_id": rng.choice(members[project]),
+            "assignee_id": rng.choice(members[project]) if rng.random() < 0.6 else None,
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(seconds=rng.uniform(0, age)),
+        }
+
+    for comment_id in range(first_comment, first_comment + comments):
+        issue = rng.randrange(issues)
+        age = issue_ages[issue]
+        yield "comment", {
+            "id": comment_id,
+            "issue_id": first_issue + issue,
+            "author_id": rng.choice(members[issue_projects[issue]]),
+            "body": f"Generated comment {comment_id}.",
+            "created_at": now - timedelta(seconds=rng.uniform(0, age)),
+        }
+
+
+def load_records(records: Iterator[Tuple[str, dict]], loader: BulkLoader, db: Session) -> None:
+    started = time.monotonic()
+    try:
+        for number, (kind, record) in enumerate(records, 1):
+            try:
+                loader.add(kind, record)
+            except ValueError as exc:
+                raise ValueError(f"record {number}: {exc}") from exc
+        loader.finish()
+        db.commit()
+    except BaseException:
+        loader.abort()
+        raise
+    print(f"Loaded {loader.progress()}; done in {time.monotonic() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("demo", help="replace all data with the demo dataset (default)")
+
+    bulk_options = argparse.ArgumentParser(add_help=False)
+    bulk_options.add_argument("--batch-size", type=int, default=10000, help="rows written per statement")
+    bulk_options.add_argument("--defer-indexes", action="store_true",
+                              help="drop secondary and search indexes while loading and rebuild them at the end")
+
+    import_parser = commands.add_parser("import", parents=[bulk_options], help="load NDJSON records")
+    import_parser.add_argument("file", help="NDJSON file, optionally .gz; - for stdin")
+    import_parser.add_argument("--default-password", default=DEMO_PASSWORD,
+                               help="password of users without a password_hash")
+
+    generate_parser = commands.add_parser("generate", parents=[bulk_options], help="add a synthetic dataset")
+    generate_parser.add_argument("--users", type=int, default=1000)
+    generate_parser.add_argument("--projects", type=int, default=20)
+    generate_parser.add_argument("--issues", type=int, default=100000)
+    generate_parser.add_argument("--comments", type=int, default=300000)
+    generate_parser.add_argument("--members-per-project", type=int, default=25)
+    generate_parser.add_argument("--random-seed", type=int, default=None)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    if args.command in (None, "demo"):
+        seed_database()
+        return
+    if args.command == "generate" and (args.users < 1 or args.projects < 1) and (args.issues or args.comments):
+        parser.error("issues and comments need at least one user and one project")
+    if args.command == "generate" and args.issues < 1 and args.comments:
+        parser.error("comments need at least one issue")
+
+    db: Session = SessionLocal()
+    try:
+        loader = BulkLoader(
+            db,
+            batch_size=args.batch_size,
+            defer_indexes=args.defer_indexes,
+            report=lambda line: print(line, file=sys.stderr)
+        )
+        if args.command == "import":
+            default_hash = None
+            records = read_records(args.file)
+
+            def with_passwords():
+                nonlocal default_hash
+                for kind, record in records:
+                    if kind == "user" and not record.get("password_hash"):
+                        # Hashed once and shared; users should change it after the migration
+                        default_hash = default_hash or get_password_hash(args.default_password)
+                        record["password_hash"] = default_hash
+                    yield kind, record
+
+            load_records(with_passwords(), loader, db)
+        else:
+            records = generate_records(
+                loader, args.users, args.projects, args.issues, args.comments,
+                args.members_per_project, random.Random(args.random_seed)
+            )
+            load_records(records, loader, db)
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
-    seed_database()
+    main()
@@ -1,8 +1,18 @@
+import os
+
+# Cheap hashes, hashed in-thread: the suite signs up users in nearly every test
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.core.database import Base, get_db
+from app.core.deps import user_cache
+from app.core.security import token_cache
+from app.services.authorization import membership_cache
+from app.services.events import broadcaster
 from main import app
 
 # Create a test database
@@ -23,6 +33,16 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="function")
+def other_session(db_session):
+    """A second session on the test database, as a concurrent request would hold."""
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with a test database."""
@@ -36,3 +56,30 @@ def client(db_session):
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Each test starts from a fresh database, so drop cached rows and events from earlier tests."""
+    user_cache.clear()
+    membership_cache.clear()
+    token_cache.clear()
+    broadcaster.reset()
+    yield
+    user_cache.clear()
+    membership_cache.clear()
+    token_cache.clear()
+    broadcaster.reset()
+
+
+@pytest.fixture(scope="function")
+def statements(db_session):
+    """Record the SQL statements executed against the test database."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
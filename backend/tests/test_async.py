@@ -0,0 +1,83 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.api import auth, projects, issues, comments
+from app.api.aio import asyncify_router
+from app.core.database import get_db, get_async_db
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+
+@pytest.fixture(scope="function")
+def async_client(db_session):
+    """Test client whose project, issue and comment routes run on aiosqlite."""
+    async_engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://"),
+        connect_args={"check_same_thread": False}
+    )
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as session:
+            yield session
+
+    def override_get_db():
+        yield db_session
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api")
+    for module in (projects, issues, comments):
+        app.include_router(asyncify_router(module.router), prefix="/api")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_async_routes_end_to_end(async_client):
+    """Test the issue workflow through the asyncified routers."""
+    token = async_client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    project_response = async_client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    )
+    assert project_response.status_code == 201
+    project_id = project_response.json()["id"]
+
+    issue_response = async_client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Async issue", "priority": "high"},
+        headers=headers
+    )
+    assert issue_response.status_code == 201
+    issue_id = issue_response.json()["id"]
+
+    response = async_client.patch(f"/api/issues/{issue_id}", json={"status": "resolved"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "resolved"
+
+    response = async_client.post(f"/api/issues/{issue_id}/comments", json={"body": "Done"}, headers=headers)
+    assert response.status_code == 201
+
+    response = async_client.get(f"/api/projects/{project_id}/issues?sort=priority", headers=headers)
+    assert [item["id"] for item in response.json()["items"]] == [issue_id]
+
+    response = async_client.get(f"/api/issues/{issue_id}/comments", headers=headers)
+    assert [comment["body"] for comment in response.json()["items"]] == ["Done"]
+    response = async_client.get(
+        f"/api/issues/{issue_id}/comments", headers={**headers, "If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == 304
+
+    response = async_client.get(f"/api/projects/{project_id}/members", headers=headers)
+    assert response.json()[0]["email"] == "john@example.com"
+
+    response = async_client.get("/api/issues/9999", headers=headers)
+    assert response.status_code == 404
@@ -1,3 +1,15 @@
+from datetime import datetime, timedelta, timezone
+import bcrypt
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from app.api import auth
+from app.core import security
+from app.core.deps import get_current_user, user_cache
+from app.core.security import VERIFICATION_KEYS, create_access_token, decode_access_token, settings, token_cache
+from app.models.session import UserSession
+from app.models.user import User
+
+
 def test_signup_success(client):
     """Test successful user signup."""
     response = client.post(
@@ -11,6 +23,7 @@ def test_signup_success(client):
     assert response.status_code == 201
     data = response.json()
     assert "access_token" in data
+    assert "refresh_token" in data
     assert data["token_type"] == "bearer"
 
 
@@ -129,3 +142,255 @@ def test_get_me_unauthorized(client):
     """Test getting profile without authentication."""
     response = client.get("/api/auth/me")
     assert response.status_code == 403
+
+
+def test_get_me_uses_user_cache(client, statements):
+    """Test that repeated requests skip the users lookup until the user changes."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+
+    client.get("/api/auth/me", headers=headers)
+    statements.clear()
+
+    response = client.get("/api/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["name"] == "John Doe"
+    assert not [s for s in statements if "FROM users" in s]
+
+
+def test_user_cache_invalidated_on_update(client, db_session):
+    """Test that changing a user evicts the cached identity."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+    client.get("/api/auth/me", headers=headers)
+
+    user = db_session.query(User).filter(User.email == "john@example.com").first()
+    user.name = "Johnny Doe"
+    db_session.commit()
+
+    response = client.get("/api/auth/me", headers=headers)
+    assert response.json()["name"] == "Johnny Doe"
+
+    db_session.delete(user)
+    db_session.commit()
+
+    response = client.get("/api/auth/me", headers=headers)
+    assert response.status_code == 401
+
+
+def test_user_cache_evicted_after_commit(client, db_session, other_session):
+    """Test that a user re-cached by a concurrent request between flush and commit is dropped on commit."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    token = signup_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/api/auth/me", headers=headers)
+
+    user = db_session.query(User).filter(User.email == "john@example.com").first()
+    user.name = "Johnny Doe"
+    db_session.flush()
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    assert get_current_user(credentials, other_session).name == "John Doe"
+    db_session.commit()
+
+    assert user_cache.get(user.id) is None
+    assert client.get("/api/auth/me", headers=headers).json()["name"] == "Johnny Doe"
+
+
+def test_login_rehashes_outdated_cost(client, db_session):
+    """Test that logging in upgrades a hash made with a different cost factor."""
+    db_session.add(User(
+        name="John Doe",
+        email="john@example.com",
+        password_hash=bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=5)).decode()
+    ))
+    db_session.commit()
+
+    response = client.post("/api/auth/login", json={"email": "john@example.com", "password": "password123"})
+    assert response.status_code == 200
+
+    user = db_session.query(User).filter(User.email == "john@example.com").first()
+    db_session.refresh(user)
+    assert not security.password_needs_rehash(user.password_hash)
+    assert bcrypt.checkpw(b"password123", user.password_hash.encode())
+
+
+def test_hashing_holds_no_connection(client, db_session, monkeypatch):
+    """Test that signup and login end their read transaction before awaiting bcrypt."""
+    open_during_hash = []
+
+    def watch(hash_function):
+        async def watched(*args):
+            open_during_hash.append(db_session.in_transaction())
+            return await hash_function(*args)
+        return watched
+
+    monkeypatch.setattr(auth, "get_password_hash_async", watch(security.get_password_hash_async))
+    monkeypatch.setattr(auth, "verify_password_async", watch(security.verify_password_async))
+    client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    response = client.post("/api/auth/login", json={"email": "john@example.com", "password": "password123"})
+    assert response.status_code == 200
+    assert open_during_hash == [False, False]
+
+
+def test_signup_and_login_on_hashing_processes(client, monkeypatch):
+    """Test that signup and login work when bcrypt runs in the process pool."""
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_WORKERS", 1)
+    try:
+        client.post(
+            "/api/auth/signup",
+            json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+        )
+        assert security.get_password_hasher() is not None
+
+        response = client.post("/api/auth/login", json={"email": "john@example.com", "password": "password123"})
+        assert response.status_code == 200
+
+        response = client.post("/api/auth/login", json={"email": "john@example.com", "password": "wrong"})
+        assert response.status_code == 401
+    finally:
+        security.shutdown_password_hasher()
+
+
+def test_token_key_rotation(client, monkeypatch):
+    """Test that tokens name their signing key, and tokens of earlier keys stay valid while listed."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    token = signup_response.json()["access_token"]
+    assert jwt.get_unverified_header(token)["kid"] == settings.JWT_KEY_ID
+    user_id = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).json()["id"]
+
+    def me(token):
+        return client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code
+
+    expires = datetime.now(timezone.utc) + timedelta(minutes=5)
+    claims = {"sub": str(user_id), "exp": expires}
+    old_token = jwt.encode(claims, "old-secret", algorithm=settings.ALGORITHM, headers={"kid": "2023"})
+    assert me(old_token) == 401
+
+    monkeypatch.setitem(VERIFICATION_KEYS, "2023", "old-secret")
+    assert me(old_token) == 200
+    # Issued before key ids: any listed key
+    assert me(jwt.encode(claims, "old-secret", algorithm=settings.ALGORITHM)) == 200
+    assert me(jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)) == 200
+    # A listed kid with another key's signature, and an unknown kid
+    assert me(jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM, headers={"kid": "2023"})) == 401
+    assert me(jwt.encode(claims, "old-secret", algorithm=settings.ALGORITHM, headers={"kid": "2022"})) == 401
+
+
+def test_verified_tokens_are_cached_until_expiry(client, monkeypatch):
+    """Test that a token is verified once, and that expired tokens are neither accepted nor cached."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    token = signup_response.json()["access_token"]
+    assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+    verifications = []
+    monkeypatch.setattr(security.jwt, "decode", lambda *args, **kwargs: verifications.append(args))
+    assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    assert decode_access_token(token)["sub"] == token_cache.get(token)["sub"]
+    assert verifications == []
+    monkeypatch.undo()
+
+    expired = create_access_token({"sub": 1}, expires_delta=timedelta(seconds=-1))
+    assert decode_access_token(expired) is None
+    assert token_cache.get(expired) is None
+
+
+def test_refresh_token_rotation(client, monkeypatch):
+    """Test refreshing without the password, single-use refresh tokens and revocation on reuse."""
+    login_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    first = login_response.json()["refresh_token"]
+
+    def fail(*args):
+        raise AssertionError("bcrypt called")
+
+    monkeypatch.setattr(security.bcrypt, "checkpw", fail)
+    monkeypatch.setattr(security.bcrypt, "hashpw", fail)
+    response = client.post("/api/auth/refresh", json={"refresh_token": first})
+    assert response.status_code == 200
+    tokens = response.json()
+    assert tokens["refresh_token"] != first
+    me = client.get("/api/auth/me", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert me.json()["email"] == "john@example.com"
+
+    second = tokens["refresh_token"]
+    third = client.post("/api/auth/refresh", json={"refresh_token": second}).json()["refresh_token"]
+    assert client.post("/api/auth/refresh", json={"refresh_token": "unknown"}).status_code == 401
+
+    # Right after a refresh, its replaced token is refused but the session lives on (another tab racing)
+    assert client.post("/api/auth/refresh", json={"refresh_token": second}).status_code == 401
+    fourth = client.post("/api/auth/refresh", json={"refresh_token": third}).json()["refresh_token"]
+
+    # Later, replaying a used token ends the session, so the thief's copy and the owner's both stop working
+    monkeypatch.setattr(settings, "REFRESH_REUSE_GRACE_SECONDS", 0)
+    assert client.post("/api/auth/refresh", json={"refresh_token": third}).status_code == 401
+    assert client.post("/api/auth/refresh", json={"refresh_token": fourth}).status_code == 401
+
+
+def test_logout_and_expired_sessions(client, db_session):
+    """Test that logout revokes the session, expired sessions are refused, and ended ones are purged on login."""
+    client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+
+    def login():
+        response = client.post("/api/auth/login", json={"email": "john@example.com", "password": "password123"})
+        return response.json()["refresh_token"]
+
+    refresh_token = login()
+    assert client.post("/api/auth/logout", json={"refresh_token": refresh_token}).status_code == 204
+    assert client.post("/api/auth/refresh", json={"refresh_token": refresh_token}).status_code == 401
+
+    refresh_token = login()
+    session = db_session.query(UserSession).filter(
+        UserSession.token_hash == security.hash_refresh_token(refresh_token)
+    ).one()
+    session.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    db_session.commit()
+    assert client.post("/api/auth/refresh", json={"refresh_token": refresh_token}).status_code == 401
+
+    # Only the signup session is still open, plus the one just started
+    login()
+    db_session.expire_all()
+    assert db_session.query(UserSession).count() == 2
+
+
+def test_expired_access_token_is_refreshed(client):
+    """Test the reload flow: /auth/me rejects an expired access token, and the refresh token gets a working one."""
+    login_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    refresh_token = login_response.json()["refresh_token"]
+    user_id = client.get(
+        "/api/auth/me", headers={"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    ).json()["id"]
+
+    expired = create_access_token({"sub": user_id}, expires_delta=timedelta(seconds=-1))
+    response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {expired}"})
+    assert response.status_code == 401
+
+    tokens = client.post("/api/auth/refresh", json={"refresh_token": refresh_token}).json()
+    response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert response.status_code == 200
+    assert response.json()["id"] == user_id
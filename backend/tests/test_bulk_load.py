@@ -0,0 +1,48 @@
+import pytest
+from app.core.security import get_password_hash
+from app.models.issue import Issue
+from app.services.bulk_load import BulkLoader
+
+
+@pytest.mark.parametrize("defer_indexes", [False, True])
+def test_bulk_load_maintains_derived_data(client, db_session, defer_indexes):
+    """Test that bulk-loaded rows are counted, indexed and synced like ones created through the API."""
+    loader = BulkLoader(db_session, batch_size=2, defer_indexes=defer_indexes)
+    password_hash = get_password_hash("password123")
+    loader.add("user", {"id": 7, "name": "Old Tracker", "email": "old@example.com", "password_hash": password_hash})
+    loader.add("project", {"id": 3, "name": "Migrated", "key": "MIG"})
+    loader.add("member", {"project_id": 3, "user_id": 7, "role": "maintainer"})
+    for issue_id, title, priority in [(10, "Checkout crashes", "critical"), (11, "Typo on login page", "low")]:
+        loader.add("issue", {
+            "id": issue_id, "project_id": 3, "title": title, "priority": priority, "reporter_id": 7,
+            "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-02T00:00:00",
+        })
+    loader.add("comment", {
+        "id": 20, "issue_id": 10, "author_id": 7, "body": "Happens with expired coupons",
+        "created_at": "2024-03-01T00:00:00",
+    })
+    loader.add("comment", {"id": 21, "issue_id": 10, "author_id": 7, "body": "Still seen in staging"})
+    assert loader.finish() == {"user": 1, "project": 1, "member": 1, "issue": 2, "comment": 2}
+    db_session.commit()
+
+    token = client.post("/api/auth/login", json={"email": "old@example.com", "password": "password123"}).json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+    stats = client.get("/api/projects/3/stats", headers=headers).json()
+    assert stats["total"] == 2
+    assert stats["priority"] == {"low": 1, "medium": 0, "high": 0, "critical": 1}
+
+    issue = client.get("/api/issues/10", headers=headers).json()
+    assert issue["comment_count"] == 2
+    assert issue["last_activity_at"] > "2024-03-01"
+
+    results = client.get("/api/projects/3/search", params={"q": "coupons"}, headers=headers).json()
+    assert [result["id"] for result in results] == [10]
+
+    changes = client.get("/api/projects/3/issues/changes", headers=headers).json()
+    assert [issue["id"] for issue in changes["issues"]] == [10, 11]
+
+    # Ids keep counting from the loaded rows
+    response = client.post("/api/projects/3/issues", json={"title": "New"}, headers=headers)
+    assert response.json()["id"] == 12
+    assert db_session.query(Issue).count() == 3
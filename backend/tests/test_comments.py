@@ -0,0 +1,70 @@
+import json
+
+
+def test_list_comments_pagination_and_ndjson(client):
+    """Test paging through comments in both orders, and streaming them as NDJSON."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    )
+    project_id = project_response.json()["id"]
+    issue_response = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Incident"},
+        headers=headers
+    )
+    issue_id = issue_response.json()["id"]
+
+    # Created within the same second, so ties on created_at fall back to id
+    bodies = [f"Update {i}" for i in range(7)]
+    for body in bodies:
+        client.post(f"/api/issues/{issue_id}/comments", json={"body": body}, headers=headers)
+
+    for order, expected in [("asc", bodies), ("desc", bodies[::-1])]:
+        seen = []
+        cursor = None
+        while True:
+            params = {"order": order, "limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get(f"/api/issues/{issue_id}/comments", params=params, headers=headers)
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data["items"]) <= 3
+            seen.extend(comment["body"] for comment in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == expected
+
+    # A cursor only continues the order it was issued for
+    page = client.get(f"/api/issues/{issue_id}/comments", params={"limit": 3}, headers=headers).json()
+    response = client.get(
+        f"/api/issues/{issue_id}/comments",
+        params={"order": "desc", "cursor": page["next_cursor"]},
+        headers=headers
+    )
+    assert response.status_code == 400
+
+    # NDJSON streams everything after the cursor, regardless of limit
+    response = client.get(
+        f"/api/issues/{issue_id}/comments",
+        params={"format": "ndjson", "limit": 1, "cursor": page["next_cursor"]},
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["body"] for line in response.text.splitlines()] == bodies[3:]
+    response = client.get(
+        f"/api/issues/{issue_id}/comments",
+        params={"format": "ndjson", "limit": 1, "cursor": page["next_cursor"]},
+        headers={**headers, "If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == 304
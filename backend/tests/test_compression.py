@@ -0,0 +1,103 @@
+import gzip
+import json
+import pytest
+
+from app.core.compression import negotiate_encoding
+
+DECODERS = {
+    "br": lambda data: pytest.importorskip("brotli").decompress(data),
+    "zstd": lambda data: pytest.importorskip("zstandard").ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+def _populate(client):
+    """A project with 20 issues, 50 comments on the last one; returns (auth headers, project id, issue id)."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    ).json()["id"]
+    for i in range(20):
+        issue_id = client.post(
+            f"/api/projects/{project_id}/issues",
+            json={"title": f"Bug {i}", "description": "Steps to reproduce " * 20},
+            headers=headers
+        ).json()["id"]
+    for i in range(50):
+        client.post(f"/api/issues/{issue_id}/comments", json={"body": f"Update {i}"}, headers=headers)
+    return headers, project_id, issue_id
+
+
+def test_negotiate_encoding():
+    """Test picking a content-coding from Accept-Encoding and the server preference."""
+    preference = ["zstd", "br", "gzip"]
+    assert negotiate_encoding(None, preference) is None
+    assert negotiate_encoding("gzip, deflate", preference) == "gzip"
+    assert negotiate_encoding("gzip, deflate, br, zstd", preference) == "zstd"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", preference) == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity", preference) is None
+    assert negotiate_encoding("*;q=0.1, br;q=0", preference) == "zstd"
+    assert negotiate_encoding("br", ["gzip"]) is None
+
+
+def test_response_compression(client):
+    """Test compressing large, streamed and conditional responses, and skipping small and pre-encoded ones."""
+    headers, project_id, issue_id = _populate(client)
+    headers["Accept-Encoding"] = "gzip"
+
+    # Below the threshold: identity, but caches still learn the response varies
+    response = client.get("/api/auth/me", headers=headers)
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    url = f"/api/projects/{project_id}/issues"
+    response = client.get(url, headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(response.content) // 4
+    assert len(response.json()["items"]) == 20
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    identity = client.get(url, headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.content == response.content
+    assert identity.headers["etag"] == etag[2:]
+
+    # Streamed: compressed chunk by chunk
+    response = client.get(f"/api/issues/{issue_id}/comments", params={"format": "ndjson"}, headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert [json.loads(line)["body"] for line in response.text.splitlines()] == [f"Update {i}" for i in range(50)]
+
+    # Already gzipped by the app: sent as is
+    response = client.get(f"/api/projects/{project_id}/export", params={"gzip": True}, headers=headers)
+    assert "content-encoding" not in response.headers
+    assert len(gzip.decompress(response.content).splitlines()) == 20
+
+
+@pytest.mark.parametrize("encoding", ["br", "zstd"])
+def test_brotli_and_zstd_compression(client, encoding):
+    """Test br and zstd responses, sent in one piece and streamed, decode to the identity body."""
+    decode = DECODERS[encoding]
+    headers, project_id, issue_id = _populate(client)
+
+    def raw_get(url, **params):
+        with client.stream("GET", url, params=params, headers={**headers, "Accept-Encoding": encoding}) as response:
+            return response, b"".join(response.iter_raw())
+
+    url = f"/api/projects/{project_id}/issues"
+    response, body = raw_get(url)
+    assert response.headers["content-encoding"] == encoding
+    assert int(response.headers["content-length"]) == len(body)
+    assert decode(body) == client.get(url, headers={**headers, "Accept-Encoding": "identity"}).content
+
+    response, body = raw_get(f"/api/issues/{issue_id}/comments", format="ndjson")
+    assert response.headers["content-encoding"] == encoding
+    assert "content-length" not in response.headers
+    assert [json.loads(line)["body"] for line in decode(body).splitlines()] == [f"Update {i}" for i in range(50)]
@@ -0,0 +1,78 @@
+import asyncio
+from app.services.events import broadcaster, get_issues_version, resume_events, stream_events
+
+
+def _setup_project(client):
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    token = signup_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    )
+    return project_response.json()["id"], headers
+
+
+def test_events_require_membership(client):
+    """Test that only project members can open the event stream."""
+    project_id, _ = _setup_project(client)
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "Jane Smith", "email": "jane@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+
+    response = client.get(f"/api/projects/{project_id}/events", headers=headers)
+    assert response.status_code == 403
+
+
+def test_resume_from_last_event_id(client, db_session, monkeypatch):
+    """Test that reconnecting streams get the missed events, or a reset when they are gone."""
+    monkeypatch.setattr(broadcaster, "buffer_size", 2)
+    project_id, headers = _setup_project(client)
+
+    issue = client.post(f"/api/projects/{project_id}/issues", json={"title": "Bug 1"}, headers=headers).json()
+    first_id = get_issues_version(db_session, project_id)
+    client.patch(f"/api/issues/{issue['id']}", json={"status": "closed"}, headers=headers)
+    client.post(f"/api/issues/{issue['id']}/comments", json={"body": "Fixed"}, headers=headers)
+    current = get_issues_version(db_session, project_id)
+
+    events = resume_events(project_id, first_id, current)
+    assert [event.type for event in events] == ["issue.updated", "comment.created"]
+    assert events[0].data["status"] == "closed"
+    assert events[-1].id == current
+
+    # issue.created has been evicted from the buffer
+    assert [event.type for event in resume_events(project_id, first_id - 1, current)] == ["reset"]
+
+    # After a restart nothing is buffered: up to date is fine, anything else resets
+    broadcaster.reset()
+    assert resume_events(project_id, current, current) == []
+    assert [event.type for event in resume_events(project_id, first_id, current)] == ["reset"]
+
+
+def test_stream_delivers_live_events(client):
+    """Test that an open stream receives events published by requests on other threads."""
+    project_id, headers = _setup_project(client)
+
+    async def first_event():
+        subscription = broadcaster.subscribe(project_id)
+        stream = stream_events(subscription, [])
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None,
+            lambda: client.post(f"/api/projects/{project_id}/issues", json={"title": "Live"}, headers=headers)
+        )
+        try:
+            return await asyncio.wait_for(stream.__anext__(), timeout=5)
+        finally:
+            await stream.aclose()
+
+    frame = asyncio.run(first_event())
+    assert "event: issue.created" in frame
+    assert '"title":"Live"' in frame
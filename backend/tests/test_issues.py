@@ -1,3 +1,11 @@
+from datetime import datetime, timezone
+from app.core.responses import FastJSONResponse, json_dumps, row_dicts
+from app.models.comment import Comment
+from app.models.issue import Issue
+from app.schemas.comment import CommentPage, CommentResponse
+from app.schemas.issue import IssuePage, IssueResponse
+
+
 def test_create_issue_success(client):
     """Test creating an issue."""
     # Signup and create project
@@ -65,7 +73,7 @@ def test_list_issues_with_filters(client):
         headers={"Authorization": f"Bearer {token}"}
     )
     assert response.status_code == 200
-    data = response.json()
+    data = response.json()["items"]
     assert len(data) == 1
     assert data[0]["priority"] == "high"
 
@@ -139,6 +147,531 @@ def test_search_issues_by_title(client):
         headers={"Authorization": f"Bearer {token}"}
     )
     assert response.status_code == 200
-    data = response.json()
+    data = response.json()["items"]
     assert len(data) == 1
     assert "login" in data[0]["title"].lower()
+
+
+def test_list_issues_cursor_pagination(client):
+    """Test walking every sort order page by page with next_cursor."""
+    # Signup and create project
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    token = signup_response.json()["access_token"]
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    project_id = project_response.json()["id"]
+
+    # Create issues, several sharing a priority so ties fall back to id
+    priorities = ["low", "critical", "medium", "high", "medium", "critical", "low"]
+    for i, priority in enumerate(priorities):
+        client.post(
+            f"/api/projects/{project_id}/issues",
+            json={"title": f"Issue {i}", "priority": priority},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+    for sort in ["created_at", "updated_at", "status", "priority", "comment_count", "last_activity_at"]:
+        seen = []
+        cursor = None
+        while True:
+            params = {"sort": sort, "limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get(
+                f"/api/projects/{project_id}/issues",
+                params=params,
+                headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data["items"]) <= 3
+            seen.extend(data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(seen) == len(priorities)
+        assert len({issue["id"] for issue in seen}) == len(priorities)
+
+        if sort == "priority":
+            ranks = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+            assert [ranks[issue["priority"]] for issue in seen] == sorted(ranks[p] for p in priorities)
+
+
+def test_list_issues_invalid_cursor(client):
+    """Test that a malformed or mismatched cursor is rejected."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    token = signup_response.json()["access_token"]
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    project_id = project_response.json()["id"]
+
+    for i in range(3):
+        client.post(
+            f"/api/projects/{project_id}/issues",
+            json={"title": f"Issue {i}"},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+    response = client.get(
+        f"/api/projects/{project_id}/issues?limit=1",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    cursor = response.json()["next_cursor"]
+    assert cursor is not None
+
+    # Cursor from a different sort order
+    response = client.get(
+        f"/api/projects/{project_id}/issues",
+        params={"sort": "priority", "cursor": cursor},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 400
+
+    # Garbage cursor
+    response = client.get(
+        f"/api/projects/{project_id}/issues",
+        params={"cursor": "not-a-cursor"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 400
+
+
+def test_priority_sort_follows_priority_updates(client):
+    """Test that changing an issue's priority moves it in priority order."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    token = signup_response.json()["access_token"]
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    project_id = project_response.json()["id"]
+
+    low_response = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Minor typo", "priority": "low"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Slow page", "priority": "high"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    # Escalate the low priority issue
+    client.patch(
+        f"/api/issues/{low_response.json()['id']}",
+        json={"priority": "critical"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    response = client.get(
+        f"/api/projects/{project_id}/issues?sort=priority",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    titles = [issue["title"] for issue in response.json()["items"]]
+    assert titles == ["Minor typo", "Slow page"]
+
+
+def test_bulk_create_issues(client):
+    """Test creating many issues at once with per-item assignee errors."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    token = signup_response.json()["access_token"]
+    outsider = client.post(
+        "/api/auth/signup",
+        json={"name": "Jane Smith", "email": "jane@example.com", "password": "password123"}
+    )
+    outsider_id = client.get(
+        "/api/auth/me", headers={"Authorization": f"Bearer {outsider.json()['access_token']}"}
+    ).json()["id"]
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    project_id = project_response.json()["id"]
+
+    response = client.post(
+        f"/api/projects/{project_id}/issues/bulk",
+        json={"items": [
+            {"title": "Imported 1", "priority": "critical"},
+            {"title": "Imported 2", "assignee_id": outsider_id},
+            {"title": "Imported 3"},
+        ]},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [issue["title"] for issue in data["items"]] == ["Imported 1", "Imported 3"]
+    assert data["errors"] == [{"index": 1, "detail": "Assignee is not a member of this project"}]
+
+    # Bulk-created issues sort by priority like any other
+    response = client.get(
+        f"/api/projects/{project_id}/issues?sort=priority",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert [issue["title"] for issue in response.json()["items"]] == ["Imported 1", "Imported 3"]
+
+
+def test_bulk_update_issues(client):
+    """Test partial updates of many issues at once with per-item errors."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    token = signup_response.json()["access_token"]
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    project_id = project_response.json()["id"]
+
+    created = client.post(
+        f"/api/projects/{project_id}/issues/bulk",
+        json={"items": [{"title": "Bug 1"}, {"title": "Bug 2", "priority": "low"}]},
+        headers={"Authorization": f"Bearer {token}"}
+    ).json()["items"]
+
+    response = client.patch(
+        "/api/issues/bulk",
+        json={"items": [
+            {"id": created[1]["id"], "priority": "critical", "status": "in_progress"},
+            {"id": 9999, "status": "closed"},
+            {"id": created[0]["id"], "title": None},
+            {"id": created[0]["id"], "title": "Bug 1 (triaged)"},
+        ]},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [(issue["title"], issue["priority"], issue["status"]) for issue in data["items"]] == [
+        ("Bug 2", "critical", "in_progress"),
+        ("Bug 1 (triaged)", "medium", "open"),
+    ]
+    assert [error["index"] for error in data["errors"]] == [1, 2]
+
+    response = client.get(
+        f"/api/projects/{project_id}/issues?sort=priority",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert [issue["title"] for issue in response.json()["items"]] == ["Bug 2", "Bug 1 (triaged)"]
+
+
+def test_issue_etags(client, statements):
+    """Test conditional GETs of an issue and the issue list."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    )
+    project_id = project_response.json()["id"]
+    issue_id = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Bug 1"},
+        headers=headers
+    ).json()["id"]
+
+    issue_response = client.get(f"/api/issues/{issue_id}", headers=headers)
+    list_response = client.get(f"/api/projects/{project_id}/issues", headers=headers)
+    assert issue_response.headers["cache-control"] == "private, no-cache"
+    issue_etag = issue_response.headers["etag"]
+    list_etag = list_response.headers["etag"]
+
+    # Unchanged: 304 without loading the issues
+    statements.clear()
+    response = client.get(f"/api/issues/{issue_id}", headers={**headers, "If-None-Match": issue_etag})
+    assert response.status_code == 304
+    response = client.get(f"/api/projects/{project_id}/issues", headers={**headers, "If-None-Match": list_etag})
+    assert response.status_code == 304
+    assert not [s for s in statements if "issues.title" in s]
+
+    # Other query parameters are a different representation
+    response = client.get(f"/api/projects/{project_id}/issues?sort=priority", headers={**headers, "If-None-Match": list_etag})
+    assert response.status_code == 200
+
+    # A change to the issue invalidates both
+    client.patch(f"/api/issues/{issue_id}", json={"status": "closed"}, headers=headers)
+    response = client.get(f"/api/issues/{issue_id}", headers={**headers, "If-None-Match": issue_etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != issue_etag
+    response = client.get(f"/api/projects/{project_id}/issues", headers={**headers, "If-None-Match": list_etag})
+    assert response.status_code == 200
+    list_etag = response.headers["etag"]
+
+    # Comments can change which issues match q, so they invalidate the list too
+    comments_etag = client.get(f"/api/issues/{issue_id}/comments", headers=headers).headers["etag"]
+    client.post(f"/api/issues/{issue_id}/comments", json={"body": "Seen it"}, headers=headers)
+    response = client.get(f"/api/issues/{issue_id}/comments", headers={**headers, "If-None-Match": comments_etag})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
+    response = client.get(f"/api/projects/{project_id}/issues", headers={**headers, "If-None-Match": list_etag})
+    assert response.status_code == 200
+
+
+def test_issue_changes_sync(client):
+    """Test incremental sync of created, updated and deleted issues."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    )
+    project_id = project_response.json()["id"]
+    ids = [
+        client.post(f"/api/projects/{project_id}/issues", json={"title": f"Bug {i}"}, headers=headers).json()["id"]
+        for i in range(3)
+    ]
+
+    # Full sync in pages
+    first = client.get(f"/api/projects/{project_id}/issues/changes?limit=2", headers=headers).json()
+    assert [issue["id"] for issue in first["issues"]] == ids[:2]
+    assert first["has_more"]
+    second = client.get(
+        f"/api/projects/{project_id}/issues/changes?limit=2&since={first['next_token']}", headers=headers
+    ).json()
+    assert [issue["id"] for issue in second["issues"]] == ids[2:]
+    assert not second["has_more"]
+
+    client.patch(f"/api/issues/{ids[0]}", json={"title": "Bug 0 (renamed)"}, headers=headers)
+    client.delete(f"/api/issues/{ids[1]}", headers=headers)
+    client.patch("/api/issues/bulk", json={"items": [{"id": ids[2], "priority": "high"}]}, headers=headers)
+    # Comments change the issue's comment_count, so they sync it again
+    client.post(f"/api/issues/{ids[0]}/comments", json={"body": "Noted"}, headers=headers)
+
+    changes = client.get(
+        f"/api/projects/{project_id}/issues/changes?since={second['next_token']}", headers=headers
+    ).json()
+    assert [
+        (issue["id"], issue["title"], issue["priority"], issue["comment_count"]) for issue in changes["issues"]
+    ] == [
+        (ids[2], "Bug 2", "high", 0),
+        (ids[0], "Bug 0 (renamed)", "medium", 1),
+    ]
+    assert changes["deleted"] == [ids[1]]
+
+    # Caught up
+    response = client.get(
+        f"/api/projects/{project_id}/issues/changes?since={changes['next_token']}", headers=headers
+    ).json()
+    assert response["issues"] == [] and response["deleted"] == []
+
+    response = client.get(f"/api/projects/{project_id}/issues/changes?since=bogus", headers=headers)
+    assert response.status_code == 400
+
+
+def test_comment_count_and_last_activity(client, db_session):
+    """Test the maintained comment_count and last_activity_at, and sorting by them."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    )
+    project_id = project_response.json()["id"]
+    ids = [
+        client.post(f"/api/projects/{project_id}/issues", json={"title": f"Bug {i}"}, headers=headers).json()["id"]
+        for i in range(3)
+    ]
+    assert client.get(f"/api/issues/{ids[0]}", headers=headers).json()["comment_count"] == 0
+
+    # Age every issue so the comments below make their issues the most recently active
+    long_ago = datetime(2020, 1, 1)
+    db_session.query(Issue).update({Issue.last_activity_at: long_ago})
+    db_session.commit()
+
+    for issue_id in [ids[1], ids[1], ids[2]]:
+        client.post(f"/api/issues/{issue_id}/comments", json={"body": "Me too"}, headers=headers)
+
+    issue = client.get(f"/api/issues/{ids[1]}", headers=headers).json()
+    assert issue["comment_count"] == 2
+    assert issue["last_activity_at"] > long_ago.isoformat()
+
+    def issue_ids(sort):
+        response = client.get(f"/api/projects/{project_id}/issues", params={"sort": sort}, headers=headers)
+        return [(issue["id"], issue["comment_count"]) for issue in response.json()["items"]]
+
+    assert issue_ids("comment_count") == [(ids[1], 2), (ids[2], 1), (ids[0], 0)]
+    # Equal activity times fall back to newest id first
+    assert issue_ids("last_activity_at") == [(ids[2], 1), (ids[1], 2), (ids[0], 0)]
+
+
+def test_issue_and_comment_listings_use_constant_queries(client, statements):
+    """Test that list_issues and list_comments do not issue a query per row."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+    user_id = client.get("/api/auth/me", headers=headers).json()["id"]
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    ).json()["id"]
+
+    def add_issues(count):
+        for i in range(count):
+            issue_id = client.post(
+                f"/api/projects/{project_id}/issues",
+                json={"title": f"Bug {i}", "assignee_id": user_id},
+                headers=headers
+            ).json()["id"]
+            client.post(f"/api/issues/{issue_id}/comments", json={"body": "Seen it"}, headers=headers)
+        return issue_id
+
+    def count_queries(path):
+        client.get(path, headers=headers)  # warm the auth caches
+        statements.clear()
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200
+        return len(statements), len(response.json()["items"])
+
+    issue_id = add_issues(1)
+    paths = [f"/api/projects/{project_id}/issues?sort={sort}" for sort in ("created_at", "priority")]
+    paths += [f"/api/projects/{project_id}/issues?assignee={user_id}", f"/api/issues/{issue_id}/comments"]
+    baseline = [count_queries(path)[0] for path in paths]
+
+    add_issues(5)
+    for _ in range(5):
+        client.post(f"/api/issues/{issue_id}/comments", json={"body": "Again"}, headers=headers)
+    for path, expected in zip(paths, baseline):
+        queries, rows = count_queries(path)
+        assert rows == 6
+        assert queries == expected
+
+
+def test_list_endpoints_match_response_models(client, db_session):
+    """Test that the row-tuple list responses are byte-identical to serializing the ORM objects."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "Jöhn Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    ).json()["id"]
+    for title, priority in [("Crash ✗", "critical"), ('Quote " and \\ backslash', "low"), ("Plain", "medium")]:
+        issue_id = client.post(
+            f"/api/projects/{project_id}/issues",
+            json={"title": title, "description": "Line 1\nLine 2", "priority": priority},
+            headers=headers
+        ).json()["id"]
+    client.post(f"/api/issues/{issue_id}/comments", json={"body": "Ünïcode 💬"}, headers=headers)
+
+    for sort in ("created_at", "priority"):
+        response = client.get(f"/api/projects/{project_id}/issues?sort={sort}&limit=2", headers=headers)
+        expected_order = [item["id"] for item in response.json()["items"]]
+        issues = [db_session.get(Issue, issue_id) for issue_id in expected_order]
+        expected = IssuePage(items=issues, next_cursor=response.json()["next_cursor"])
+        assert response.content == expected.model_dump_json().encode()
+        assert response.headers["content-type"] == "application/json"
+
+    response = client.get(f"/api/issues/{issue_id}/comments", headers=headers)
+    comments = db_session.query(Comment).filter(Comment.issue_id == issue_id).all()
+    assert response.content == CommentPage(items=comments).model_dump_json().encode()
+
+    # PostgreSQL returns timestamptz columns as aware datetimes: both paths write UTC as Z
+    def aware(obj, schema):
+        return tuple(
+            value.replace(tzinfo=timezone.utc) if isinstance(value, datetime) else value
+            for value in (getattr(obj, name) for name in schema.model_fields)
+        )
+
+    row = aware(issues[0], IssueResponse)
+    expected = IssuePage(items=[IssueResponse(**dict(zip(IssueResponse.model_fields, row)))], next_cursor=None)
+    body = FastJSONResponse({"items": row_dicts([row], IssueResponse.model_fields), "next_cursor": None}).body
+    assert body == expected.model_dump_json().encode()
+    assert b'Z"' in body
+    row = aware(comments[0], CommentResponse)
+    line = json_dumps(row_dicts([row], CommentResponse.model_fields)[0])
+    assert line == CommentResponse(**dict(zip(CommentResponse.model_fields, row))).model_dump_json().encode()
+
+
+def test_list_issues_fields(client):
+    """Test limiting the issue list to some fields, across pages of every sort."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    ).json()["id"]
+    for i, priority in enumerate(["low", "critical", "medium", "high", "medium"]):
+        client.post(
+            f"/api/projects/{project_id}/issues",
+            json={"title": f"Bug {i}", "description": "x" * 5000, "priority": priority},
+            headers=headers
+        )
+
+    url = f"/api/projects/{project_id}/issues"
+    for sort in ("created_at", "priority", "status", "comment_count"):
+        full = client.get(url, params={"sort": sort}, headers=headers).json()["items"]
+        seen, cursor = [], None
+        while True:
+            params = {"sort": sort, "limit": 2, "fields": "title, status,priority,assignee_id"}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get(url, params=params, headers=headers).json()
+            seen.extend(page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert all(set(item) == {"id", "title", "status", "priority", "assignee_id"} for item in seen)
+        assert seen == [{key: issue[key] for key in seen[0]} for issue in full]
+
+    # Another selection is another representation
+    full_response = client.get(url, headers=headers)
+    response = client.get(url, params={"fields": "title"}, headers={**headers, "If-None-Match": full_response.headers["etag"]})
+    assert response.status_code == 200
+    assert len(response.content) < len(full_response.content) // 10
+
+    response = client.get(url, params={"fields": "title,secret"}, headers=headers)
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
@@ -0,0 +1,87 @@
+import json
+import logging
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.core import metrics
+from app.core.metrics import RequestMetricsMiddleware, instrument_engine, instrument_routes, render_metrics
+from main import app
+
+
+@pytest.fixture
+def metrics_client(client, db_session):
+    """
+    A client for the app behind the metrics middleware, with the test engine
+    instrumented; the app and engine are restored afterwards.
+    """
+    engine = db_session.get_bind()
+    engine_was_instrumented = event.contains(engine, "before_cursor_execute", metrics._before_cursor_execute)
+    endpoints = [(route, route.dependant.call) for route in app.routes if isinstance(route, APIRoute)]
+    logger_level = metrics.logger.level
+
+    instrument_engine(engine)
+    instrument_routes(app)
+    try:
+        with TestClient(RequestMetricsMiddleware(app)) as test_client:
+            yield test_client
+    finally:
+        for route, call in endpoints:
+            route.dependant.call = call
+        if not engine_was_instrumented:
+            event.remove(engine, "before_cursor_execute", metrics._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", metrics._after_cursor_execute)
+        metrics.logger.setLevel(logger_level)
+
+
+def test_request_metrics(metrics_client, caplog):
+    """Test the Server-Timing header, the request log line and the per-route histograms."""
+    caplog.set_level(logging.INFO, logger="issuehub.requests")
+    signup_response = metrics_client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+    project_id = metrics_client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    ).json()["id"]
+    metrics_client.post(f"/api/projects/{project_id}/issues", json={"title": "Bug 1"}, headers=headers)
+
+    caplog.clear()
+    response = metrics_client.get(f"/api/projects/{project_id}/issues", headers=headers)
+    assert response.status_code == 200
+    timing = {entry.split(";")[0].strip(): entry for entry in response.headers["server-timing"].split(",")}
+    assert set(timing) == {"db", "db-slowest", "serialize", "app"}
+    queries = int(timing["db"].split('desc="')[1].split(" ")[0])
+    assert queries > 0
+
+    [line] = [json.loads(record.getMessage()) for record in caplog.records if record.name == "issuehub.requests"]
+    assert line["route"] == "/api/projects/{project_id}/issues"
+    assert line["status"] == 200
+    assert line["queries"] == queries
+    assert line["slowest_query"].startswith("SELECT")
+    assert line["serialize_ms"] is not None
+    assert line["bytes"] == line["wire_bytes"] == len(response.content)
+
+    text = render_metrics()
+    route_labels = 'method="GET",route="/api/projects/{project_id}/issues"'
+    assert f'issuehub_request_duration_seconds_bucket{{{route_labels},le="+Inf"}}' in text
+    assert f"issuehub_request_queries_count{{{route_labels}}}" in text
+    assert "# TYPE issuehub_request_db_seconds histogram" in text
+
+
+def test_metrics_client_instruments_the_app(metrics_client, db_session):
+    """Test that the endpoints and engine are instrumented while the fixture is in use."""
+    routes = [route for route in app.routes if isinstance(route, APIRoute)]
+    assert all(getattr(route.dependant.call, "_marks_return", False) for route in routes)
+    assert event.contains(db_session.get_bind(), "before_cursor_execute", metrics._before_cursor_execute)
+
+
+def test_app_is_not_left_instrumented(db_session):
+    """Test that no endpoint wrapper or engine hook outlives the metrics tests."""
+    routes = [route for route in app.routes if isinstance(route, APIRoute)]
+    assert not any(getattr(route.dependant.call, "_marks_return", False) for route in routes)
+    assert not event.contains(db_session.get_bind(), "before_cursor_execute", metrics._before_cursor_execute)
@@ -1,3 +1,13 @@
+import csv
+import gzip
+import io
+import json
+from app.models.project import ProjectMember, ProjectRole
+from app.models.stats import ProjectIssueStat
+from app.services.authorization import get_project_role, membership_cache
+from app.services.stats import rebuild_project_stats
+
+
 def test_create_project_success(client):
     """Test creating a project."""
     # Signup and get token
@@ -131,3 +141,282 @@ def test_add_project_member(client):
     assert response.status_code == 201
     data = response.json()
     assert data["role"] == "member"
+
+
+def test_membership_cache_follows_role_changes(client, db_session, statements):
+    """Test that roles are served from cache and evicted when membership changes."""
+    owner_token = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    ).json()["access_token"]
+    member_token = client.post(
+        "/api/auth/signup",
+        json={"name": "Jane Doe", "email": "jane@example.com", "password": "password123"}
+    ).json()["access_token"]
+    owner_headers = {"Authorization": f"Bearer {owner_token}"}
+    member_headers = {"Authorization": f"Bearer {member_token}"}
+
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=owner_headers
+    ).json()["id"]
+    client.post(
+        f"/api/projects/{project_id}/members",
+        json={"email": "jane@example.com", "role": "member"},
+        headers=owner_headers
+    )
+    issue_id = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Test Issue"},
+        headers=owner_headers
+    ).json()["id"]
+
+    # Repeated reads do not look the membership up again
+    client.get(f"/api/projects/{project_id}", headers=member_headers)
+    statements.clear()
+    response = client.get(f"/api/projects/{project_id}", headers=member_headers)
+    assert response.status_code == 200
+    assert not [s for s in statements if "FROM project_members" in s]
+
+    response = client.patch(f"/api/issues/{issue_id}", json={"status": "closed"}, headers=member_headers)
+    assert response.status_code == 403
+
+    # Promote the member; the cached role must not outlive the change
+    membership = db_session.query(ProjectMember).filter(
+        ProjectMember.project_id == project_id,
+        ProjectMember.role == ProjectRole.MEMBER
+    ).first()
+    membership.role = ProjectRole.MAINTAINER
+    db_session.commit()
+
+    response = client.patch(f"/api/issues/{issue_id}", json={"status": "closed"}, headers=member_headers)
+    assert response.status_code == 200
+
+
+def test_membership_cache_evicted_after_commit(client, db_session, other_session):
+    """Test that a role re-cached by a concurrent read between flush and commit is dropped on commit."""
+    owner_token = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    ).json()["access_token"]
+    member_token = client.post(
+        "/api/auth/signup",
+        json={"name": "Jane Doe", "email": "jane@example.com", "password": "password123"}
+    ).json()["access_token"]
+    owner_headers = {"Authorization": f"Bearer {owner_token}"}
+    member_headers = {"Authorization": f"Bearer {member_token}"}
+
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=owner_headers
+    ).json()["id"]
+    client.post(
+        f"/api/projects/{project_id}/members",
+        json={"email": "jane@example.com", "role": "maintainer"},
+        headers=owner_headers
+    )
+    issue_id = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Test Issue"},
+        headers=owner_headers
+    ).json()["id"]
+
+    # Demote the member, and let another request read the still committed role before the commit
+    member_id = client.get("/api/auth/me", headers=member_headers).json()["id"]
+    membership = db_session.query(ProjectMember).filter(
+        ProjectMember.project_id == project_id,
+        ProjectMember.user_id == member_id
+    ).one()
+    membership.role = ProjectRole.MEMBER
+    db_session.flush()
+    assert get_project_role(other_session, project_id, member_id) == ProjectRole.MAINTAINER
+    other_session.rollback()
+    db_session.commit()
+
+    assert membership_cache.get((project_id, member_id)) is None
+    response = client.patch(f"/api/issues/{issue_id}", json={"status": "closed"}, headers=member_headers)
+    assert response.status_code == 403
+
+    # A rolled back change leaves nothing stale behind either
+    membership.role = ProjectRole.MAINTAINER
+    db_session.flush()
+    get_project_role(other_session, project_id, member_id)
+    other_session.rollback()
+    db_session.rollback()
+    assert membership_cache.get((project_id, member_id)) is None
+
+
+def test_project_listings_use_constant_queries(client, statements):
+    """Test that list_projects and get_project_members do not issue a query per row."""
+    owner_token = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    ).json()["access_token"]
+    owner_headers = {"Authorization": f"Bearer {owner_token}"}
+
+    project_id = client.post(
+        "/api/projects",
+        json={"name": "Project 0", "key": "P0"},
+        headers=owner_headers
+    ).json()["id"]
+
+    def count_selects(path):
+        client.get(path, headers=owner_headers)  # warm the auth caches
+        statements.clear()
+        response = client.get(path, headers=owner_headers)
+        assert response.status_code == 200
+        return len([s for s in statements if s.lstrip().upper().startswith("SELECT")]), response.json()
+
+    baseline_projects, _ = count_selects("/api/projects")
+    baseline_members, _ = count_selects(f"/api/projects/{project_id}/members")
+
+    # Grow both listings
+    for i in range(1, 6):
+        client.post("/api/projects", json={"name": f"Project {i}", "key": f"P{i}"}, headers=owner_headers)
+        client.post(
+            "/api/auth/signup",
+            json={"name": f"User {i}", "email": f"user{i}@example.com", "password": "password123"}
+        )
+        client.post(
+            f"/api/projects/{project_id}/members",
+            json={"email": f"user{i}@example.com", "role": "member"},
+            headers=owner_headers
+        )
+
+    queries, projects = count_selects("/api/projects")
+    assert len(projects) == 6
+    assert queries == baseline_projects == 1
+
+    queries, members = count_selects(f"/api/projects/{project_id}/members")
+    assert len(members) == 6
+    assert [m["email"] for m in members][:2] == ["john@example.com", "user1@example.com"]
+    assert queries == baseline_members == 1
+
+
+def test_project_stats_follow_issue_changes(client, db_session):
+    """Test that stats counters track creates, updates, bulk writes and deletes, and can be rebuilt."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+    user_id = client.get("/api/auth/me", headers=headers).json()["id"]
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    )
+    project_id = project_response.json()["id"]
+
+    bug = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Bug", "priority": "high", "assignee_id": user_id},
+        headers=headers
+    ).json()
+    bulk = client.post(
+        f"/api/projects/{project_id}/issues/bulk",
+        json={"items": [{"title": "Chore 1", "priority": "low"}, {"title": "Chore 2", "priority": "low"}]},
+        headers=headers
+    ).json()["items"]
+    client.patch(f"/api/issues/{bug['id']}", json={"status": "closed"}, headers=headers)
+    client.patch("/api/issues/bulk", json={"items": [{"id": bulk[0]["id"], "priority": "critical"}]}, headers=headers)
+    client.delete(f"/api/issues/{bulk[1]['id']}", headers=headers)
+
+    response = client.get(f"/api/projects/{project_id}/stats", headers=headers)
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total"] == 2
+    assert stats["status"] == {"open": 1, "in_progress": 0, "resolved": 0, "closed": 1}
+    assert stats["priority"] == {"low": 0, "medium": 0, "high": 1, "critical": 1}
+    assert stats["assignee"] == [{"assignee_id": user_id, "count": 1}, {"assignee_id": None, "count": 1}]
+
+    # Counters changed behind the app's back are corrected by a rebuild
+    db_session.query(ProjectIssueStat).filter(ProjectIssueStat.dimension == "status").delete()
+    db_session.commit()
+    assert rebuild_project_stats(db_session) == 2
+    db_session.commit()
+    assert client.get(f"/api/projects/{project_id}/stats", headers=headers).json() == stats
+
+
+def test_issue_writes_lock_the_project_before_its_stats(client, statements):
+    """Test that every issue write bumps the project row before the stats rows, single or bulk."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+    project_id = client.post("/api/projects", json={"name": "Test Project", "key": "TEST"}, headers=headers).json()["id"]
+
+    def assert_project_first(request):
+        statements.clear()
+        response = request()
+        assert response.status_code < 300
+        touched = [
+            "projects" if statement.startswith("UPDATE projects") else "stats"
+            for statement in statements
+            if statement.startswith("UPDATE projects") or "project_issue_stats" in statement
+        ]
+        assert touched[0] == "projects" and "stats" in touched
+        return response
+
+    bug_id = assert_project_first(lambda: client.post(
+        f"/api/projects/{project_id}/issues", json={"title": "Bug"}, headers=headers
+    )).json()["id"]
+    assert_project_first(lambda: client.patch(f"/api/issues/{bug_id}", json={"status": "closed"}, headers=headers))
+    assert_project_first(lambda: client.post(
+        f"/api/projects/{project_id}/issues/bulk", json={"items": [{"title": "Chore"}]}, headers=headers
+    ))
+    assert_project_first(lambda: client.delete(f"/api/issues/{bug_id}", headers=headers))
+
+
+def test_export_project(client):
+    """Test exporting a project's issues with embedded comments as NDJSON, CSV and gzip."""
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    )
+    project_id = project_response.json()["id"]
+    ids = [
+        client.post(f"/api/projects/{project_id}/issues", json={"title": f"Bug {i}"}, headers=headers).json()["id"]
+        for i in range(3)
+    ]
+    for issue_id, body in [(ids[2], "First"), (ids[0], "Second"), (ids[2], "Third")]:
+        client.post(f"/api/issues/{issue_id}/comments", json={"body": body}, headers=headers)
+
+    response = client.get(f"/api/projects/{project_id}/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [(issue["id"], [c["body"] for c in issue["comments"]]) for issue in exported] == [
+        (ids[0], ["Second"]), (ids[1], []), (ids[2], ["First", "Third"])
+    ]
+
+    response = client.get(f"/api/projects/{project_id}/export", params={"format": "csv"}, headers=headers)
+    csv_export = response.content
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Bug 0", "Bug 1", "Bug 2"]
+    assert [c["body"] for c in json.loads(rows[2]["comments"])] == ["First", "Third"]
+
+    response = client.get(
+        f"/api/projects/{project_id}/export", params={"format": "csv", "gzip": True}, headers=headers
+    )
+    assert response.headers["content-type"] == "application/gzip"
+    assert gzip.decompress(response.content) == csv_export
+
+    # Members only
+    other = client.post(
+        "/api/auth/signup",
+        json={"name": "Jane Doe", "email": "jane@example.com", "password": "password123"}
+    ).json()["access_token"]
+    response = client.get(f"/api/projects/{project_id}/export", headers={"Authorization": f"Bearer {other}"})
+    assert response.status_code == 403
@@ -0,0 +1,138 @@
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import select, text
+from app.core.database import Base
+from app.models.issue import Issue
+from app.models.search import is_search_object
+from app.services.search import SQLITE_MATCHING_IDS, matching_issue_filter
+
+
+def _setup_project(client):
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "John Doe", "email": "john@example.com", "password": "password123"}
+    )
+    token = signup_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    project_response = client.post(
+        "/api/projects",
+        json={"name": "Test Project", "key": "TEST"},
+        headers=headers
+    )
+    return project_response.json()["id"], headers
+
+
+def test_search_matches_title_description_and_comments(client):
+    """Test that search covers titles, descriptions and comment bodies."""
+    project_id, headers = _setup_project(client)
+
+    title_issue = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Checkout timeout", "description": "Payment page hangs"},
+        headers=headers
+    ).json()
+    description_issue = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Slow cart", "description": "Sometimes ends in a timeout"},
+        headers=headers
+    ).json()
+    comment_issue = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Broken images", "description": "Thumbnails missing"},
+        headers=headers
+    ).json()
+    client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Unrelated", "description": "Nothing to see"},
+        headers=headers
+    )
+    client.post(
+        f"/api/issues/{comment_issue['id']}/comments",
+        json={"body": "CDN requests hit a timeout as well"},
+        headers=headers
+    )
+
+    response = client.get(f"/api/projects/{project_id}/search?q=timeout", headers=headers)
+    assert response.status_code == 200
+    ids = [hit["id"] for hit in response.json()]
+    assert set(ids) == {title_issue["id"], description_issue["id"], comment_issue["id"]}
+    # Title matches rank first, comment-only matches last
+    assert ids[0] == title_issue["id"]
+    assert ids[-1] == comment_issue["id"]
+
+
+def test_search_prefix_and_updates(client):
+    """Test prefix matching and that edits are reflected in the index."""
+    project_id, headers = _setup_project(client)
+
+    issue = client.post(
+        f"/api/projects/{project_id}/issues",
+        json={"title": "Authentication failure"},
+        headers=headers
+    ).json()
+
+    response = client.get(f"/api/projects/{project_id}/search?q=authent", headers=headers)
+    assert [hit["id"] for hit in response.json()] == [issue["id"]]
+
+    client.patch(f"/api/issues/{issue['id']}", json={"title": "Rendering glitch"}, headers=headers)
+
+    response = client.get(f"/api/projects/{project_id}/search?q=authent", headers=headers)
+    assert response.json() == []
+    response = client.get(f"/api/projects/{project_id}/issues?q=render", headers=headers)
+    assert [item["id"] for item in response.json()["items"]] == [issue["id"]]
+
+
+def test_search_requires_membership(client):
+    """Test that non-members cannot search a project."""
+    project_id, _ = _setup_project(client)
+
+    signup_response = client.post(
+        "/api/auth/signup",
+        json={"name": "Jane Doe", "email": "jane@example.com", "password": "password123"}
+    )
+    other_headers = {"Authorization": f"Bearer {signup_response.json()['access_token']}"}
+
+    response = client.get(f"/api/projects/{project_id}/search?q=anything", headers=other_headers)
+    assert response.status_code == 403
+
+
+def test_issue_list_search_is_scoped_to_the_project(client, db_session):
+    """Test that the issue list's q filter only collects matches from its own project."""
+    project_id, headers = _setup_project(client)
+    other_id = client.post("/api/projects", json={"name": "Other", "key": "OTHER"}, headers=headers).json()["id"]
+    ids = {}
+    for pid in (project_id, other_id):
+        title_hit = client.post(f"/api/projects/{pid}/issues", json={"title": "Login broken"}, headers=headers).json()
+        comment_hit = client.post(f"/api/projects/{pid}/issues", json={"title": "Slow page"}, headers=headers).json()
+        client.post(f"/api/issues/{comment_hit['id']}/comments", json={"body": "after login"}, headers=headers)
+        ids[pid] = {title_hit["id"], comment_hit["id"]}
+
+    # The filter alone, without the list's own project condition
+    matched = db_session.scalars(select(Issue.id).where(matching_issue_filter(db_session, project_id, "login")))
+    assert set(matched) == ids[project_id]
+
+    response = client.get(f"/api/projects/{other_id}/issues?q=login", headers=headers)
+    assert {item["id"] for item in response.json()["items"]} == ids[other_id]
+
+
+def test_issue_list_search_plan_starts_from_the_full_text_index(db_session):
+    """Test that SQLite reads matches from the FTS tables, not every project issue with an FTS probe each."""
+    plan = [row[3] for row in db_session.execute(
+        text(f"EXPLAIN QUERY PLAN {SQLITE_MATCHING_IDS}"), {"query": '"login"*', "project_id": 1}
+    )]
+    assert any(step.startswith("SCAN issues_fts") for step in plan)
+    assert any(step.startswith("SCAN comments_fts") for step in plan)
+    issue_steps = [step for step in plan if " issues " in f"{step} "]
+    assert issue_steps and all("INTEGER PRIMARY KEY" in step for step in issue_steps)
+
+
+def test_autogenerate_ignores_search_objects(db_session):
+    """Test that alembic's autogenerate, filtered as in alembic/env.py, proposes no changes for the search DDL."""
+    def include_object(object, name, type_, reflected, compare_to):
+        return not is_search_object(name, type_)
+
+    connection = db_session.connection()
+    assert compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    context = MigrationContext.configure(connection, opts={"include_object": include_object})
+    assert compare_metadata(context, Base.metadata) == []
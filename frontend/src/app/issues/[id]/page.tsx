@@ -10,6 +10,7 @@ import Navbar from '@/components/Navbar'
 export default function IssueDetailPage() {
   const [issue, setIssue] = useState<Issue | null>(null)
   const [comments, setComments] = useState<Comment[]>([])
+  const [commentsCursor, setCommentsCursor] = useState<string | null>(null)
   const [members, setMembers] = useState<Array<{ id: number; name: string; email: string; role: string }>>([])
   const [loading, setLoading] = useState(true)
   const [commentBody, setCommentBody] = useState('')
@@ -48,7 +49,19 @@ export default function IssueDetailPage() {
   const loadComments = async () => {
     try {
       const response = await commentsAPI.list(issueId)
-      setComments(response.data)
+      setComments(response.data.items)
+      setCommentsCursor(response.data.next_cursor)
+    } catch (err) {
+      console.error('Failed to load comments', err)
+    }
+  }
+
+  const loadMoreComments = async () => {
+    if (!commentsCursor) return
+    try {
+      const response = await commentsAPI.list(issueId, { cursor: commentsCursor })
+      setComments([...comments, ...response.data.items])
+      setCommentsCursor(response.data.next_cursor)
     } catch (err) {
       console.error('Failed to load comments', err)
     }
@@ -63,6 +76,7 @@ export default function IssueDetailPage() {
     try {
       await commentsAPI.create(issueId, { body: commentBody })
       setCommentBody('')
+      loadIssue()
       loadComments()
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Failed to add comment')
@@ -223,7 +237,7 @@ export default function IssueDetailPage() {
         </div>
 
         <div className="card">
-          <h2 style={{ marginBottom: '20px' }}>Comments ({comments.length})</h2>
+          <h2 style={{ marginBottom: '20px' }}>Comments ({issue.comment_count})</h2>
 
           <div style={{ marginBottom: '20px' }}>
             {comments.length === 0 ? (
@@ -249,6 +263,11 @@ export default function IssueDetailPage() {
                     </p>
                   </div>
                 ))}
+                {commentsCursor && (
+                  <button className="btn btn-secondary" onClick={loadMoreComments}>
+                    Load more comments
+                  </button>
+                )}
               </div>
             )}
           </div>
@@ -10,6 +10,7 @@ import Navbar from '@/components/Navbar'
 export default function ProjectDetailPage() {
   const [project, setProject] = useState<Project | null>(null)
   const [issues, setIssues] = useState<Issue[]>([])
+  const [issuesCursor, setIssuesCursor] = useState<string | null>(null)
   const [members, setMembers] = useState<Array<{ id: number; name: string; email: string; role: string }>>([])
   const [loading, setLoading] = useState(true)
   const [showCreateModal, setShowCreateModal] = useState(false)
@@ -29,7 +30,7 @@ export default function ProjectDetailPage() {
   const [searchQuery, setSearchQuery] = useState('')
   const [statusFilter, setStatusFilter] = useState<string>('')
   const [priorityFilter, setPriorityFilter] = useState<string>('')
-  const [sortBy, setSortBy] = useState<'created_at' | 'updated_at' | 'priority' | 'status'>('created_at')
+  const [sortBy, setSortBy] = useState<NonNullable<IssueFilters['sort']>>('created_at')
 
   const { user } = useAuth()
   const router = useRouter()
@@ -63,17 +64,21 @@ export default function ProjectDetailPage() {
     }
   }
 
+  const issueFilters = (): IssueFilters => {
+    const filters: IssueFilters = {
+      sort: sortBy,
+    }
+    if (searchQuery) filters.q = searchQuery
+    if (statusFilter) filters.status = statusFilter as any
+    if (priorityFilter) filters.priority = priorityFilter as any
+    return filters
+  }
+
   const loadIssues = async () => {
     try {
-      const filters: IssueFilters = {
-        sort: sortBy,
-      }
-      if (searchQuery) filters.q = searchQuery
-      if (statusFilter) filters.status = statusFilter as any
-      if (priorityFilter) filters.priority = priorityFilter as any
-
-      const response = await issuesAPI.list(projectId, filters)
-      setIssues(response.data)
+      const response = await issuesAPI.list(projectId, issueFilters())
+      setIssues(response.data.items)
+      setIssuesCursor(response.data.next_cursor)
     } catch (err) {
       console.error('Failed to load issues', err)
     } finally {
@@ -81,6 +86,17 @@ export default function ProjectDetailPage() {
     }
   }
 
+  const loadMoreIssues = async () => {
+    if (!issuesCursor) return
+    try {
+      const response = await issuesAPI.list(projectId, { ...issueFilters(), cursor: issuesCursor })
+      setIssues([...issues, ...response.data.items])
+      setIssuesCursor(response.data.next_cursor)
+    } catch (err) {
+      console.error('Failed to load issues', err)
+    }
+  }
+
   const handleCreateIssue = async (e: React.FormEvent) => {
     e.preventDefault()
     setError('')
@@ -198,6 +214,8 @@ export default function ProjectDetailPage() {
             >
               <option value="created_at">Newest First</option>
               <option value="updated_at">Recently Updated</option>
+              <option value="last_activity_at">Recently Active</option>
+              <option value="comment_count">Most Discussed</option>
               <option value="priority">Priority</option>
               <option value="status">Status</option>
             </select>
@@ -279,11 +297,21 @@ export default function ProjectDetailPage() {
                           👤 {members.find(m => m.id === issue.assignee_id)?.name || 'Assigned'}
                         </span>
                       )}
+                      {issue.comment_count > 0 && (
+                        <span style={{ fontSize: '12px', color: '#666' }}>
+                          💬 {issue.comment_count}
+                        </span>
+                      )}
                     </div>
                   </div>
                 </div>
               </div>
             ))}
+            {issuesCursor && (
+              <button className="btn btn-secondary" onClick={loadMoreIssues}>
+                Load more issues
+              </button>
+            )}
           </div>
         )}
 
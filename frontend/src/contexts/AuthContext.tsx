@@ -2,7 +2,7 @@
 
 import { createContext, useContext, useState, useEffect, ReactNode } from 'react'
 import { useRouter } from 'next/navigation'
-import { authAPI } from '@/lib/api'
+import { authAPI, storeTokens, clearTokens } from '@/lib/api'
 import type { User, LoginRequest, SignupRequest } from '@/types'
 
 interface AuthContextType {
@@ -30,7 +30,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
           setUser(response.data)
         })
         .catch(() => {
-          localStorage.removeItem('token')
+          clearTokens()
         })
         .finally(() => {
           setLoading(false)
@@ -42,7 +42,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
 
   const login = async (data: LoginRequest) => {
     const response = await authAPI.login(data)
-    localStorage.setItem('token', response.data.access_token)
+    storeTokens(response.data)
 
     const userResponse = await authAPI.getMe()
     setUser(userResponse.data)
@@ -51,7 +51,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
 
   const signup = async (data: SignupRequest) => {
     const response = await authAPI.signup(data)
-    localStorage.setItem('token', response.data.access_token)
+    storeTokens(response.data)
 
     const userResponse = await authAPI.getMe()
     setUser(userResponse.data)
@@ -59,7 +59,11 @@ export function AuthProvider({ children }: { children: ReactNode }) {
   }
 
   const logout = () => {
-    localStorage.removeItem('token')
+    const refreshToken = localStorage.getItem('refreshToken')
+    if (refreshToken) {
+      authAPI.logout(refreshToken).catch(() => {})
+    }
+    clearTokens()
     setUser(null)
     router.push('/login')
   }
@@ -3,7 +3,9 @@ import type {
   User,
   Project,
   Issue,
+  IssuePage,
   Comment,
+  CommentPage,
   LoginRequest,
   SignupRequest,
   TokenResponse,
@@ -28,6 +30,78 @@ api.interceptors.request.use((config) => {
   return config
 })
 
+export function storeTokens(tokens: TokenResponse) {
+  localStorage.setItem('token', tokens.access_token)
+  localStorage.setItem('refreshToken', tokens.refresh_token)
+}
+
+export function clearTokens() {
+  localStorage.removeItem('token')
+  localStorage.removeItem('refreshToken')
+}
+
+// One refresh at a time, across tabs too: refresh tokens are single use, and
+// presenting a used one again ends the session
+let refreshing: Promise<void> | null = null
+
+function withRefreshLock(task: () => Promise<void>): Promise<void> {
+  if (typeof navigator !== 'undefined' && navigator.locks) {
+    return navigator.locks.request('issuehub-token-refresh', task)
+  }
+  return task()
+}
+
+function refreshTokens(): Promise<void> {
+  if (!refreshing) {
+    const stale = localStorage.getItem('refreshToken')
+    refreshing = withRefreshLock(async () => {
+      const refreshToken = localStorage.getItem('refreshToken')
+      if (!refreshToken) {
+        throw new Error('No refresh token')
+      }
+      // Another tab refreshed while this one waited for the lock
+      if (refreshToken !== stale) {
+        return
+      }
+      try {
+        const response = await axios.post<TokenResponse>(`${API_URL}/auth/refresh`, { refresh_token: refreshToken })
+        storeTokens(response.data)
+      } catch (error) {
+        // Without locks another tab can win the race; its tokens are in storage
+        if (localStorage.getItem('refreshToken') === refreshToken) {
+          throw error
+        }
+      }
+    }).finally(() => {
+      refreshing = null
+    })
+  }
+  return refreshing
+}
+
+// Endpoints whose 401 means bad credentials rather than an expired access token
+const NO_REFRESH_URLS = new Set(['/auth/login', '/auth/signup', '/auth/refresh', '/auth/logout'])
+
+// When the access token has expired, get a new one and retry once
+api.interceptors.response.use(undefined, async (error) => {
+  const config = error.config
+  if (error.response?.status !== 401 || !config || config._retried || NO_REFRESH_URLS.has(config.url)) {
+    throw error
+  }
+  config._retried = true
+  const failedWith = config.headers.Authorization
+  // Another tab may have refreshed already
+  if (failedWith === `Bearer ${localStorage.getItem('token')}`) {
+    try {
+      await refreshTokens()
+    } catch {
+      clearTokens()
+      throw error
+    }
+  }
+  return api(config)
+})
+
 // Auth API
 export const authAPI = {
   signup: (data: SignupRequest) =>
@@ -35,6 +109,8 @@ export const authAPI = {
   login: (data: LoginRequest) =>
     api.post<TokenResponse>('/auth/login', data),
   getMe: () => api.get<User>('/auth/me'),
+  logout: (refreshToken: string) =>
+    api.post('/auth/logout', { refresh_token: refreshToken }),
 }
 
 // Projects API
@@ -52,7 +128,7 @@ export const projectsAPI = {
 // Issues API
 export const issuesAPI = {
   list: (projectId: number, filters?: IssueFilters) =>
-    api.get<Issue[]>(`/projects/${projectId}/issues`, { params: filters }),
+    api.get<IssuePage>(`/projects/${projectId}/issues`, { params: filters }),
   get: (id: number) => api.get<Issue>(`/issues/${id}`),
   create: (
     projectId: number,
@@ -70,8 +146,8 @@ export const issuesAPI = {
 
 // Comments API
 export const commentsAPI = {
-  list: (issueId: number) =>
-    api.get<Comment[]>(`/issues/${issueId}/comments`),
+  list: (issueId: number, params?: { order?: 'asc' | 'desc'; limit?: number; cursor?: string }) =>
+    api.get<CommentPage>(`/issues/${issueId}/comments`, { params }),
   create: (issueId: number, data: { body: string }) =>
     api.post<Comment>(`/issues/${issueId}/comments`, data),
 }
@@ -24,6 +24,13 @@ export interface Issue {
   assignee_id: number | null
   created_at: string
   updated_at: string
+  comment_count: number
+  last_activity_at: string
+}
+
+export interface IssuePage {
+  items: Issue[]
+  next_cursor: string | null
 }
 
 export interface Comment {
@@ -34,6 +41,11 @@ export interface Comment {
   created_at: string
 }
 
+export interface CommentPage {
+  items: Comment[]
+  next_cursor: string | null
+}
+
 export interface LoginRequest {
   email: string
   password: string
@@ -47,6 +59,7 @@ export interface SignupRequest {
 
 export interface TokenResponse {
   access_token: string
+  refresh_token: string
   token_type: string
 }
 
@@ -55,5 +68,9 @@ export interface IssueFilters {
   status?: Issue['status']
   priority?: Issue['priority']
   assignee?: number
-  sort?: 'created_at' | 'updated_at' | 'priority' | 'status'
+  sort?: 'created_at' | 'updated_at' | 'priority' | 'status' | 'comment_count' | 'last_activity_at'
+  limit?: number
+  cursor?: string
+  // Comma-separated Issue fields to return (id is always included)
+  fields?: string
 }